@@ -9,6 +9,11 @@ This script generates all required visualizations from bootstrap analysis result
 
 Usage:
     From project root: python scripts/generate_figures.py
+    
+Bootstrap replicates are read from the replicate store written by
+scripts/run_bootstrap_analysis.py (results/replicates/), so figures can be
+regenerated without repeating the bootstrap. Missing entries are computed
+and stored.
 """
 
 import sys
@@ -29,9 +34,13 @@ from src.visualization.plot_regional import (
     plot_regional_comparison,
     plot_difference_distributions
 )
-from src.bootstrap_analysis.bootstrap_means import bootstrap_genre_mean_by_region
-from src.bootstrap_analysis.bootstrap_differences import bootstrap_genre_difference
-from src.bootstrap_analysis.confidence_intervals import percentile_ci
+from src.bootstrap_analysis.bootstrap_means import bootstrap_region_means
+from src.bootstrap_analysis.bootstrap_differences import bootstrap_all_pair_differences
+from src.bootstrap_analysis.replicate_store import ReplicateStore
+from src.data_preprocessing.transform_data import combine_region_data
+
+# Shared with scripts/run_bootstrap_analysis.py
+REPLICATE_STORE = ReplicateStore(PROJECT_ROOT / "results" / "replicates")
 
 
 def load_cleaned_data(region: str) -> pd.DataFrame:
@@ -62,31 +71,31 @@ def generate_bootstrap_distributions():
     n_iterations = 10000
     random_seed = 42
     
-    for region in regions:
+    # Same joint bootstrap as the analysis script, so replicates come from the store
+    data = combine_region_data({region: load_cleaned_data(region) for region in regions})
+    result = bootstrap_region_means(
+        data,
+        region_cols={r: f"log_sales_{r.lower()}" for r in regions},
+        groups=genres,
+        n_iterations=n_iterations,
+        random_seed=random_seed,
+        store=REPLICATE_STORE
+    )
+    
+    for r, region in enumerate(result['regions']):
         print(f"\nProcessing region: {region}")
-        data = load_cleaned_data(region)
         
-        for genre in genres:
+        for g, genre in enumerate(result['groups']):
             print(f"  Generating plot for {genre}...", end=" ")
             try:
-                # Run bootstrap to get distribution
-                result = bootstrap_genre_mean_by_region(
-                    data,
-                    genre=genre,
-                    region=region,
-                    n_iterations=n_iterations,
-                    random_seed=random_seed
-                )
-                
-                # Calculate CI
-                ci_lower, ci_upper = percentile_ci(result['bootstrap_means'], confidence_level=0.95)
+                summary = result['results'][g * len(regions) + r]
                 
                 # Generate plot
                 save_path = PROJECT_ROOT / "results" / "figures" / f"bootstrap_dist_{genre.lower()}_{region.lower()}.png"
                 plot_bootstrap_distribution(
-                    bootstrap_stats=result['bootstrap_means'],
-                    true_statistic=result['mean'],
-                    ci_bounds=(ci_lower, ci_upper),
+                    bootstrap_stats=result['bootstrap_means'][:, g, r],
+                    true_statistic=summary['mean'],
+                    ci_bounds=(summary['ci_lower'], summary['ci_upper']),
                     title=f"Bootstrap Distribution: {genre} in {region}",
                     xlabel="Mean Log Sales",
                     save_path=str(save_path)
@@ -212,11 +221,7 @@ def generate_difference_distributions():
     print("=" * 60)
     
     regions = ['Global', 'NA', 'EU', 'JP', 'Other']
-    genre_pairs = [
-        ('Action', 'Role-Playing'),
-        ('Action', 'Simulation'),
-        ('Role-Playing', 'Simulation')
-    ]
+    genres = ['Action', 'Role-Playing', 'Simulation']
     n_iterations = 10000
     random_seed = 42
     
@@ -226,29 +231,30 @@ def generate_difference_distributions():
         data = load_cleaned_data(region)
         
         results_dict = {}
-        for genre_A, genre_B in genre_pairs:
+        try:
+            pair_results = bootstrap_all_pair_differences(
+                data,
+                region=region,
+                genres=genres,
+                n_iterations=n_iterations,
+                random_seed=random_seed,
+                store=REPLICATE_STORE
+            )
+        except Exception as e:
+            print(f"  ✗ Error: {e}")
+            pair_results = []
+        
+        for result in pair_results:
+            genre_A, genre_B = result['genre_A'], result['genre_B']
             print(f"  Generating plot for {genre_A} vs {genre_B}...", end=" ")
-            try:
-                result = bootstrap_genre_difference(
-                    data,
-                    genre_A=genre_A,
-                    genre_B=genre_B,
-                    region=region,
-                    n_iterations=n_iterations,
-                    random_seed=random_seed
-                )
-                
-                key = f"{genre_A}_{genre_B}_{region}"
-                results_dict[key] = {
-                    'genre_A': genre_A,
-                    'genre_B': genre_B,
-                    'region': region,
-                    'bootstrap_differences': result['bootstrap_differences']
-                }
-                print("✓")
-                
-            except Exception as e:
-                print(f"✗ Error: {e}")
+            key = f"{genre_A}_{genre_B}_{region}"
+            results_dict[key] = {
+                'genre_A': genre_A,
+                'genre_B': genre_B,
+                'region': region,
+                'bootstrap_differences': result['bootstrap_differences']
+            }
+            print("✓")
         
         # Generate combined plot for this region
         if results_dict:
@@ -10,8 +10,35 @@ This script runs the complete bootstrap analysis:
 
 Usage:
     From project root: python scripts/run_bootstrap_analysis.py
+    
+    Use --workers N to fan (region, genre) and (region, pair) tasks out over
+    N worker processes. Every task and replicate chunk gets its own
+    SeedSequence-spawned stream, so results do not depend on N.
+    
+    Use --method bca for bias-corrected and accelerated intervals instead of
+    percentile intervals (same replicates, better coverage for skewed genres).
+    
+    Use --tolerance T for adaptive replicate counts: every task generates
+    replicates in batches until the Monte Carlo standard error of both CI
+    endpoints is at most T (or --max-iterations is reached).
+    
+    Use --method saddlepoint for resampling-free percentile intervals from
+    the saddlepoint approximation of the bootstrap distribution (near
+    instant; the resampling methods remain the reference).
+    
+    Use --incremental for Poisson-bootstrap percentile intervals whose
+    per-replicate sums and counts persist in results/incremental/. Every
+    row's weights are fixed by its Name, Platform and Year and the seed, so
+    a rerun after rows were appended to the cleaned files only processes
+    the new rows; a regenerated (not append-only) file is detected and its
+    state rebuilt.
+    
+    --workers, --tolerance, --incremental and --method saddlepoint select
+    different pipelines and cannot be combined with each other; --workers
+    and --tolerance also accept --method bca.
 """
 
+import argparse
 import sys
 from pathlib import Path
 import pandas as pd
@@ -22,11 +49,78 @@ from itertools import combinations
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from src.bootstrap_analysis.bootstrap_means import bootstrap_genre_mean_by_region
-from src.bootstrap_analysis.bootstrap_differences import bootstrap_genre_difference
-from src.bootstrap_analysis.confidence_intervals import percentile_ci, is_significant
+from src.bootstrap_analysis.bootstrap_means import bootstrap_region_means
+from src.bootstrap_analysis.bootstrap_differences import bootstrap_all_pair_differences
+from src.bootstrap_analysis.parallel import parallel_genre_means, parallel_genre_differences, spawn_seeds
+from src.bootstrap_analysis.monte_carlo import (
+    adaptive_bootstrap_mean, adaptive_bootstrap_difference, endpoint_mcse, significance_mcse
+)
+from src.bootstrap_analysis.confidence_intervals import percentile_ci, bca_ci, is_significant
+from src.bootstrap_analysis.replicate_store import ReplicateStore
+from src.bootstrap_analysis.saddlepoint import saddlepoint_genre_mean, saddlepoint_genre_difference
+from src.bootstrap_analysis.incremental import IncrementalBootstrap
+from src.data_preprocessing.group_index import GroupIndex
+from src.data_preprocessing.transform_data import combine_region_data
 from src.reporting.generate_tables import create_summary_table, export_results_table
 
+# Replicate arrays are stored here and reused by scripts/generate_figures.py
+REPLICATE_STORE = ReplicateStore(PROJECT_ROOT / "results" / "replicates")
+
+# Persistent Poisson bootstrap states of --incremental, one file per region
+INCREMENTAL_DIR = PROJECT_ROOT / "results" / "incremental"
+
+# Columns identifying a game in the cleaned files (kept by reshape_for_analysis);
+# --incremental weights rows by these, so a game keeps its weights across rebuilds
+INCREMENTAL_KEY_COLS = ['Name', 'Platform', 'Year']
+
+CI_METHODS = ('percentile', 'bca', 'saddlepoint')
+
+
+def confidence_interval(replicates, method, data_A, data_B=None):
+    """95% CI of a mean (or of mean(data_A) - mean(data_B)) from its replicates."""
+    if method == 'bca':
+        return bca_ci(replicates, data_A, confidence_level=0.95, data_B=data_B)
+    return percentile_ci(replicates, confidence_level=0.95)
+
+
+def interval_with_mcse(replicates, method, data_A, data_B=None):
+    """confidence_interval plus batch-means Monte Carlo errors of both endpoints."""
+    ci_lower, ci_upper = confidence_interval(replicates, method, data_A, data_B)
+    interval = None
+    if method != 'percentile':
+        interval = lambda batch: confidence_interval(batch, method, data_A, data_B)
+    mcse_lower, mcse_upper = endpoint_mcse(replicates, 0.95, interval=interval)
+    return {'ci_lower': ci_lower, 'ci_upper': ci_upper,
+            'mcse_lower': float(mcse_lower), 'mcse_upper': float(mcse_upper)}
+
+
+def with_significance(interval):
+    """Add 'significant' and 'mcse_significant' to a dict with CI endpoints and MCSEs."""
+    _, mcse_significant = significance_mcse(interval['ci_lower'], interval['ci_upper'],
+                                            interval['mcse_lower'], interval['mcse_upper'])
+    interval['significant'] = is_significant(interval['ci_lower'], interval['ci_upper'],
+                                             null_value=0.0)
+    interval['mcse_significant'] = float(mcse_significant)
+    return interval
+
+
+def without_mcse(result):
+    """
+    Mark a result that has no Monte Carlo error (saddlepoint) with NaN MCSEs.
+    
+    Every method then yields the same table columns.
+    """
+    result.update({'mcse_lower': np.nan, 'mcse_upper': np.nan})
+    if 'significant' in result:
+        result['mcse_significant'] = np.nan
+    return result
+
+
+def difference_interval(replicates, method, data_A, data_B):
+    """interval_with_mcse plus the significance decision and its Monte Carlo error."""
+    interval = interval_with_mcse(replicates, method, data_A, data_B)
+    return with_significance(interval)
+
 
 def load_cleaned_data(region: str) -> pd.DataFrame:
     """Load cleaned data for a specific region."""
@@ -36,8 +130,293 @@ def load_cleaned_data(region: str) -> pd.DataFrame:
     return pd.read_csv(filepath)
 
 
-def run_bootstrap_means_analysis():
-    """Run bootstrap analysis for genre means across all regions."""
+def load_region_matrix(regions):
+    """
+    Load the cleaned region files as one games x regions frame.
+    
+    Regions whose file is missing are skipped.
+    
+    Returns:
+        Tuple of (DataFrame with 'Genre' and log_sales_<region> columns,
+                  list of regions that were loaded)
+    """
+    datasets = load_region_datasets(regions)
+    if not datasets:
+        return pd.DataFrame({'Genre': []}), []
+    return combine_region_data(datasets), list(datasets)
+
+
+def load_region_datasets(regions):
+    """Load the cleaned data of every available region into a dict."""
+    datasets = {}
+    for region in regions:
+        try:
+            datasets[region] = load_cleaned_data(region)
+        except FileNotFoundError as e:
+            print(f"  ✗ {e}")
+    return datasets
+
+
+def report_skipped(region, task, error):
+    """Print a ✗ line for a (region, genre) or (region, pair) task that could not run."""
+    label = f"{task[0]} vs {task[1]}:" if isinstance(task, tuple) else f"{task:<13}"
+    print(f"  {region:<7} {label} ✗ Error: {error}")
+
+
+def available_task_batches(datasets, indexes, tasks):
+    """
+    Group regions by which of their tasks have data, reporting the others.
+    
+    A task is a genre or a (genre_A, genre_B) pair. In a region where one
+    of its genres has no rows it is reported and skipped, so a missing
+    genre does not discard the results of every other task.
+    
+    Returns:
+        List of (datasets, tasks) batches, one per distinct set of
+        available tasks
+    """
+    batches = {}
+    for region, data in datasets.items():
+        available = []
+        for task in tasks:
+            missing = [g for g in (task if isinstance(task, tuple) else (task,))
+                       if g not in indexes[region]]
+            if missing:
+                report_skipped(region, task, f"No data found for genre: {missing[0]}")
+            else:
+                available.append(task)
+        batches.setdefault(tuple(available), {})[region] = data
+    return [(batch, list(available)) for available, batch in batches.items() if available]
+
+
+def run_parallel_means_analysis(regions, genres, n_iterations, random_seed, max_workers,
+                                method='percentile'):
+    """Run (region, genre) mean tasks on a process pool."""
+    datasets = load_region_datasets(regions)
+    indexes = {region: GroupIndex(df, 'Genre') for region, df in datasets.items()}
+    batches = available_task_batches(datasets, indexes, genres)
+    n_tasks = sum(len(batch) * len(batch_genres) for batch, batch_genres in batches)
+    print(f"  Running {n_tasks} tasks on {max_workers} workers")
+    
+    results = [result for batch, batch_genres in batches
+               for result in parallel_genre_means(batch, batch_genres, n_iterations=n_iterations,
+                                                  random_seed=random_seed,
+                                                  max_workers=max_workers)]
+    all_results = []
+    for result in results:
+        values = indexes[result['region']].values(result['genre'], 'log_sales')
+        all_results.append({
+            'genre': result['genre'],
+            'region': result['region'],
+            'mean': result['mean'],
+            **interval_with_mcse(result['bootstrap_means'], method, values),
+            'sample_size': result['sample_size']
+        })
+    return all_results
+
+
+def run_parallel_differences_analysis(regions, genre_pairs, n_iterations, random_seed, max_workers,
+                                      method='percentile'):
+    """Run (region, pair) difference tasks on a process pool."""
+    datasets = load_region_datasets(regions)
+    indexes = {region: GroupIndex(df, 'Genre') for region, df in datasets.items()}
+    batches = available_task_batches(datasets, indexes, genre_pairs)
+    n_tasks = sum(len(batch) * len(batch_pairs) for batch, batch_pairs in batches)
+    print(f"  Running {n_tasks} tasks on {max_workers} workers")
+    
+    results = [result for batch, batch_pairs in batches
+               for result in parallel_genre_differences(batch, batch_pairs,
+                                                        n_iterations=n_iterations,
+                                                        random_seed=random_seed,
+                                                        max_workers=max_workers)]
+    all_results = []
+    for result in results:
+        index = indexes[result['region']]
+        interval = difference_interval(
+            result['bootstrap_differences'], method,
+            index.values(result['genre_A'], 'log_sales'),
+            index.values(result['genre_B'], 'log_sales')
+        )
+        all_results.append({
+            'genre_A': result['genre_A'],
+            'genre_B': result['genre_B'],
+            'region': result['region'],
+            'mean_difference': result['mean_difference'],
+            **interval,
+            'sample_size_A': result['sample_size_A'],
+            'sample_size_B': result['sample_size_B']
+        })
+    return all_results
+
+
+def run_saddlepoint_means_analysis(regions, genres):
+    """Saddlepoint CIs for every (region, genre) mean, without resampling."""
+    all_results = []
+    for region, data in load_region_datasets(regions).items():
+        index = GroupIndex(data, 'Genre')
+        for genre in genres:
+            try:
+                all_results.append(
+                    without_mcse(saddlepoint_genre_mean(data, genre, region, index=index))
+                )
+            except ValueError as e:
+                report_skipped(region, genre, e)
+    return all_results
+
+
+def run_saddlepoint_differences_analysis(regions, genre_pairs):
+    """Saddlepoint CIs for every (region, pair) difference, without resampling."""
+    all_results = []
+    for region, data in load_region_datasets(regions).items():
+        index = GroupIndex(data, 'Genre')
+        for genre_A, genre_B in genre_pairs:
+            try:
+                all_results.append(without_mcse(
+                    saddlepoint_genre_difference(data, genre_A, genre_B, region, index=index)
+                ))
+            except ValueError as e:
+                report_skipped(region, (genre_A, genre_B), e)
+    return all_results
+
+
+def refresh_incremental_states(regions, n_iterations, random_seed):
+    """Add newly appended cleaned rows to each region's persisted state."""
+    states = {}
+    for region in regions:
+        filepath = PROJECT_ROOT / "data" / "processed" / f"cleaned_data_{region.lower()}_1995-2016.csv"
+        if not filepath.exists():
+            print(f"  ✗ Cleaned data file not found: {filepath}")
+            continue
+        state_path = INCREMENTAL_DIR / f"{region.lower()}.npz"
+        try:
+            boot = IncrementalBootstrap.load_or_create(state_path, n_iterations, random_seed,
+                                                       key_cols=INCREMENTAL_KEY_COLS)
+            if boot.key_cols != INCREMENTAL_KEY_COLS:
+                raise ValueError(f"{state_path} keys rows by {boot.key_cols}; rebuild the state")
+            n_new = boot.refresh_csv(filepath)
+        except (KeyError, ValueError) as e:
+            # The cleaned file was regenerated rather than appended to, or the
+            # stored state is from an older layout or other settings
+            print(f"  ✗ {e}; rebuilding {region} from scratch")
+            boot = IncrementalBootstrap(n_iterations, random_seed, key_cols=INCREMENTAL_KEY_COLS)
+            n_new = boot.refresh_csv(filepath)
+        if n_new:
+            boot.save(state_path)
+        print(f"  {region:<7} {n_new} new rows ({boot.n_rows} total)")
+        states[region] = boot
+    return states
+
+
+def run_incremental_means_analysis(regions, genres, n_iterations, random_seed):
+    """Poisson-bootstrap CIs for every (region, genre) mean from persisted states."""
+    all_results = []
+    for region, boot in refresh_incremental_states(regions, n_iterations, random_seed).items():
+        for genre in genres:
+            try:
+                result, = boot.mean_results(region, [genre])
+                replicates = boot.replicates(genre)
+                mcse_lower, mcse_upper = endpoint_mcse(replicates[~np.isnan(replicates)], 0.95)
+                all_results.append({**result, 'mcse_lower': float(mcse_lower),
+                                    'mcse_upper': float(mcse_upper)})
+            except ValueError as e:
+                report_skipped(region, genre, e)
+    return all_results
+
+
+def run_incremental_differences_analysis(regions, genre_pairs, n_iterations, random_seed):
+    """Poisson-bootstrap CIs for every (region, pair) difference from persisted states."""
+    all_results = []
+    for region, boot in refresh_incremental_states(regions, n_iterations, random_seed).items():
+        for genre_A, genre_B in genre_pairs:
+            try:
+                result = boot.difference_result(genre_A, genre_B, region)
+                replicates = boot.difference_replicates(genre_A, genre_B)
+                mcse_lower, mcse_upper = endpoint_mcse(replicates[~np.isnan(replicates)], 0.95)
+                all_results.append({**result, **with_significance({
+                    'ci_lower': result['ci_lower'], 'ci_upper': result['ci_upper'],
+                    'mcse_lower': float(mcse_lower), 'mcse_upper': float(mcse_upper)
+                })})
+            except ValueError as e:
+                report_skipped(region, (genre_A, genre_B), e)
+    return all_results
+
+
+def run_adaptive_means_analysis(regions, genres, tolerance, max_iterations, random_seed,
+                                method='percentile'):
+    """Run every (region, genre) mean task with an adaptive replicate count."""
+    datasets = load_region_datasets(regions)
+    keys = [(region, genre) for region in datasets for genre in genres]
+    seeds = spawn_seeds(random_seed, len(keys), 1)
+    
+    all_results = []
+    for (region, genre), (seed,) in zip(keys, seeds):
+        values = GroupIndex(datasets[region], 'Genre').values(genre, 'log_sales')
+        if len(values) == 0:
+            report_skipped(region, genre, f"No data found for genre: {genre}")
+            continue
+        result = adaptive_bootstrap_mean(values, tolerance, max_iterations=max_iterations,
+                                         random_seed=seed)
+        interval = {key: result[key] for key in ('ci_lower', 'ci_upper', 'mcse_lower', 'mcse_upper')}
+        if method == 'bca':
+            interval = interval_with_mcse(result['replicates'], method, values)
+        all_results.append({
+            'genre': genre,
+            'region': region,
+            'mean': np.mean(values),
+            **interval,
+            'sample_size': len(values),
+            'n_iterations': result['n_iterations']
+        })
+    return all_results
+
+
+def run_adaptive_differences_analysis(regions, genre_pairs, tolerance, max_iterations,
+                                      random_seed, method='percentile'):
+    """Run every (region, pair) difference task with an adaptive replicate count."""
+    datasets = load_region_datasets(regions)
+    keys = [(region, a, b) for region in datasets for a, b in genre_pairs]
+    seeds = spawn_seeds(random_seed, len(keys), 1)
+    
+    all_results = []
+    for (region, genre_A, genre_B), (seed,) in zip(keys, seeds):
+        index = GroupIndex(datasets[region], 'Genre')
+        data_A = index.values(genre_A, 'log_sales')
+        data_B = index.values(genre_B, 'log_sales')
+        if len(data_A) == 0 or len(data_B) == 0:
+            report_skipped(region, (genre_A, genre_B),
+                           f"No data found for pair: {genre_A} vs {genre_B}")
+            continue
+        result = adaptive_bootstrap_difference(data_A, data_B, tolerance,
+                                               max_iterations=max_iterations, random_seed=seed)
+        interval = {key: result[key] for key in ('ci_lower', 'ci_upper', 'mcse_lower', 'mcse_upper')}
+        if method == 'bca':
+            interval = interval_with_mcse(result['replicates'], method, data_A, data_B)
+        all_results.append({
+            'genre_A': genre_A,
+            'genre_B': genre_B,
+            'region': region,
+            'mean_difference': np.mean(data_A) - np.mean(data_B),
+            **with_significance(interval),
+            'sample_size_A': len(data_A),
+            'sample_size_B': len(data_B),
+            'n_iterations': result['n_iterations']
+        })
+    return all_results
+
+
+def run_bootstrap_means_analysis(max_workers=None, method='percentile',
+                                 tolerance=None, max_iterations=100000, incremental=False):
+    """
+    Run bootstrap analysis for genre means across all regions.
+    
+    With max_workers set, (region, genre) tasks run on a process pool;
+    with tolerance set, each task runs with an adaptive replicate count;
+    with incremental set, persisted Poisson bootstrap states are extended
+    with new rows; otherwise all regions are bootstrapped jointly in this
+    process.
+    method selects the interval type ('percentile', 'bca' or
+    'saddlepoint'; the latter skips resampling altogether).
+    """
     print("=" * 60)
     print("Bootstrap Analysis: Genre Means")
     print("=" * 60)
@@ -49,49 +428,75 @@ def run_bootstrap_means_analysis():
     
     all_results = []
     
-    for region in regions:
-        print(f"\nProcessing region: {region}")
+    if method == 'saddlepoint':
         try:
-            data = load_cleaned_data(region)
-            print(f"  Loaded {len(data)} rows")
+            all_results = run_saddlepoint_means_analysis(regions, genres)
+        except ValueError as e:
+            print(f"  ✗ Error: {e}")
+    elif incremental:
+        try:
+            all_results = run_incremental_means_analysis(regions, genres, n_iterations,
+                                                         random_seed)
+        except ValueError as e:
+            print(f"  ✗ Error: {e}")
+    elif tolerance is not None:
+        try:
+            all_results = run_adaptive_means_analysis(
+                regions, genres, tolerance, max_iterations, random_seed, method
+            )
+        except ValueError as e:
+            print(f"  ✗ Error: {e}")
+    elif max_workers is not None:
+        try:
+            all_results = run_parallel_means_analysis(
+                regions, genres, n_iterations, random_seed, max_workers, method
+            )
+        except ValueError as e:
+            print(f"  ✗ Error: {e}")
+    else:
+        print("\nLoading all regions...")
+        try:
+            data, available_regions = load_region_matrix(regions)
+            print(f"  Loaded {len(data)} games x {len(available_regions)} regions")
             
+            index = GroupIndex(data, 'Genre')
+            # Regions share their rows, so a genre is missing from all of them
+            present = [genre for genre in genres if genre in index]
             for genre in genres:
-                print(f"  Analyzing {genre}...", end=" ")
-                try:
-                    # Run bootstrap
-                    result = bootstrap_genre_mean_by_region(
-                        data, 
-                        genre=genre, 
-                        region=region,
-                        n_iterations=n_iterations,
-                        random_seed=random_seed
-                    )
-                    
-                    # Calculate confidence interval
-                    ci_lower, ci_upper = percentile_ci(
-                        result['bootstrap_means'], 
-                        confidence_level=0.95
-                    )
-                    
-                    # Store results
-                    all_results.append({
-                        'genre': genre,
-                        'region': region,
-                        'mean': result['mean'],
-                        'ci_lower': ci_lower,
-                        'ci_upper': ci_upper,
-                        'sample_size': result['sample_size']
-                    })
-                    
-                    print(f"✓ (n={result['sample_size']}, mean={result['mean']:.3f})")
-                    
-                except ValueError as e:
-                    print(f"✗ Error: {e}")
-                    continue
-                    
-        except FileNotFoundError as e:
-            print(f"  ✗ {e}")
-            continue
+                if genre not in present:
+                    for region in available_regions:
+                        report_skipped(region, genre, f"No data found for genre: {genre}")
+            
+            if available_regions and present:
+                # Resample each game once per replicate for all regions together
+                region_cols = {r: f"log_sales_{r.lower()}" for r in available_regions}
+                result = bootstrap_region_means(
+                    data,
+                    region_cols=region_cols,
+                    group_col='Genre',
+                    groups=present,
+                    n_iterations=n_iterations,
+                    random_seed=random_seed,
+                    confidence_level=0.95,
+                    store=REPLICATE_STORE,
+                    index=index
+                )
+                all_results = result['results']
+                
+                if method == 'bca':
+                    # Same replicates, BCa bounds; results are genre-major
+                    for i, r in enumerate(all_results):
+                        g, k = divmod(i, len(available_regions))
+                        r.update(interval_with_mcse(
+                            result['bootstrap_means'][:, g, k], method,
+                            index.values(r['genre'], region_cols[r['region']])
+                        ))
+        except ValueError as e:
+            print(f"  ✗ Error: {e}")
+    
+    for r in all_results:
+        replicates = f", B={r['n_iterations']}" if 'n_iterations' in r else ""
+        print(f"  {r['region']:<7} {r['genre']:<13} ✓ (n={r['sample_size']}, mean={r['mean']:.3f}{replicates})")
     
     # Save results
     if all_results:
@@ -103,8 +508,20 @@ def run_bootstrap_means_analysis():
     return all_results
 
 
-def run_bootstrap_differences_analysis():
-    """Run bootstrap analysis for genre differences across all regions."""
+def run_bootstrap_differences_analysis(max_workers=None, method='percentile',
+                                       tolerance=None, max_iterations=100000,
+                                       incremental=False):
+    """
+    Run bootstrap analysis for genre differences across all regions.
+    
+    With max_workers set, (region, pair) tasks run on a process pool;
+    with tolerance set, each pair runs with an adaptive replicate count;
+    with incremental set, persisted Poisson bootstrap states are extended
+    with new rows; otherwise each region bootstraps every genre once and
+    derives all pairs.
+    method selects the interval type ('percentile', 'bca' or
+    'saddlepoint'; the latter skips resampling altogether).
+    """
     print("\n" + "=" * 60)
     print("Bootstrap Analysis: Genre Differences")
     print("=" * 60)
@@ -114,59 +531,118 @@ def run_bootstrap_differences_analysis():
     n_iterations = 10000
     random_seed = 42
     
-    # Generate all pairs
-    genre_pairs = list(combinations(genres, 2))
-    
     all_results = []
     
+    if method == 'saddlepoint':
+        try:
+            all_results = run_saddlepoint_differences_analysis(
+                regions, list(combinations(genres, 2))
+            )
+        except ValueError as e:
+            print(f"  ✗ Error: {e}")
+        for r in all_results:
+            sig_marker = "***" if r['significant'] else ""
+            print(f"  {r['region']:<7} {r['genre_A']} vs {r['genre_B']}: "
+                  f"✓ (diff={r['mean_difference']:.3f} {sig_marker})")
+        # Nothing to resample; skip the per-region loop below
+        regions = []
+    elif incremental:
+        try:
+            all_results = run_incremental_differences_analysis(
+                regions, list(combinations(genres, 2)), n_iterations, random_seed
+            )
+        except ValueError as e:
+            print(f"  ✗ Error: {e}")
+        for r in all_results:
+            sig_marker = "***" if r['significant'] else ""
+            print(f"  {r['region']:<7} {r['genre_A']} vs {r['genre_B']}: "
+                  f"✓ (diff={r['mean_difference']:.3f} {sig_marker})")
+        # States are already up to date; skip the per-region loop below
+        regions = []
+    elif tolerance is not None:
+        try:
+            all_results = run_adaptive_differences_analysis(
+                regions, list(combinations(genres, 2)), tolerance, max_iterations,
+                random_seed, method
+            )
+        except ValueError as e:
+            print(f"  ✗ Error: {e}")
+        for r in all_results:
+            print(f"  {r['region']:<7} {r['genre_A']} vs {r['genre_B']}: "
+                  f"✓ (diff={r['mean_difference']:.3f}, B={r['n_iterations']})")
+        # Tasks already ran; skip the per-region loop below
+        regions = []
+    elif max_workers is not None:
+        try:
+            all_results = run_parallel_differences_analysis(
+                regions, list(combinations(genres, 2)), n_iterations, random_seed, max_workers,
+                method
+            )
+        except ValueError as e:
+            print(f"  ✗ Error: {e}")
+        # Tasks already ran on the pool; skip the per-region loop below
+        regions = []
+    
     for region in regions:
         print(f"\nProcessing region: {region}")
         try:
             data = load_cleaned_data(region)
             print(f"  Loaded {len(data)} rows")
             
-            for genre_A, genre_B in genre_pairs:
-                print(f"  Analyzing {genre_A} vs {genre_B}...", end=" ")
-                try:
-                    # Run bootstrap difference
-                    result = bootstrap_genre_difference(
-                        data,
-                        genre_A=genre_A,
-                        genre_B=genre_B,
-                        region=region,
-                        n_iterations=n_iterations,
-                        random_seed=random_seed
-                    )
-                    
-                    # Calculate confidence interval
-                    ci_lower, ci_upper = percentile_ci(
-                        result['bootstrap_differences'],
-                        confidence_level=0.95
-                    )
-                    
-                    # Test significance
-                    significant = is_significant(ci_lower, ci_upper, null_value=0.0)
-                    
-                    # Store results
-                    all_results.append({
-                        'genre_A': genre_A,
-                        'genre_B': genre_B,
-                        'region': region,
-                        'mean_difference': result['mean_difference'],
-                        'ci_lower': ci_lower,
-                        'ci_upper': ci_upper,
-                        'significant': significant,
-                        'sample_size_A': result['sample_size_A'],
-                        'sample_size_B': result['sample_size_B']
-                    })
-                    
-                    sig_marker = "***" if significant else ""
-                    print(f"✓ (diff={result['mean_difference']:.3f} {sig_marker})")
-                    
-                except ValueError as e:
-                    print(f"✗ Error: {e}")
-                    continue
-                    
+            # Bootstrap each genre once and derive all pairs from it
+            index = GroupIndex(data, 'Genre')
+            present = [genre for genre in genres if genre in index]
+            for genre_A, genre_B in combinations(genres, 2):
+                missing = genre_A if genre_A not in present else genre_B
+                if missing not in present:
+                    report_skipped(region, (genre_A, genre_B),
+                                   f"No data found for genre: {missing}")
+            if len(present) < 2:
+                continue
+            try:
+                pair_results = bootstrap_all_pair_differences(
+                    data,
+                    region=region,
+                    genres=present,
+                    n_iterations=n_iterations,
+                    random_seed=random_seed,
+                    confidence_level=0.95,
+                    store=REPLICATE_STORE,
+                    index=index
+                )
+            except ValueError as e:
+                print(f"  ✗ Error: {e}")
+                continue
+            
+            for result in pair_results:
+                print(f"  Analyzing {result['genre_A']} vs {result['genre_B']}...", end=" ")
+                
+                if method == 'bca':
+                    result.update(difference_interval(
+                        result['bootstrap_differences'], method,
+                        index.values(result['genre_A'], 'log_sales'),
+                        index.values(result['genre_B'], 'log_sales')
+                    ))
+                
+                # Store results
+                all_results.append({
+                    'genre_A': result['genre_A'],
+                    'genre_B': result['genre_B'],
+                    'region': region,
+                    'mean_difference': result['mean_difference'],
+                    'ci_lower': result['ci_lower'],
+                    'ci_upper': result['ci_upper'],
+                    'significant': result['significant'],
+                    'mcse_lower': result['mcse_lower'],
+                    'mcse_upper': result['mcse_upper'],
+                    'mcse_significant': result['mcse_significant'],
+                    'sample_size_A': result['sample_size_A'],
+                    'sample_size_B': result['sample_size_B']
+                })
+                
+                sig_marker = "***" if result['significant'] else ""
+                print(f"✓ (diff={result['mean_difference']:.3f} {sig_marker})")
+            
         except FileNotFoundError as e:
             print(f"  ✗ {e}")
             continue
@@ -207,8 +683,20 @@ def save_results_by_region(means_results, diff_results):
             print(f"✓ Saved differences for {region}: {len(region_diffs)} results")
 
 
-def main():
-    """Run the complete bootstrap analysis pipeline."""
+def main(max_workers=None, method='percentile', tolerance=None, max_iterations=100000,
+         incremental=False):
+    """
+    Run the complete bootstrap analysis pipeline.
+    
+    Args:
+        max_workers: Worker processes for the parallel executor (None: in-process)
+        method: Confidence interval method, 'percentile', 'bca' or 'saddlepoint'
+        tolerance: Target Monte Carlo SE of the CI endpoints; enables
+                   adaptive replicate counts (None: fixed 10,000)
+        max_iterations: Replicate cap per task in adaptive mode
+        incremental: Extend persisted Poisson bootstrap states with new
+                     rows instead of resampling from scratch
+    """
     import os
     original_cwd = os.getcwd()
     os.chdir(PROJECT_ROOT)
@@ -217,17 +705,28 @@ def main():
         print("\n" + "=" * 60)
         print("Bootstrap Analysis Pipeline")
         print("=" * 60)
-        print(f"Bootstrap iterations: 10,000")
-        print(f"Confidence level: 95%")
+        if method == 'saddlepoint':
+            print(f"Bootstrap iterations: none (saddlepoint approximation)")
+        elif incremental:
+            print(f"Bootstrap iterations: 10,000 (incremental Poisson weights)")
+        elif tolerance is not None:
+            print(f"Bootstrap iterations: adaptive (MCSE <= {tolerance}, max {max_iterations:,})")
+        else:
+            print(f"Bootstrap iterations: 10,000")
+        print(f"Confidence level: 95% ({method})")
         print(f"Random seed: 42")
         print(f"Genres: Action, Role-Playing, Simulation")
         print(f"Regions: Global, NA, EU, JP, Other")
+        if max_workers is not None:
+            print(f"Worker processes: {max_workers}")
         
         # Run bootstrap for means
-        means_results = run_bootstrap_means_analysis()
+        means_results = run_bootstrap_means_analysis(max_workers, method, tolerance, max_iterations,
+                                                     incremental)
         
         # Run bootstrap for differences
-        diff_results = run_bootstrap_differences_analysis()
+        diff_results = run_bootstrap_differences_analysis(max_workers, method, tolerance,
+                                                          max_iterations, incremental)
         
         # Save results by region
         save_results_by_region(means_results, diff_results)
@@ -251,5 +750,29 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Run the bootstrap analysis pipeline.")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="run tasks on N worker processes (default: in-process)")
+    parser.add_argument("--method", choices=CI_METHODS, default='percentile',
+                        help="confidence interval method (default: percentile)")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="adaptive mode: stop once the Monte Carlo SE of both CI "
+                             "endpoints is at most this value")
+    parser.add_argument("--max-iterations", type=int, default=100000,
+                        help="replicate cap per task in adaptive mode (default: 100000)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Poisson bootstrap that only processes rows appended since "
+                             "the last --incremental run")
+    args = parser.parse_args()
+    # Each mode runs its own pipeline; reject flags that it would ignore
+    if args.incremental and (args.workers is not None or args.tolerance is not None):
+        parser.error("--incremental cannot be combined with --workers or --tolerance")
+    if args.incremental and args.method != 'percentile':
+        parser.error("--incremental only supports --method percentile")
+    if args.method == 'saddlepoint' and (args.workers is not None or args.tolerance is not None):
+        parser.error("--method saddlepoint cannot be combined with --workers or --tolerance")
+    if args.tolerance is not None and args.workers is not None:
+        parser.error("--tolerance cannot be combined with --workers")
+    main(max_workers=args.workers, method=args.method, tolerance=args.tolerance,
+         max_iterations=args.max_iterations, incremental=args.incremental)
 
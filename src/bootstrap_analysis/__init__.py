@@ -6,22 +6,127 @@ This module provides functions for bootstrap resampling and statistical analysis
 
 from .bootstrap_means import (
     bootstrap_mean,
-    bootstrap_genre_mean_by_region
+    bootstrap_mean_t,
+    bootstrap_mean_sketch,
+    bootstrap_mean_reduced,
+    bootstrap_genre_mean_by_region,
+    bootstrap_group_means,
+    bootstrap_region_means
 )
 from .bootstrap_differences import (
     bootstrap_difference,
-    bootstrap_genre_difference
+    bootstrap_difference_t,
+    bootstrap_difference_sketch,
+    bootstrap_difference_reduced,
+    bootstrap_genre_difference,
+    bootstrap_all_pair_differences
 )
+from .parallel import (
+    run_bootstrap_tasks,
+    parallel_genre_means,
+    parallel_genre_differences
+)
+from .replicate_store import ReplicateStore
+from .quantile_sketch import QuantileSketch, merge_sketches
+from .monte_carlo import (
+    endpoint_mcse,
+    significance_mcse,
+    adaptive_bootstrap_mean,
+    adaptive_bootstrap_difference
+)
+from .memoization import BootstrapCache
+from .exact_bootstrap import (
+    exact_mean_quantiles,
+    exact_difference_quantiles,
+    exact_ci,
+    exact_genre_mean,
+    exact_genre_difference
+)
+from .saddlepoint import (
+    saddlepoint_quantiles,
+    saddlepoint_ci,
+    saddlepoint_genre_mean,
+    saddlepoint_genre_difference
+)
+from .poisson_bootstrap import (
+    PoissonBootstrap,
+    stream_bootstrap,
+    stream_csv_bootstrap
+)
+from .incremental import IncrementalBootstrap, keyed_poisson_weights
+from .little_bootstrap import (
+    blb_mean_ci,
+    blb_difference_ci,
+    blb_genre_mean,
+    blb_genre_difference
+)
+from .permutation_test import (
+    permutation_test,
+    genre_permutation_test,
+    parallel_permutation_tests
+)
+from .variance_reduction import control_variate_summary, antithetic_summary
 from .confidence_intervals import (
     percentile_ci,
+    batch_percentile_ci,
+    bca_ci,
+    studentized_ci,
+    sketch_ci,
     is_significant
 )
 
 __all__ = [
     'bootstrap_mean',
+    'bootstrap_mean_t',
+    'bootstrap_mean_sketch',
+    'bootstrap_mean_reduced',
     'bootstrap_genre_mean_by_region',
+    'bootstrap_group_means',
+    'bootstrap_region_means',
     'bootstrap_difference',
+    'bootstrap_difference_t',
+    'bootstrap_difference_sketch',
+    'bootstrap_difference_reduced',
     'bootstrap_genre_difference',
+    'bootstrap_all_pair_differences',
+    'run_bootstrap_tasks',
+    'parallel_genre_means',
+    'parallel_genre_differences',
+    'ReplicateStore',
+    'BootstrapCache',
+    'exact_mean_quantiles',
+    'exact_difference_quantiles',
+    'exact_ci',
+    'exact_genre_mean',
+    'exact_genre_difference',
+    'saddlepoint_quantiles',
+    'saddlepoint_ci',
+    'saddlepoint_genre_mean',
+    'saddlepoint_genre_difference',
+    'PoissonBootstrap',
+    'stream_bootstrap',
+    'stream_csv_bootstrap',
+    'IncrementalBootstrap',
+    'keyed_poisson_weights',
+    'blb_mean_ci',
+    'blb_difference_ci',
+    'blb_genre_mean',
+    'blb_genre_difference',
+    'permutation_test',
+    'genre_permutation_test',
+    'parallel_permutation_tests',
+    'control_variate_summary',
+    'antithetic_summary',
+    'QuantileSketch',
+    'merge_sketches',
+    'endpoint_mcse',
+    'significance_mcse',
+    'adaptive_bootstrap_mean',
+    'adaptive_bootstrap_difference',
     'percentile_ci',
+    'batch_percentile_ci',
+    'bca_ci',
+    'studentized_ci',
+    'sketch_ci',
     'is_significant'
 ]
@@ -15,13 +15,30 @@ NOTE: This is a template framework for Person 2.
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+from ..data_preprocessing.group_index import GroupIndex
+from .bootstrap_means import _genre_values, bootstrap_group_means, standard_error
+from .confidence_intervals import batch_percentile_ci, is_significant
+from .memoization import BootstrapCache, frame_fingerprint
+from .monte_carlo import endpoint_mcse, significance_mcse
+from .quantile_sketch import DEFAULT_SKETCH_SIZE, QuantileSketch
+from .replicate_store import ReplicateStore, cached_replicates
+from .resampling import iter_blocks, resample_antithetic_means, resample_means, resample_moments
+from .variance_reduction import (
+    antithetic_summary,
+    control_variate_summary,
+    linear_variance,
+    validate_variance_reduction
+)
 
 
 def bootstrap_difference(data_A: np.ndarray, 
                         data_B: np.ndarray, 
                         n_iterations: int = 10000, 
-                        random_seed: Optional[int] = None) -> np.ndarray:
+                        random_seed: Optional[int] = None,
+                        scheme: str = 'iid') -> np.ndarray:
     """
     Bootstrap resampling for difference in means.
     
@@ -37,12 +54,19 @@ def bootstrap_difference(data_A: np.ndarray,
         data_B: 1D array for genre B
         n_iterations: Number of bootstrap iterations
         random_seed: Random seed for reproducibility
+        scheme: Resampling scheme (default: 'iid'). Use 'multinomial' to
+                resample tie-compressed (value, count) pairs instead of
+                individual observations, or 'balanced' to use every
+                observation of each group exactly n_iterations times
+                (lower simulation error for the same n_iterations), or
+                'bayesian' for Dirichlet-weighted replicates of each group.
         
     Returns:
         Array of bootstrap differences (mean_A - mean_B)
     
     Raises:
-        ValueError: If either data array is empty or n_iterations is not positive
+        ValueError: If either data array is empty, n_iterations is not
+                    positive or scheme is unknown
     """
     # Input validation
     if len(data_A) == 0 or len(data_B) == 0:
@@ -52,17 +76,165 @@ def bootstrap_difference(data_A: np.ndarray,
     
     # Use modern numpy random number generator
     rng = np.random.default_rng(random_seed)
-    n_A = len(data_A)
-    n_B = len(data_B)
-    bootstrap_diffs = np.empty(n_iterations)
     
-    for i in range(n_iterations):
-        # Resample independently from each group
-        sample_A = rng.choice(data_A, size=n_A, replace=True)
-        sample_B = rng.choice(data_B, size=n_B, replace=True)
-        bootstrap_diffs[i] = sample_A.mean() - sample_B.mean()
+    # Resample independently from each group (vectorized, block by block)
+    means_A = resample_means(data_A, n_iterations, rng, scheme=scheme)
+    means_B = resample_means(data_B, n_iterations, rng, scheme=scheme)
+    
+    return means_A - means_B
+
+
+def bootstrap_difference_sketch(data_A: np.ndarray,
+                                data_B: np.ndarray,
+                                n_iterations: int = 10000,
+                                random_seed: Optional[int] = None,
+                                scheme: str = 'iid',
+                                sketch_size: int = DEFAULT_SKETCH_SIZE) -> QuantileSketch:
+    """
+    Streaming bootstrap of the difference in means into a quantile sketch.
+    
+    Blocks of A and B replicates are generated side by side and their
+    differences folded into a QuantileSketch, so the full replicate arrays
+    never exist. To interleave the blocks, A and B draw from two child
+    streams spawned from the seed; the replicates therefore follow the same
+    distribution as bootstrap_difference but are not the same values.
+    
+    Args:
+        data_A: 1D array for genre A
+        data_B: 1D array for genre B
+        n_iterations: Number of bootstrap iterations
+        random_seed: Random seed (or SeedSequence) for reproducibility
+        scheme: Resampling scheme (default: 'iid'); with 'balanced' each
+                block of replicates is balanced on its own
+        sketch_size: Items per sketch level (accuracy/memory trade-off)
+        
+    Returns:
+        QuantileSketch of the bootstrap differences (mean_A - mean_B)
+    
+    Raises:
+        ValueError: If either data array is empty, n_iterations is not
+                    positive or scheme is unknown
+    """
+    if len(data_A) == 0 or len(data_B) == 0:
+        raise ValueError("Both data arrays must be non-empty")
+    if n_iterations <= 0:
+        raise ValueError("n_iterations must be positive")
+    
+    seed = random_seed
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    rng_A, rng_B = (np.random.default_rng(child) for child in seed.spawn(2))
+    
+    # Blocks are sized for the larger sample so both fit the memory budget
+    sketch = QuantileSketch(sketch_size)
+    for start, stop in iter_blocks(n_iterations, 16 * max(len(data_A), len(data_B))):
+        means_A = resample_means(data_A, stop - start, rng_A, scheme=scheme)
+        means_B = resample_means(data_B, stop - start, rng_B, scheme=scheme)
+        sketch.update(means_A - means_B)
+    return sketch
+
+
+def bootstrap_difference_t(data_A: np.ndarray,
+                           data_B: np.ndarray,
+                           n_iterations: int = 10000,
+                           random_seed: Optional[int] = None,
+                           scheme: str = 'iid') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap differences in means together with their t statistics.
+    
+    Both groups are resampled independently (as in bootstrap_difference,
+    with the same random stream) while tracking each replicate's sum of
+    squares, so every replicate gets the Welch-type standard error
+    sqrt(var_A*/n_A + var_B*/n_B) without a nested bootstrap.
+    
+    Args:
+        data_A: 1D array for genre A (at least two observations)
+        data_B: 1D array for genre B (at least two observations)
+        n_iterations: Number of bootstrap iterations
+        random_seed: Random seed for reproducibility
+        scheme: Resampling scheme (default: 'iid')
+        
+    Returns:
+        Tuple of (bootstrap_differences, bootstrap_t); the differences are
+        identical to bootstrap_difference with the same seed and scheme
+    
+    Raises:
+        ValueError: If a group has fewer than two observations, n_iterations
+                    is not positive or scheme is unknown
+    """
+    if len(data_A) < 2 or len(data_B) < 2:
+        raise ValueError("Both data arrays must contain at least two observations")
+    if n_iterations <= 0:
+        raise ValueError("n_iterations must be positive")
+    
+    rng = np.random.default_rng(random_seed)
+    means_A, variances_A = resample_moments(data_A, n_iterations, rng, scheme=scheme)
+    means_B, variances_B = resample_moments(data_B, n_iterations, rng, scheme=scheme)
+    
+    differences = means_A - means_B
+    observed = np.mean(data_A) - np.mean(data_B)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bootstrap_t = (differences - observed) / np.sqrt(
+            variances_A / len(data_A) + variances_B / len(data_B)
+        )
+    return differences, bootstrap_t
+
+
+def bootstrap_difference_reduced(data_A: np.ndarray,
+                                 data_B: np.ndarray,
+                                 n_iterations: int = 10000,
+                                 random_seed: Optional[int] = None,
+                                 method: str = 'control',
+                                 confidence_level: float = 0.95) -> Dict:
+    """
+    Bootstrap a difference in means with a variance reduction estimator.
+    
+    'control' uses the replicates of bootstrap_difference (same seed, same
+    values) with linear control variates; the known variance is the sum of
+    both groups' linear variances. 'antithetic' reflects both groups
+    together, so each pair is (A - B, A' - B'). See ``variance_reduction.py``.
     
-    return bootstrap_diffs
+    Args:
+        data_A: 1D array for genre A
+        data_B: 1D array for genre B
+        n_iterations: Number of bootstrap replicates (even for 'antithetic')
+        random_seed: Random seed for reproducibility
+        method: 'control' or 'antithetic' (default: 'control')
+        confidence_level: Confidence level of the interval
+        
+    Returns:
+        Dictionary with 'bootstrap_differences', 'method', 'bias',
+        'variance', 'ci_lower', 'ci_upper' and 'reduction_factor'
+    
+    Raises:
+        ValueError: If either data array is empty, n_iterations is not
+                    positive (or odd for 'antithetic') or method is unknown
+    """
+    validate_variance_reduction(method)
+    if len(data_A) == 0 or len(data_B) == 0:
+        raise ValueError("Both data arrays must be non-empty")
+    if n_iterations <= 0:
+        raise ValueError("n_iterations must be positive")
+    if method == 'antithetic' and n_iterations % 2:
+        raise ValueError("n_iterations must be even for antithetic resampling")
+    
+    rng = np.random.default_rng(random_seed)
+    estimate = np.mean(data_A) - np.mean(data_B)
+    if method == 'antithetic':
+        means_A, antithetic_A = resample_antithetic_means(data_A, n_iterations // 2, rng)
+        means_B, antithetic_B = resample_antithetic_means(data_B, n_iterations // 2, rng)
+        result = antithetic_summary(means_A - means_B, antithetic_A - antithetic_B,
+                                    estimate, confidence_level)
+        differences = np.concatenate([means_A - means_B, antithetic_A - antithetic_B])
+    else:
+        differences = (resample_means(data_A, n_iterations, rng)
+                       - resample_means(data_B, n_iterations, rng))
+        result = control_variate_summary(differences, estimate,
+                                         linear_variance(data_A) + linear_variance(data_B),
+                                         confidence_level)
+    
+    result.update({'bootstrap_differences': differences, 'method': method})
+    return result
 
 
 def bootstrap_genre_difference(data: pd.DataFrame, 
@@ -70,7 +242,12 @@ def bootstrap_genre_difference(data: pd.DataFrame,
                                genre_B: str, 
                                region: str, 
                                n_iterations: int = 10000,
-                               random_seed: Optional[int] = None) -> Dict:
+                               random_seed: Optional[int] = None,
+                               store: Optional[ReplicateStore] = None,
+                               cache: Optional[BootstrapCache] = None,
+                               index: Optional[GroupIndex] = None,
+                               studentized: bool = False,
+                               scheme: str = 'iid') -> Dict:
     """
     Bootstrap difference between two genres in a region.
     
@@ -81,6 +258,15 @@ def bootstrap_genre_difference(data: pd.DataFrame,
         region: Region name (for identification purposes)
         n_iterations: Number of bootstrap iterations
         random_seed: Random seed for reproducibility
+        store: Optional ReplicateStore; seeded results are loaded from and
+               saved to it
+        cache: Optional in-memory BootstrapCache; seeded calls with the same
+               data and parameters return the cached result
+        index: Optional GroupIndex of data by 'Genre'; genre values are
+               then slices instead of filtered copies
+        studentized: Also track replicate variances (same pass) and return
+                     the bootstrap-t statistics for studentized_ci
+        scheme: Resampling scheme (default: 'iid'), e.g. 'bayesian'
         
     Returns:
         Dictionary with keys:
@@ -93,13 +279,22 @@ def bootstrap_genre_difference(data: pd.DataFrame,
         - 'sample_size_B': Sample size for genre B
         - 'mean_A': Observed mean for genre A
         - 'mean_B': Observed mean for genre B
+        - 'bootstrap_t', 'standard_error': Only when studentized is True
     """
     if 'Genre' not in data.columns or 'log_sales' not in data.columns:
         raise ValueError("DataFrame must contain 'Genre' and 'log_sales' columns")
     
+    memo_key = None
+    if cache is not None and random_seed is not None:
+        memo_key = ('difference', frame_fingerprint(data, ['Genre', 'log_sales']),
+                    genre_A, genre_B, region, n_iterations, random_seed, studentized, scheme)
+        cached = cache.get(memo_key)
+        if cached is not None:
+            return cached
+    
     # Extract data for each genre
-    data_A = data[data['Genre'] == genre_A]['log_sales'].values
-    data_B = data[data['Genre'] == genre_B]['log_sales'].values
+    data_A = _genre_values(data, genre_A, index)
+    data_B = _genre_values(data, genre_B, index)
     
     if len(data_A) == 0:
         raise ValueError(f"No data found for genre: {genre_A}")
@@ -111,12 +306,30 @@ def bootstrap_genre_difference(data: pd.DataFrame,
     mean_B = np.mean(data_B)
     observed_difference = mean_A - mean_B
     
-    # Perform bootstrap
-    bootstrap_differences = bootstrap_difference(
-        data_A, data_B, n_iterations, random_seed
-    )
+    # Perform bootstrap (or load the stored replicates of an identical run)
+    params = {
+        'statistic': 'difference_t' if studentized else 'difference',
+        'genres': [genre_A, genre_B],
+        'region': region,
+        'scheme': scheme,
+        'n_iterations': n_iterations,
+        'random_seed': random_seed
+    }
+    if studentized:
+        # Differences and t statistics are stored together as two columns
+        replicates = cached_replicates(
+            store, params, [data_A, data_B],
+            lambda: np.column_stack(bootstrap_difference_t(data_A, data_B, n_iterations,
+                                                           random_seed, scheme))
+        )
+        bootstrap_differences = replicates[:, 0]
+    else:
+        bootstrap_differences = cached_replicates(
+            store, params, [data_A, data_B],
+            lambda: bootstrap_difference(data_A, data_B, n_iterations, random_seed, scheme)
+        )
     
-    return {
+    result = {
         'genre_A': genre_A,
         'genre_B': genre_B,
         'region': region,
@@ -127,11 +340,105 @@ def bootstrap_genre_difference(data: pd.DataFrame,
         'mean_A': mean_A,
         'mean_B': mean_B
     }
+    if studentized:
+        result['bootstrap_t'] = replicates[:, 1]
+        result['standard_error'] = float(np.hypot(standard_error(data_A), standard_error(data_B)))
+    if memo_key is not None:
+        cache.put(memo_key, result)
+    return result
+
+
+def bootstrap_all_pair_differences(data: pd.DataFrame,
+                                   region: str,
+                                   genres: Optional[List[str]] = None,
+                                   n_iterations: int = 10000,
+                                   random_seed: Optional[int] = None,
+                                   confidence_level: float = 0.95,
+                                   store: Optional[ReplicateStore] = None,
+                                   index: Optional[GroupIndex] = None) -> List[Dict]:
+    """
+    Bootstrap differences for all genre pairs in a region.
+    
+    Groups are resampled independently, so a difference replicate is just
+    the difference of two per-genre replicate columns. Each genre is
+    therefore bootstrapped exactly once (via bootstrap_group_means) and all
+    K*(K-1)/2 difference distributions, percentile CIs and significance
+    flags are derived by broadcasting over the replicate matrix.
+    
+    Args:
+        data: DataFrame with 'Genre' and 'log_sales' columns
+        region: Region name (for identification purposes)
+        genres: Genres to compare, pairs follow this order (default: all, sorted)
+        n_iterations: Number of bootstrap iterations
+        random_seed: Random seed for reproducibility
+        confidence_level: Confidence level for the percentile CIs
+        store: Optional ReplicateStore for the per-genre replicates
+        index: Optional GroupIndex of data by 'Genre'
+        
+    Returns:
+        List with one dictionary per pair (genre_A before genre_B in
+        ``genres`` order), holding the keys of bootstrap_genre_difference
+        plus 'ci_lower', 'ci_upper', 'significant' and the Monte Carlo
+        errors 'mcse_lower', 'mcse_upper', 'mcse_significant' and
+        'flip_probability' (chance that another seed flips 'significant')
+    
+    Raises:
+        ValueError: If columns are missing, a genre has no data, fewer than
+                    two genres are given or confidence_level is not in (0, 1)
+    """
+    if 'Genre' not in data.columns or 'log_sales' not in data.columns:
+        raise ValueError("DataFrame must contain 'Genre' and 'log_sales' columns")
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+    
+    grouped = bootstrap_group_means(
+        data, groups=genres, n_iterations=n_iterations, random_seed=random_seed,
+        store=store, index=index
+    )
+    labels = grouped['groups']
+    if len(labels) < 2:
+        raise ValueError("At least two genres are required for pairwise differences")
+    
+    # All pairs at once: (n_iterations, n_pairs) difference matrix
+    pair_A, pair_B = map(np.array, zip(*combinations(range(len(labels)), 2)))
+    replicates = grouped['bootstrap_means']
+    differences = replicates[:, pair_A] - replicates[:, pair_B]
+    
+    ci_lower, ci_upper = batch_percentile_ci(differences, confidence_level)
+    significant = is_significant(ci_lower, ci_upper)
+    mcse_lower, mcse_upper = endpoint_mcse(differences, confidence_level)
+    flip_probability, mcse_significant = significance_mcse(
+        ci_lower, ci_upper, mcse_lower, mcse_upper
+    )
+    means = grouped['means']
+    sizes = grouped['sample_sizes']
+    
+    results = []
+    for p, (a, b) in enumerate(zip(pair_A, pair_B)):
+        results.append({
+            'genre_A': labels[a],
+            'genre_B': labels[b],
+            'region': region,
+            'mean_difference': means[a] - means[b],
+            'bootstrap_differences': differences[:, p],
+            'sample_size_A': int(sizes[a]),
+            'sample_size_B': int(sizes[b]),
+            'mean_A': means[a],
+            'mean_B': means[b],
+            'ci_lower': ci_lower[p],
+            'ci_upper': ci_upper[p],
+            'significant': bool(significant[p]),
+            'mcse_lower': mcse_lower[p],
+            'mcse_upper': mcse_upper[p],
+            'mcse_significant': mcse_significant[p],
+            'flip_probability': flip_probability[p]
+        })
+    
+    return results
 
 
 # TODO (Person 2): Implement additional helper functions as needed
 # For example:
-# - Function to generate all pairwise comparisons for a set of genres
 # - Function to batch process multiple genre pairs across regions
 # - Function to compare results with parametric tests (Welch's t-test) for validation
 
@@ -15,25 +15,59 @@ NOTE: This is a template framework for Person 2.
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..data_preprocessing.group_index import GroupIndex
+from .confidence_intervals import batch_percentile_ci
+from .memoization import BootstrapCache, frame_fingerprint
+from .monte_carlo import endpoint_mcse
+from .quantile_sketch import DEFAULT_SKETCH_SIZE, QuantileSketch
+from .replicate_store import ReplicateStore, cached_replicates
+from .resampling import (
+    iter_mean_blocks,
+    resample_antithetic_means,
+    resample_group_means,
+    resample_means,
+    resample_moments
+)
+from .variance_reduction import (
+    antithetic_summary,
+    control_variate_summary,
+    linear_variance,
+    validate_variance_reduction
+)
 
 
 def bootstrap_mean(data: np.ndarray, 
                   n_iterations: int = 10000, 
-                  random_seed: Optional[int] = None) -> np.ndarray:
+                  random_seed: Optional[int] = None,
+                  scheme: str = 'iid') -> np.ndarray:
     """
     Bootstrap resampling for mean estimation.
     
+    Replicates are generated in memory-bounded blocks by the vectorized
+    engine in ``resampling.py`` (see ``MEMORY_BUDGET_BYTES``).
+    
     Args:
         data: 1D array of log-transformed sales values
         n_iterations: Number of bootstrap iterations (default: 10000)
         random_seed: Random seed for reproducibility
+        scheme: Resampling scheme (default: 'iid'). Use 'multinomial' for
+                heavily tied data: the sample is compressed to distinct
+                values once and each replicate costs O(#distinct values).
+                Use 'balanced' to use every observation exactly
+                n_iterations times across the replicates, which removes
+                first-order simulation error (stable CIs with fewer
+                replicates). Use 'bayesian' for Dirichlet-weighted
+                replicates (smoother intervals for small groups; each
+                block is one BLAS matrix-vector product).
         
     Returns:
         Array of bootstrap means (length n_iterations)
     
     Raises:
-        ValueError: If data is empty or n_iterations is not positive
+        ValueError: If data is empty, n_iterations is not positive or
+                    scheme is unknown
     """
     # Input validation
     if len(data) == 0:
@@ -43,22 +77,154 @@ def bootstrap_mean(data: np.ndarray,
     
     # Use modern numpy random number generator
     rng = np.random.default_rng(random_seed)
-    n = len(data)
-    bootstrap_means = np.empty(n_iterations)
     
-    for i in range(n_iterations):
-        # Resample with replacement
-        sample = rng.choice(data, size=n, replace=True)
-        bootstrap_means[i] = sample.mean()
+    return resample_means(data, n_iterations, rng, scheme=scheme)
+
+
+def bootstrap_mean_sketch(data: np.ndarray,
+                          n_iterations: int = 10000,
+                          random_seed: Optional[int] = None,
+                          scheme: str = 'iid',
+                          sketch_size: int = DEFAULT_SKETCH_SIZE) -> QuantileSketch:
+    """
+    Streaming bootstrap of the mean into a mergeable quantile sketch.
+    
+    Replicate blocks are folded into a QuantileSketch as they are produced
+    and then discarded, so memory stays bounded by one block plus the
+    sketch no matter how large n_iterations is. Uses the same random
+    stream as bootstrap_mean. Summarize with ``sketch_ci``.
+    
+    Args:
+        data: 1D array of log-transformed sales values
+        n_iterations: Number of bootstrap iterations (default: 10000)
+        random_seed: Random seed for reproducibility
+        scheme: Resampling scheme (default: 'iid')
+        sketch_size: Items per sketch level (accuracy/memory trade-off)
+        
+    Returns:
+        QuantileSketch of the bootstrap means
+    
+    Raises:
+        ValueError: If data is empty, n_iterations is not positive or
+                    scheme is unknown
+    """
+    if len(data) == 0:
+        raise ValueError("Data array cannot be empty")
+    if n_iterations <= 0:
+        raise ValueError("n_iterations must be positive")
+    
+    rng = np.random.default_rng(random_seed)
+    sketch = QuantileSketch(sketch_size)
+    for _, _, block in iter_mean_blocks(data, n_iterations, rng, scheme):
+        sketch.update(block)
+    return sketch
+
+
+def bootstrap_mean_t(data: np.ndarray,
+                     n_iterations: int = 10000,
+                     random_seed: Optional[int] = None,
+                     scheme: str = 'iid') -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bootstrap means together with their studentized t statistics.
+    
+    Every replicate's standard error follows analytically from its
+    resampled sum and sum of squares (``resample_moments``), so bootstrap-t
+    needs no nested bootstrap. The means are identical to bootstrap_mean
+    with the same seed and scheme.
+    
+    Args:
+        data: 1D array of at least two observations
+        n_iterations: Number of bootstrap iterations (default: 10000)
+        random_seed: Random seed for reproducibility
+        scheme: Resampling scheme (default: 'iid')
+        
+    Returns:
+        Tuple of (bootstrap_means, bootstrap_t) where
+        t = (mean* - mean) / (sd* / sqrt(n)); t is nan or inf for
+        replicates with zero variance
+    
+    Raises:
+        ValueError: If data has fewer than two observations, n_iterations
+                    is not positive or scheme is unknown
+    """
+    if len(data) < 2:
+        raise ValueError("data must contain at least two observations")
+    if n_iterations <= 0:
+        raise ValueError("n_iterations must be positive")
+    
+    rng = np.random.default_rng(random_seed)
+    means, variances = resample_moments(data, n_iterations, rng, scheme=scheme)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bootstrap_t = (means - np.mean(data)) / np.sqrt(variances / len(data))
+    return means, bootstrap_t
+
+
+def bootstrap_mean_reduced(data: np.ndarray,
+                           n_iterations: int = 10000,
+                           random_seed: Optional[int] = None,
+                           method: str = 'control',
+                           confidence_level: float = 0.95) -> Dict:
+    """
+    Bootstrap the mean with a variance reduction estimator.
+    
+    'control' uses the replicates of bootstrap_mean (same seed, same
+    values) with linear control variates; 'antithetic' draws
+    n_iterations / 2 antithetic pairs. See ``variance_reduction.py``.
+    
+    Args:
+        data: 1D array of log-transformed sales values
+        n_iterations: Number of bootstrap replicates (even for 'antithetic')
+        random_seed: Random seed for reproducibility
+        method: 'control' or 'antithetic' (default: 'control')
+        confidence_level: Confidence level of the interval
+        
+    Returns:
+        Dictionary with 'bootstrap_means', 'method', 'bias', 'variance',
+        'ci_lower', 'ci_upper' and 'reduction_factor' (per estimate)
+    
+    Raises:
+        ValueError: If data is empty, n_iterations is not positive (or odd
+                    for 'antithetic') or method is unknown
+    """
+    validate_variance_reduction(method)
+    if len(data) == 0:
+        raise ValueError("Data array cannot be empty")
+    if n_iterations <= 0:
+        raise ValueError("n_iterations must be positive")
+    if method == 'antithetic' and n_iterations % 2:
+        raise ValueError("n_iterations must be even for antithetic resampling")
+    
+    rng = np.random.default_rng(random_seed)
+    estimate = np.mean(data)
+    if method == 'antithetic':
+        means, antithetic = resample_antithetic_means(data, n_iterations // 2, rng)
+        result = antithetic_summary(means, antithetic, estimate, confidence_level)
+        bootstrap_means = np.concatenate([means, antithetic])
+    else:
+        bootstrap_means = resample_means(data, n_iterations, rng)
+        result = control_variate_summary(bootstrap_means, estimate, linear_variance(data),
+                                         confidence_level)
     
-    return bootstrap_means
+    result.update({'bootstrap_means': bootstrap_means, 'method': method})
+    return result
+
+
+def standard_error(data: np.ndarray) -> float:
+    """Analytic standard error of the mean, sd (ddof=1) / sqrt(n)."""
+    return float(np.std(data, ddof=1) / np.sqrt(len(data)))
 
 
 def bootstrap_genre_mean_by_region(data: pd.DataFrame, 
                                   genre: str, 
                                   region: str, 
                                   n_iterations: int = 10000,
-                                  random_seed: Optional[int] = None) -> Dict:
+                                  random_seed: Optional[int] = None,
+                                  store: Optional[ReplicateStore] = None,
+                                  cache: Optional[BootstrapCache] = None,
+                                  index: Optional[GroupIndex] = None,
+                                  studentized: bool = False,
+                                  scheme: str = 'iid') -> Dict:
     """
     Bootstrap mean for a specific genre in a specific region.
     
@@ -68,6 +234,15 @@ def bootstrap_genre_mean_by_region(data: pd.DataFrame,
         region: Region name (for identification purposes, not used in filtering)
         n_iterations: Number of bootstrap iterations
         random_seed: Random seed for reproducibility
+        store: Optional ReplicateStore; seeded results are loaded from and
+               saved to it
+        cache: Optional in-memory BootstrapCache; seeded calls with the same
+               data and parameters return the cached result
+        index: Optional GroupIndex of data by 'Genre'; the genre's values
+               are then a slice instead of a filtered copy
+        studentized: Also track replicate variances (same pass) and return
+                     the bootstrap-t statistics for studentized_ci
+        scheme: Resampling scheme (default: 'iid'), e.g. 'bayesian'
         
     Returns:
         Dictionary with keys:
@@ -76,12 +251,21 @@ def bootstrap_genre_mean_by_region(data: pd.DataFrame,
         - 'mean': Observed mean
         - 'bootstrap_means': Array of bootstrap means
         - 'sample_size': Sample size
+        - 'bootstrap_t', 'standard_error': Only when studentized is True
     """
     if 'Genre' not in data.columns or 'log_sales' not in data.columns:
         raise ValueError("DataFrame must contain 'Genre' and 'log_sales' columns")
     
+    memo_key = None
+    if cache is not None and random_seed is not None:
+        memo_key = ('mean', frame_fingerprint(data, ['Genre', 'log_sales']),
+                    genre, region, n_iterations, random_seed, studentized, scheme)
+        cached = cache.get(memo_key)
+        if cached is not None:
+            return cached
+    
     # Filter data for the specific genre
-    genre_data = data[data['Genre'] == genre]['log_sales'].values
+    genre_data = _genre_values(data, genre, index)
     
     if len(genre_data) == 0:
         raise ValueError(f"No data found for genre: {genre}")
@@ -89,21 +273,261 @@ def bootstrap_genre_mean_by_region(data: pd.DataFrame,
     # Calculate observed mean
     observed_mean = np.mean(genre_data)
     
-    # Perform bootstrap
-    bootstrap_means = bootstrap_mean(genre_data, n_iterations, random_seed)
+    # Perform bootstrap (or load the stored replicates of an identical run)
+    params = {
+        'statistic': 'mean_t' if studentized else 'mean',
+        'genre': genre,
+        'region': region,
+        'scheme': scheme,
+        'n_iterations': n_iterations,
+        'random_seed': random_seed
+    }
+    if studentized:
+        # Means and t statistics are stored together as two columns
+        replicates = cached_replicates(
+            store, params, [genre_data],
+            lambda: np.column_stack(bootstrap_mean_t(genre_data, n_iterations, random_seed,
+                                                     scheme))
+        )
+        bootstrap_means = replicates[:, 0]
+    else:
+        bootstrap_means = cached_replicates(
+            store, params, [genre_data],
+            lambda: bootstrap_mean(genre_data, n_iterations, random_seed, scheme)
+        )
     
-    return {
+    result = {
         'genre': genre,
         'region': region,
         'mean': observed_mean,
         'bootstrap_means': bootstrap_means,
         'sample_size': len(genre_data)
     }
+    if studentized:
+        result['bootstrap_t'] = replicates[:, 1]
+        result['standard_error'] = standard_error(genre_data)
+    if memo_key is not None:
+        cache.put(memo_key, result)
+    return result
+
+
+def _check_index(data: pd.DataFrame, index: GroupIndex, group_col: str) -> None:
+    """
+    Check that a GroupIndex belongs to data and groups by group_col.
+    
+    Raises:
+        ValueError: If the index was built for another frame or column
+    """
+    if index.data is not data:
+        raise ValueError("index was built for a different DataFrame")
+    if index.group_col != group_col:
+        raise ValueError(f"index must group by '{group_col}'")
+
+
+def _genre_values(data: pd.DataFrame,
+                  genre: str,
+                  index: Optional[GroupIndex] = None) -> np.ndarray:
+    """
+    Return the log_sales values of one genre (a view when indexed).
+    """
+    if index is None:
+        return data[data['Genre'] == genre]['log_sales'].values
+    _check_index(data, index, 'Genre')
+    return index.values(genre, 'log_sales')
+
+
+def _encode_groups(data: pd.DataFrame,
+                   group_col: str,
+                   value_col: Union[str, List[str]],
+                   groups: Optional[List[str]] = None,
+                   index: Optional[GroupIndex] = None) -> Tuple[List, np.ndarray, np.ndarray]:
+    """
+    Encode group labels once and sort values into contiguous group slices.
+    
+    Args:
+        data: DataFrame with group and value columns
+        group_col: Name of the grouping column
+        value_col: Name of the value column, or a list of value columns
+        groups: Groups to keep, in output order (default: all, sorted)
+        index: Optional prebuilt GroupIndex of data by group_col
+        
+    Returns:
+        Tuple of (group_labels, sorted_values, offsets); sorted_values is
+        2D (observations x columns) when value_col is a list
+    
+    Raises:
+        ValueError: If a requested group has no data
+    """
+    if index is None:
+        index = GroupIndex(data, group_col, groups)
+    else:
+        _check_index(data, index, group_col)
+        if groups is not None and list(groups) != index.labels:
+            index = index.subset(groups)
+    
+    if isinstance(value_col, list):
+        sorted_values = np.column_stack([index.sorted_column(c) for c in value_col])
+    else:
+        sorted_values = index.sorted_column(value_col)
+    
+    return list(index.labels), sorted_values, index.offsets
 
 
-# TODO (Person 2): Implement additional helper functions as needed
-# For example:
-# - Function to run bootstrap for all genres in a region
-# - Function to batch process multiple genre-region combinations
-# - Function to save/load bootstrap results
+def bootstrap_group_means(data: pd.DataFrame,
+                          group_col: str = 'Genre',
+                          value_col: str = 'log_sales',
+                          groups: Optional[List[str]] = None,
+                          n_iterations: int = 10000,
+                          random_seed: Optional[int] = None,
+                          store: Optional[ReplicateStore] = None,
+                          index: Optional[GroupIndex] = None) -> Dict:
+    """
+    Bootstrap means for all groups of a DataFrame in one pass.
+    
+    Groups are encoded once and the data is sorted into contiguous group
+    slices, so every replicate of every group comes out of the same
+    vectorized block computation instead of one filter and one bootstrap
+    per group.
+    
+    Args:
+        data: DataFrame with grouping and value columns
+        group_col: Column to group by (default: 'Genre')
+        value_col: Column holding the statistic's values (default: 'log_sales'),
+                   or a list of columns that are resampled jointly
+        groups: Groups to analyze, in output order (default: all, sorted)
+        n_iterations: Number of bootstrap iterations
+        random_seed: Random seed for reproducibility
+        store: Optional ReplicateStore; seeded results are loaded from and
+               saved to it
+        index: Optional GroupIndex of data by group_col, reused instead of
+               re-encoding the group column
+        
+    Returns:
+        Dictionary with keys:
+        - 'groups': List of group labels (column order of the matrix)
+        - 'means': Observed mean per group (n_groups x n_columns for a list)
+        - 'bootstrap_means': Array of shape (n_iterations, n_groups), or
+          (n_iterations, n_groups, n_columns) for a list of value columns
+        - 'sample_sizes': Sample size per group
+    
+    Raises:
+        ValueError: If columns are missing, a group has no data or
+                    n_iterations is not positive
+    """
+    value_cols = value_col if isinstance(value_col, list) else [value_col]
+    missing = [c for c in [group_col] + value_cols if c not in data.columns]
+    if missing:
+        raise ValueError(f"DataFrame must contain '{group_col}' and {value_cols} columns")
+    if n_iterations <= 0:
+        raise ValueError("n_iterations must be positive")
+    
+    labels, sorted_values, offsets = _encode_groups(data, group_col, value_col, groups, index)
+    sizes = np.diff(offsets)
+    if len(labels) == 0:
+        raise ValueError("No groups to analyze")
+    
+    params = {
+        'statistic': 'group_means',
+        'scheme': 'iid',
+        'groups': labels,
+        'n_iterations': n_iterations,
+        'random_seed': random_seed
+    }
+    bootstrap_means = cached_replicates(
+        store, params, [sorted_values, offsets],
+        lambda: resample_group_means(sorted_values, offsets, n_iterations,
+                                     np.random.default_rng(random_seed))
+    )
+    sums = np.add.reduceat(sorted_values, offsets[:-1], axis=0)
+    
+    return {
+        'groups': labels,
+        'means': sums / sizes.reshape((-1,) + (1,) * (sorted_values.ndim - 1)),
+        'bootstrap_means': bootstrap_means,
+        'sample_sizes': sizes
+    }
+
+
+def bootstrap_region_means(data: pd.DataFrame,
+                           region_cols: Dict[str, str],
+                           group_col: str = 'Genre',
+                           groups: Optional[List[str]] = None,
+                           n_iterations: int = 10000,
+                           random_seed: Optional[int] = None,
+                           confidence_level: float = 0.95,
+                           store: Optional[ReplicateStore] = None,
+                           index: Optional[GroupIndex] = None) -> Dict:
+    """
+    Joint bootstrap of genre means across several regions.
+    
+    Takes one row per game with one log-sales column per region. Resample
+    indices are drawn once per replicate and applied to all region
+    columns, so the RNG work is shared and the replicates of different
+    regions are paired (valid for cross-region contrasts).
+    
+    Args:
+        data: DataFrame with group column and one value column per region
+        region_cols: Mapping of region name -> value column, e.g.
+                     {'NA': 'log_sales_na', 'EU': 'log_sales_eu'}
+        group_col: Column to group by (default: 'Genre')
+        groups: Groups to analyze, in output order (default: all, sorted)
+        n_iterations: Number of bootstrap iterations
+        random_seed: Random seed for reproducibility
+        confidence_level: Confidence level for the percentile CIs
+        store: Optional ReplicateStore for the joint replicates
+        index: Optional GroupIndex of data by group_col
+        
+    Returns:
+        Dictionary with keys:
+        - 'groups': List of group labels
+        - 'regions': List of region names
+        - 'means': Observed means, shape (n_groups, n_regions)
+        - 'bootstrap_means': Array of shape (n_iterations, n_groups, n_regions)
+        - 'sample_sizes': Sample size per group
+        - 'results': One dict per (genre, region) with 'genre', 'region',
+          'mean', 'ci_lower', 'ci_upper', 'mcse_lower', 'mcse_upper'
+          (batch-means Monte Carlo errors of the endpoints) and
+          'sample_size' (the format expected by create_summary_table)
+    
+    Raises:
+        ValueError: If region_cols is empty, columns are missing, a group
+                    has no data or confidence_level is not in (0, 1)
+    """
+    if not region_cols:
+        raise ValueError("region_cols must map at least one region to a column")
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+    
+    regions = list(region_cols)
+    grouped = bootstrap_group_means(
+        data,
+        group_col=group_col,
+        value_col=[region_cols[r] for r in regions],
+        groups=groups,
+        n_iterations=n_iterations,
+        random_seed=random_seed,
+        store=store,
+        index=index
+    )
+    
+    ci_lower, ci_upper = batch_percentile_ci(grouped['bootstrap_means'], confidence_level)
+    mcse_lower, mcse_upper = endpoint_mcse(grouped['bootstrap_means'], confidence_level)
+    
+    results = []
+    for g, genre in enumerate(grouped['groups']):
+        for r, region in enumerate(regions):
+            results.append({
+                'genre': genre,
+                'region': region,
+                'mean': grouped['means'][g, r],
+                'ci_lower': ci_lower[g, r],
+                'ci_upper': ci_upper[g, r],
+                'mcse_lower': mcse_lower[g, r],
+                'mcse_upper': mcse_upper[g, r],
+                'sample_size': int(grouped['sample_sizes'][g])
+            })
+    
+    grouped['regions'] = regions
+    grouped['results'] = results
+    return grouped
 
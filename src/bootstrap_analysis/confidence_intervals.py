@@ -8,12 +8,72 @@ NOTE: This is a template framework for Person 2.
       Person 2 should:
       1. Review and test the percentile method implementation
       2. Consider implementing BCa (Bias-Corrected and Accelerated) method as alternative
+         (done: bca_ci)
       3. Add error handling
       4. Complete any TODO items
 """
 
 import numpy as np
-from typing import Tuple
+from scipy.special import ndtr, ndtri
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+from .quantile_sketch import QuantileSketch
+
+
+def batch_percentile_ci(replicates: np.ndarray,
+                        confidence_levels: Union[float, Sequence[float]] = 0.95
+                        ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Percentile confidence intervals for many tasks and levels in one pass.
+    
+    All order statistics needed by every requested level (the two
+    neighbours of each interpolated percentile) are selected with a single
+    ``np.partition`` call along the replicate axis, i.e. one O(B) selection
+    pass per column instead of a sort per bound. Bounds are interpolated
+    exactly as ``np.percentile`` does (linear method).
+    
+    Args:
+        replicates: Bootstrap statistics with replicates along axis 0, e.g.
+                    shape (n_iterations,) or (n_iterations, n_tasks)
+        confidence_levels: One confidence level, or a sequence of levels
+        
+    Returns:
+        Tuple of (lower, upper) arrays of shape replicates.shape[1:] for a
+        single level, or (n_levels,) + replicates.shape[1:] for a sequence
+    
+    Raises:
+        ValueError: If a confidence level is not in (0, 1) or replicates is empty
+    """
+    levels = np.asarray(confidence_levels, dtype=float)
+    if np.any((levels <= 0) | (levels >= 1)):
+        raise ValueError("confidence_level must be between 0 and 1")
+    replicates = np.asarray(replicates, dtype=float)
+    if replicates.ndim == 0 or len(replicates) == 0:
+        raise ValueError("bootstrap_stats array cannot be empty")
+    
+    n = len(replicates)
+    alpha = 1 - levels.ravel()
+    quantiles = np.concatenate([100 * (alpha / 2), 100 * (1 - alpha / 2)]) / 100
+    
+    # Neighbouring order statistics of each virtual index (as np.percentile)
+    virtual = quantiles * (n - 1)
+    below = np.floor(virtual).astype(int)
+    above = np.minimum(below + 1, n - 1)
+    gamma = (virtual - below).reshape((-1,) + (1,) * (replicates.ndim - 1))
+    
+    kth = np.unique(np.concatenate([below, above]))
+    selected = np.partition(replicates, kth, axis=0)
+    a = selected[below]
+    b = selected[above]
+    
+    # Same interpolation formula as numpy's percentile (bit-identical bounds)
+    diff = b - a
+    bounds = np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+    
+    n_levels = len(alpha)
+    lower = bounds[:n_levels].reshape(levels.shape + replicates.shape[1:])
+    upper = bounds[n_levels:].reshape(levels.shape + replicates.shape[1:])
+    return lower, upper
 
 
 def percentile_ci(bootstrap_stats: np.ndarray, 
@@ -40,35 +100,206 @@ def percentile_ci(bootstrap_stats: np.ndarray,
     if len(bootstrap_stats) == 0:
         raise ValueError("bootstrap_stats array cannot be empty")
     
+    lower_bound, upper_bound = batch_percentile_ci(bootstrap_stats, confidence_level)
+    
+    return lower_bound[()], upper_bound[()]
+
+
+def sketch_ci(sketch: QuantileSketch,
+              confidence_level: float = 0.95,
+              n_bins: int = 50) -> Dict:
+    """
+    Percentile confidence interval from a streaming quantile sketch.
+    
+    Equals percentile_ci while the sketch is exact; otherwise each endpoint
+    comes with a bracket derived from the sketch's worst-case rank error.
+    
+    Args:
+        sketch: QuantileSketch of the bootstrap statistics
+        confidence_level: Confidence level (default: 0.95 for 95% CI)
+        n_bins: Number of bins of the returned histogram
+        
+    Returns:
+        Dictionary with keys:
+        - 'ci_lower', 'ci_upper': Interval endpoints
+        - 'ci_lower_range', 'ci_upper_range': (low, high) brackets of the
+          endpoints implied by the rank error bound
+        - 'rank_error': Worst-case rank error (in replicates)
+        - 'n_replicates': Number of replicates summarized
+        - 'histogram': Dict with 'counts' and 'edges'
+    
+    Raises:
+        ValueError: If confidence_level is not in (0, 1) or the sketch is empty
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+    if sketch.n == 0:
+        raise ValueError("bootstrap_stats array cannot be empty")
+    
     alpha = 1 - confidence_level
-    lower_bound = np.percentile(bootstrap_stats, 100 * (alpha / 2))
-    upper_bound = np.percentile(bootstrap_stats, 100 * (1 - alpha / 2))
+    q_lower, q_upper = alpha / 2, 1 - alpha / 2
+    ci_lower, ci_upper = sketch.quantiles([q_lower, q_upper])
+    
+    return {
+        'ci_lower': ci_lower,
+        'ci_upper': ci_upper,
+        'ci_lower_range': sketch.quantile_range(q_lower),
+        'ci_upper_range': sketch.quantile_range(q_upper),
+        'rank_error': sketch.rank_error,
+        'n_replicates': sketch.n,
+        'histogram': sketch.histogram(n_bins)
+    }
+
+
+def studentized_ci(bootstrap_t: np.ndarray,
+                   estimate: float,
+                   standard_error: float,
+                   confidence_level: float = 0.95) -> Tuple[float, float]:
+    """
+    Bootstrap-t (studentized) confidence interval.
+    
+    CI = [estimate - t_(1 - alpha/2) * SE, estimate - t_(alpha/2) * SE],
+    where t_q are quantiles of the replicate t statistics
+    (theta* - theta_hat) / SE*. Replicates with an undefined t (zero
+    resampled variance) are ignored.
     
+    Args:
+        bootstrap_t: Array of replicate t statistics (see bootstrap_mean_t)
+        estimate: Observed statistic
+        standard_error: Analytic standard error of the observed statistic
+        confidence_level: Confidence level (default: 0.95 for 95% CI)
+        
+    Returns:
+        Tuple of (lower_bound, upper_bound)
+    
+    Raises:
+        ValueError: If confidence_level is not in (0, 1) or no replicate
+                    has a finite t statistic
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+    bootstrap_t = np.asarray(bootstrap_t, dtype=float)
+    bootstrap_t = bootstrap_t[np.isfinite(bootstrap_t)]
+    if len(bootstrap_t) == 0:
+        raise ValueError("bootstrap_t array cannot be empty")
+    
+    t_lower, t_upper = batch_percentile_ci(bootstrap_t, confidence_level)
+    return estimate - t_upper[()] * standard_error, estimate - t_lower[()] * standard_error
+
+
+def jackknife_acceleration(data: np.ndarray,
+                           data_B: Optional[np.ndarray] = None) -> float:
+    """
+    BCa acceleration constant of a mean (or difference of means).
+    
+    Leave-one-out means follow in closed form from the total,
+    ``(S - x_i) / (n - 1)``, so the jackknife influence values are
+    ``(x_i - mean) / (n - 1)`` and the whole jackknife costs O(n) instead of
+    n recomputations. For a difference mean_A - mean_B the influence values
+    of both samples are pooled (B's with opposite sign).
+    
+    Args:
+        data: Sample of the (first) mean
+        data_B: Optional second sample for a difference of means
+        
+    Returns:
+        Acceleration constant a (0.0 when it is undefined, e.g. constant data)
+    """
+    influence = []
+    for sample, sign in ((data, 1.0), (data_B, -1.0)):
+        if sample is None:
+            continue
+        sample = np.asarray(sample, dtype=float)
+        if len(sample) > 1:
+            influence.append(sign * (sample - sample.mean()) / (len(sample) - 1))
+    if not influence:
+        return 0.0
+    
+    influence = np.concatenate(influence)
+    sum_squares = np.sum(influence ** 2)
+    if sum_squares == 0:
+        return 0.0
+    return float(np.sum(influence ** 3) / (6 * sum_squares ** 1.5))
+
+
+def bca_ci(bootstrap_stats: np.ndarray,
+           data: np.ndarray,
+           confidence_level: float = 0.95,
+           data_B: Optional[np.ndarray] = None) -> Tuple[float, float]:
+    """
+    Bias-corrected and accelerated (BCa) confidence interval for a mean.
+    
+    The bias correction z0 comes from the share of stored replicates below
+    the observed statistic; the acceleration comes from the closed-form
+    jackknife (see jackknife_acceleration). Both are O(n + B), so BCa costs
+    about as much as the percentile interval it adjusts.
+    
+    Args:
+        bootstrap_stats: Bootstrap replicates of the mean (or of
+                         mean(data) - mean(data_B))
+        data: Original sample
+        confidence_level: Confidence level (default: 0.95 for 95% CI)
+        data_B: Optional second sample when the statistic is a difference
+        
+    Returns:
+        Tuple of (lower_bound, upper_bound)
+    
+    Raises:
+        ValueError: If confidence_level is not in (0, 1) or an array is empty
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+    if len(bootstrap_stats) == 0:
+        raise ValueError("bootstrap_stats array cannot be empty")
+    if len(data) == 0 or (data_B is not None and len(data_B) == 0):
+        raise ValueError("Data array cannot be empty")
+    
+    bootstrap_stats = np.asarray(bootstrap_stats, dtype=float)
+    observed = np.mean(data) - (np.mean(data_B) if data_B is not None else 0.0)
+    
+    # Bias correction; ties count half and the share is kept off 0 and 1
+    n = len(bootstrap_stats)
+    below = np.sum(bootstrap_stats < observed) + 0.5 * np.sum(bootstrap_stats == observed)
+    z0 = ndtri(np.clip(below / n, 0.5 / n, 1 - 0.5 / n))
+    
+    a = jackknife_acceleration(data, data_B)
+    alpha = 1 - confidence_level
+    z = ndtri(np.array([alpha / 2, 1 - alpha / 2]))
+    adjusted = ndtr(z0 + (z0 + z) / (1 - a * (z0 + z)))
+    
+    lower_bound, upper_bound = np.percentile(bootstrap_stats, 100 * adjusted)
     return lower_bound, upper_bound
 
 
-def is_significant(ci_lower: float, ci_upper: float, 
-                  null_value: float = 0.0) -> bool:
+def is_significant(ci_lower: Union[float, np.ndarray],
+                   ci_upper: Union[float, np.ndarray],
+                   null_value: float = 0.0) -> Union[bool, np.ndarray]:
     """
     Check if confidence interval excludes the null value (significant difference).
     
     For testing H0: difference = null_value vs H1: difference != null_value
     At significance level α = 0.05, reject H0 if null_value is not in the CI.
     
+    Bounds may be arrays (e.g. from batch_percentile_ci); the check is then
+    applied elementwise.
+    
     Args:
-        ci_lower: Lower bound of confidence interval
-        ci_upper: Upper bound of confidence interval
+        ci_lower: Lower bound(s) of confidence interval
+        ci_upper: Upper bound(s) of confidence interval
         null_value: Null hypothesis value (default: 0.0 for testing no difference)
         
     Returns:
-        True if CI excludes null_value (significant), False otherwise
+        True if CI excludes null_value (significant), False otherwise; a
+        boolean array for array bounds
     """
-    return not (ci_lower <= null_value <= ci_upper)
+    significant = ~((np.asarray(ci_lower) <= null_value) & (null_value <= np.asarray(ci_upper)))
+    if significant.ndim == 0:
+        return bool(significant)
+    return significant
 
 
 # TODO (Person 2): Consider implementing additional helper functions
 # For example:
-# - Function to calculate BCa confidence interval (bias-corrected and accelerated)
 # - Function to compare percentile CI with BCa CI
 # - Function to calculate p-value from bootstrap distribution
 
@@ -0,0 +1,342 @@
+"""
+Exact Bootstrap Distributions on the Sales Lattice
+
+Raw sales (``NA_Sales``, ``Global_Sales``, ...) are recorded in units of
+0.01 million. On such a lattice the sum of n resampled observations is an
+n-fold convolution of the empirical distribution, which FFTs compute in
+one shot; the bootstrap distribution of the mean (and of a difference of
+independent means) is then known exactly and its percentile CI has no
+Monte Carlo error. Quantiles use the ideal-bootstrap definition
+G^-1(q) = min{x : G(x) >= q}, the limit of the percentile CI as the
+number of replicates grows.
+
+To keep the transform small, the convolution is computed on a circular
+window around n * mean whose width is chosen from Hoeffding's inequality
+so that the probability folded in from outside it is below
+``ALIASING_TOLERANCE`` (far below the rounding error of the CDF). Small
+samples get the full support and no folding at all.
+
+Data that is not on the lattice (e.g. ``log_sales``) falls back to the
+resampling engine, so ``exact_ci`` works for any column and doubles as a
+ground-truth oracle for the Monte Carlo engines where it applies.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import fft
+from typing import Dict, Iterable, Optional, Tuple
+
+from ..data_preprocessing.group_index import GroupIndex
+from .bootstrap_differences import bootstrap_difference
+from .bootstrap_means import bootstrap_mean
+from .confidence_intervals import is_significant, percentile_ci
+
+
+# Lattice spacing of the raw sales columns (0.01 million units)
+DEFAULT_RESOLUTION = 0.01
+
+# Bound on the probability mass folded into the convolution window
+ALIASING_TOLERANCE = 1e-15
+
+
+def lattice_units(data: np.ndarray, resolution: float = DEFAULT_RESOLUTION) -> Optional[np.ndarray]:
+    """
+    Express data as integer multiples of resolution.
+
+    Args:
+        data: 1D array of observations
+        resolution: Lattice spacing
+
+    Returns:
+        int64 array of lattice units, or None if data is not on the lattice
+    """
+    scaled = np.asarray(data, dtype=float) / resolution
+    units = np.round(scaled)
+    if not np.allclose(scaled, units, rtol=0, atol=1e-6):
+        return None
+    return units.astype(np.int64)
+
+
+def exact_sum_distribution(units: np.ndarray) -> Tuple[int, np.ndarray]:
+    """
+    Exact bootstrap distribution of the sum of n resampled lattice units.
+
+    Args:
+        units: 1D int array (one lattice value per observation)
+
+    Returns:
+        Tuple of (first_sum, pmf): pmf[i] is P(sum = first_sum + i); sums
+        outside the returned range have total probability below
+        ALIASING_TOLERANCE
+    """
+    units = np.asarray(units, dtype=np.int64)
+    n = len(units)
+    low = units.min()
+    shifted = units - low
+    span = int(shifted.max())
+
+    # Hoeffding: P(|S - n*mean| >= t) <= 2 exp(-2 t^2 / (n span^2))
+    center = shifted.sum()
+    half_width = span * np.sqrt(n * np.log(2 / ALIASING_TOLERANCE) / 2)
+    start = max(0, int(np.floor(center - half_width)))
+    stop = min(n * span, int(np.ceil(center + half_width)))
+    length = fft.next_fast_len(stop - start + 1, real=True)
+
+    # Circular convolution: fold the single-draw pmf onto the window length
+    single = np.bincount(shifted % length, minlength=length) / n
+    pmf = fft.irfft(fft.rfft(single) ** n, length)
+    # Residue r holds the sum start + ((r - start) mod length)
+    pmf = np.roll(pmf, -(start % length))[:stop - start + 1]
+    pmf = np.clip(pmf, 0.0, None)
+    return n * int(low) + start, pmf / pmf.sum()
+
+
+def _quantile_positions(cdf: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Smallest index with cdf >= q, for every level."""
+    return np.minimum(np.searchsorted(cdf, q, side='left'), len(cdf) - 1)
+
+
+def exact_mean_quantiles(data: np.ndarray,
+                         q: Iterable[float],
+                         resolution: float = DEFAULT_RESOLUTION) -> np.ndarray:
+    """
+    Exact quantiles of the bootstrap distribution of the mean.
+
+    Args:
+        data: 1D array of lattice observations
+        q: Quantile levels in [0, 1]
+        resolution: Lattice spacing
+
+    Returns:
+        Array of quantiles of bootstrap_mean(data) as n_iterations -> inf
+
+    Raises:
+        ValueError: If data is empty or not on the lattice
+    """
+    units = _require_lattice(data, resolution)
+    first, pmf = exact_sum_distribution(units)
+    positions = _quantile_positions(np.cumsum(pmf), np.asarray(list(q), dtype=float))
+    return (first + positions) * resolution / len(units)
+
+
+def exact_difference_quantiles(data_A: np.ndarray,
+                               data_B: np.ndarray,
+                               q: Iterable[float],
+                               resolution: float = DEFAULT_RESOLUTION) -> np.ndarray:
+    """
+    Exact quantiles of the bootstrap distribution of mean_A - mean_B.
+
+    The difference times n_A * n_B is the integer n_B * S_A - n_A * S_B,
+    so its CDF at an integer m is a sum over the (trimmed) support of S_A
+    of P(S_A = a) * P(S_B >= ceil((n_B * a - m) / n_A)). Every quantile is
+    found by a vectorized integer bisection on m, which lands exactly on
+    an atom of the distribution.
+
+    Args:
+        data_A: 1D array of lattice observations for genre A
+        data_B: 1D array of lattice observations for genre B
+        q: Quantile levels in [0, 1]
+        resolution: Lattice spacing
+
+    Returns:
+        Array of quantiles of bootstrap_difference(data_A, data_B) as
+        n_iterations -> inf
+
+    Raises:
+        ValueError: If either sample is empty or not on the lattice
+    """
+    units_A = _require_lattice(data_A, resolution)
+    units_B = _require_lattice(data_B, resolution)
+    n_A, n_B = len(units_A), len(units_B)
+    q = np.asarray(list(q), dtype=float)
+
+    first_A, pmf_A = exact_sum_distribution(units_A)
+    first_B, pmf_B = exact_sum_distribution(units_B)
+    # Only sums of A with non-negligible probability contribute
+    cdf_A = np.cumsum(pmf_A)
+    keep = (cdf_A >= ALIASING_TOLERANCE) & (cdf_A - pmf_A <= 1 - ALIASING_TOLERANCE)
+    sums_A = first_A + np.flatnonzero(keep)
+    pmf_A = pmf_A[keep]
+    # survival_B[j] = P(S_B >= first_B + j), with a trailing zero
+    survival_B = np.append(np.cumsum(pmf_B[::-1])[::-1], 0.0)
+
+    def cdf(m: np.ndarray) -> np.ndarray:
+        # -((m - n_B * a) // n_A) is the integer ceil((n_B * a - m) / n_A)
+        needed = -((m[:, None] - n_B * sums_A[None, :]) // n_A) - first_B
+        return survival_B[np.clip(needed, 0, len(survival_B) - 1)] @ pmf_A
+
+    # Integer bisection for the smallest m with cdf(m) >= q
+    low = np.full(len(q), n_B * sums_A[0] - n_A * (first_B + len(pmf_B) - 1) - 1)
+    high = np.full(len(q), n_B * sums_A[-1] - n_A * first_B)
+    while np.any(high - low > 1):
+        middle = (low + high) // 2
+        below = cdf(middle) < q
+        low = np.where(below, middle, low)
+        high = np.where(below, high, middle)
+
+    return high * resolution / (n_A * n_B)
+
+
+def exact_ci(data_A: np.ndarray,
+             data_B: Optional[np.ndarray] = None,
+             confidence_level: float = 0.95,
+             resolution: float = DEFAULT_RESOLUTION,
+             n_iterations: int = 10000,
+             random_seed: Optional[int] = None) -> Dict:
+    """
+    Percentile CI of a mean (or difference of means), exact when possible.
+
+    Lattice data gets the exact ideal-bootstrap interval; anything else
+    (e.g. log_sales) is resampled with bootstrap_mean/bootstrap_difference.
+
+    Args:
+        data_A: 1D array of observations
+        data_B: Optional second sample for mean_A - mean_B
+        confidence_level: Confidence level (default: 0.95)
+        resolution: Lattice spacing (default: 0.01)
+        n_iterations: Replicates for the resampling fallback
+        random_seed: Random seed for the resampling fallback
+
+    Returns:
+        Dictionary with 'ci_lower', 'ci_upper' and 'exact' (False when
+        the fallback was used)
+
+    Raises:
+        ValueError: If a sample is empty or confidence_level is not in (0, 1)
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+    samples = [data_A] if data_B is None else [data_A, data_B]
+    if any(len(sample) == 0 for sample in samples):
+        raise ValueError("Data array cannot be empty")
+
+    alpha = 1 - confidence_level
+    levels = [alpha / 2, 1 - alpha / 2]
+    exact = all(lattice_units(sample, resolution) is not None for sample in samples)
+    if exact and data_B is None:
+        ci_lower, ci_upper = exact_mean_quantiles(data_A, levels, resolution)
+    elif exact:
+        ci_lower, ci_upper = exact_difference_quantiles(data_A, data_B, levels, resolution)
+    elif data_B is None:
+        ci_lower, ci_upper = percentile_ci(bootstrap_mean(data_A, n_iterations, random_seed),
+                                           confidence_level)
+    else:
+        ci_lower, ci_upper = percentile_ci(
+            bootstrap_difference(data_A, data_B, n_iterations, random_seed), confidence_level
+        )
+    return {'ci_lower': ci_lower, 'ci_upper': ci_upper, 'exact': exact}
+
+
+def _group_values(data: pd.DataFrame,
+                  genre: str,
+                  value_col: str,
+                  index: Optional[GroupIndex] = None) -> np.ndarray:
+    if 'Genre' not in data.columns or value_col not in data.columns:
+        raise ValueError(f"DataFrame must contain 'Genre' and '{value_col}' columns")
+    values = (data[data['Genre'] == genre][value_col].values if index is None
+              else index.values(genre, value_col))
+    if len(values) == 0:
+        raise ValueError(f"No data found for genre: {genre}")
+    return values
+
+
+def exact_genre_mean(data: pd.DataFrame,
+                     genre: str,
+                     region: str,
+                     value_col: str = 'Global_Sales',
+                     confidence_level: float = 0.95,
+                     n_iterations: int = 10000,
+                     random_seed: Optional[int] = None,
+                     index: Optional[GroupIndex] = None) -> Dict:
+    """
+    Exact bootstrap CI for a genre's mean raw sales in a region.
+
+    Args:
+        data: DataFrame with 'Genre' and value_col (e.g. raw vgsales rows)
+        genre: Genre name to analyze
+        region: Region name (for identification purposes)
+        value_col: Sales column (default: 'Global_Sales'); non-lattice
+                   columns such as 'log_sales' fall back to resampling
+        confidence_level: Confidence level (default: 0.95)
+        n_iterations: Replicates for the resampling fallback
+        random_seed: Random seed for the resampling fallback
+        index: Optional GroupIndex of data by 'Genre'
+
+    Returns:
+        Dictionary with 'genre', 'region', 'mean', 'ci_lower', 'ci_upper',
+        'sample_size' and 'exact'
+
+    Raises:
+        ValueError: If columns are missing or the genre has no data
+    """
+    values = _group_values(data, genre, value_col, index)
+    interval = exact_ci(values, confidence_level=confidence_level,
+                        n_iterations=n_iterations, random_seed=random_seed)
+    return {
+        'genre': genre,
+        'region': region,
+        'mean': np.mean(values),
+        'ci_lower': interval['ci_lower'],
+        'ci_upper': interval['ci_upper'],
+        'sample_size': len(values),
+        'exact': interval['exact']
+    }
+
+
+def exact_genre_difference(data: pd.DataFrame,
+                           genre_A: str,
+                           genre_B: str,
+                           region: str,
+                           value_col: str = 'Global_Sales',
+                           confidence_level: float = 0.95,
+                           n_iterations: int = 10000,
+                           random_seed: Optional[int] = None,
+                           index: Optional[GroupIndex] = None) -> Dict:
+    """
+    Exact bootstrap CI for the difference of two genres' mean raw sales.
+
+    Args:
+        data: DataFrame with 'Genre' and value_col (e.g. raw vgsales rows)
+        genre_A: First genre name
+        genre_B: Second genre name
+        region: Region name (for identification purposes)
+        value_col: Sales column (default: 'Global_Sales'); non-lattice
+                   columns such as 'log_sales' fall back to resampling
+        confidence_level: Confidence level (default: 0.95)
+        n_iterations: Replicates for the resampling fallback
+        random_seed: Random seed for the resampling fallback
+        index: Optional GroupIndex of data by 'Genre'
+
+    Returns:
+        Dictionary with 'genre_A', 'genre_B', 'region', 'mean_difference',
+        'ci_lower', 'ci_upper', 'significant', 'sample_size_A',
+        'sample_size_B' and 'exact'
+
+    Raises:
+        ValueError: If columns are missing or either genre has no data
+    """
+    data_A = _group_values(data, genre_A, value_col, index)
+    data_B = _group_values(data, genre_B, value_col, index)
+    interval = exact_ci(data_A, data_B, confidence_level,
+                        n_iterations=n_iterations, random_seed=random_seed)
+    return {
+        'genre_A': genre_A,
+        'genre_B': genre_B,
+        'region': region,
+        'mean_difference': np.mean(data_A) - np.mean(data_B),
+        'ci_lower': interval['ci_lower'],
+        'ci_upper': interval['ci_upper'],
+        'significant': is_significant(interval['ci_lower'], interval['ci_upper']),
+        'sample_size_A': len(data_A),
+        'sample_size_B': len(data_B),
+        'exact': interval['exact']
+    }
+
+
+def _require_lattice(data: np.ndarray, resolution: float) -> np.ndarray:
+    if len(data) == 0:
+        raise ValueError("Data array cannot be empty")
+    units = lattice_units(data, resolution)
+    if units is None:
+        raise ValueError(f"Data is not on a lattice with resolution {resolution}")
+    return units
@@ -0,0 +1,332 @@
+"""
+Incremental Poisson Bootstrap for Append-Only Catalogues
+
+``PoissonBootstrap`` draws row weights from a random stream, so the
+weights of a row depend on everything read before it. Here the Poisson(1)
+weight of row r in replicate b is instead a pure function of
+(seed, key(r), b): a counter-based generator (SplitMix64 hashing) gives a
+uniform that is mapped through the Poisson(1) inverse CDF. Any row gets the
+same weights no matter when, in which chunk or on which shard it is
+processed.
+
+The per-replicate sums and counts therefore form a persistent state: when
+rows are appended, only their contributions are added and the intervals
+are re-extracted, at a cost proportional to the new rows (CSV refreshes
+resume parsing at the persisted byte offset of the last row). By default a
+row's key is its position in the (append-only) input; ``key_cols`` hashes
+column values instead, for inputs whose rows are identified by content.
+"""
+
+import hashlib
+import io
+import os
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional, Union
+
+from .poisson_bootstrap import DEFAULT_CSV_CHUNKSIZE, PoissonBootstrap
+
+
+# Poisson(1) CDF at k = 0..20 (the tail beyond is below 1e-19)
+_POISSON_CDF = np.cumsum(np.exp(-1.0) / np.cumprod(np.r_[1.0, np.arange(1, 21)]))
+
+_GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+# Bytes read per step when searching a CSV file backwards for its last newline
+_SCAN_BYTES = 64 * 1024
+
+
+def _splitmix64(x: np.ndarray) -> np.ndarray:
+    """SplitMix64 finalizer applied elementwise (uint64, wrapping)."""
+    z = np.asarray(x, dtype=np.uint64) + _GOLDEN_GAMMA
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def keyed_poisson_weights(keys: np.ndarray, random_seed: int, n_iterations: int) -> np.ndarray:
+    """
+    Poisson(1) bootstrap weights determined by row key, seed and replicate.
+
+    Args:
+        keys: uint64 row keys
+        random_seed: Non-negative integer seed
+        n_iterations: Number of replicates
+
+    Returns:
+        int64 array of shape (len(keys), n_iterations)
+    """
+    row_state = _splitmix64(np.asarray(keys, dtype=np.uint64)
+                            ^ _splitmix64(np.array([random_seed], dtype=np.uint64)))
+    replicate_offsets = np.arange(n_iterations, dtype=np.uint64) * _GOLDEN_GAMMA
+    state = _splitmix64(row_state[:, None] + replicate_offsets[None, :])
+    # Top 53 bits as a uniform in [0, 1)
+    uniforms = (state >> np.uint64(11)).astype(float) * 2.0 ** -53
+    return np.searchsorted(_POISSON_CDF, uniforms, side='right').astype(np.int64)
+
+
+def row_keys(chunk: pd.DataFrame, key_cols: List[str]) -> np.ndarray:
+    """
+    Stable uint64 keys of rows from the values of key_cols.
+
+    Rows with identical key values get identical weights, so the key
+    columns should identify a row uniquely.
+    """
+    return pd.util.hash_pandas_object(chunk[key_cols], index=False).to_numpy(dtype=np.uint64)
+
+
+def _last_line_end(f, start: int, stop: int) -> int:
+    """Offset just past the last newline of the binary file f in [start, stop), or start."""
+    position = stop
+    while position > start:
+        size = min(_SCAN_BYTES, position - start)
+        f.seek(position - size)
+        newline = f.read(size).rfind(b'\n')
+        if newline >= 0:
+            return position - size + newline + 1
+        position -= size
+    return start
+
+
+def _line_digest(f, header: bytes, stop: int) -> str:
+    """Hash of the header and of the line of f that ends at offset stop."""
+    f.seek(_last_line_end(f, 0, stop - 1))
+    return hashlib.sha256(header + f.read(stop - f.tell())).hexdigest()
+
+
+class _BoundedReader:
+    """Binary file view that ends at a fixed offset, for pd.read_csv."""
+
+    def __init__(self, f, stop: int):
+        self.f = f
+        self.stop = stop
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self.stop - self.f.tell()
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        return self.f.read(size)
+
+
+class IncrementalBootstrap(PoissonBootstrap):
+    """
+    Poisson bootstrap state that can be persisted and extended with new rows.
+
+    Example:
+        boot = IncrementalBootstrap.load_or_create("results/incremental/na.npz",
+                                                   n_iterations=10000, random_seed=42)
+        boot.refresh_csv("data/processed/cleaned_data_na_1995-2016.csv")
+        boot.save("results/incremental/na.npz")
+        boot.mean_results('NA')
+    """
+
+    def __init__(self,
+                 n_iterations: int,
+                 random_seed: Optional[int] = None,
+                 group_col: str = 'Genre',
+                 value_col: str = 'log_sales',
+                 key_cols: Optional[List[str]] = None,
+                 memory_budget: Optional[int] = None):
+        if random_seed is None:
+            # Draw a seed once; it is persisted with the state
+            random_seed = int(np.random.SeedSequence().generate_state(1, np.uint64)[0])
+        if random_seed < 0:
+            raise ValueError("random_seed must be non-negative")
+        super().__init__(n_iterations, None, group_col, value_col, memory_budget)
+        self.random_seed = random_seed
+        self.key_cols = key_cols
+        # Rows processed so far; the next row's positional key
+        self.n_rows = 0
+        # Byte offset just past the last row refresh_csv has processed, and
+        # a digest of the header and that row to detect rewritten files
+        self.offset = 0
+        self.checkpoint = ''
+
+    def update(self, chunk: pd.DataFrame) -> 'IncrementalBootstrap':
+        """
+        Add new rows.
+
+        Rows are keyed by position (self.n_rows onwards) or by key_cols, so
+        feeding the same rows in any chunking gives the same state.
+
+        Args:
+            chunk: DataFrame with the group and value (and key) columns
+
+        Returns:
+            The accumulator itself
+
+        Raises:
+            ValueError: If a column is missing or a value or label is NaN
+        """
+        if self.group_col not in chunk.columns or self.value_col not in chunk.columns:
+            raise ValueError(
+                f"DataFrame must contain '{self.group_col}' and '{self.value_col}' columns"
+            )
+        if len(chunk) == 0:
+            return self
+        values = chunk[self.value_col].to_numpy(dtype=float)
+        if np.isnan(values).any():
+            raise ValueError("values must not contain NaN")
+
+        if self.key_cols is None:
+            keys = np.arange(self.n_rows, self.n_rows + len(chunk), dtype=np.uint64)
+        else:
+            keys = row_keys(chunk, self.key_cols)
+        codes = self._group_codes(chunk[self.group_col].to_numpy())
+        self._accumulate(codes, values, lambda start, stop: keyed_poisson_weights(
+            keys[start:stop], self.random_seed, self.n_iterations))
+        self.n_rows += len(chunk)
+        return self
+
+    def merge(self, other: 'IncrementalBootstrap') -> 'IncrementalBootstrap':
+        """
+        Add the state of a shard with the same seed and disjoint row keys.
+
+        Raises:
+            ValueError: If the replicate counts or seeds differ
+        """
+        if other.random_seed != self.random_seed:
+            raise ValueError("Only accumulators with the same random_seed can be merged")
+        super().merge(other)
+        self.n_rows += other.n_rows
+        return self
+
+    def refresh_csv(self, filepath: Union[str, Path],
+                    chunksize: int = DEFAULT_CSV_CHUNKSIZE) -> int:
+        """
+        Add the rows appended to a CSV file since the last refresh.
+
+        Parsing starts at self.offset, the byte offset just past the last
+        processed row, so the cost is driven by the new rows alone. Only
+        complete lines are read: a last line without its newline is taken
+        to be still being written and is left for the next refresh. Group
+        labels are read as strings.
+
+        The file must only ever be appended to. A rewritten file (e.g.
+        regenerated in a different row order) is detected by checking the
+        header and the last processed line against the saved checkpoint;
+        positions, and positional keys, would no longer match the state.
+
+        Args:
+            filepath: Append-only CSV file with the group and value columns
+            chunksize: Rows per chunk
+
+        Returns:
+            Number of new rows added
+
+        Raises:
+            ValueError: If the file is shorter than what was already
+                        processed or its processed part changed (it was
+                        rewritten; rebuild the state instead), or the state
+                        holds rows added by update
+        """
+        columns = [self.group_col, self.value_col] + list(self.key_cols or [])
+        with open(filepath, 'rb') as f:
+            header = f.readline()
+            size = f.seek(0, os.SEEK_END)
+            if self.offset == 0 and self.n_rows > 0:
+                raise ValueError(
+                    f"{self.n_rows} rows were already processed outside refresh_csv; "
+                    f"their position in {filepath} is unknown"
+                )
+            if size < self.offset:
+                raise ValueError(
+                    f"{filepath} has {size} bytes but {self.offset} were already processed"
+                )
+            if self.offset > 0 and _line_digest(f, header, self.offset) != self.checkpoint:
+                raise ValueError(
+                    f"{filepath} changed before byte {self.offset} since the last refresh; "
+                    f"rebuild the state"
+                )
+            if not header.endswith(b'\n'):
+                return 0
+
+            start = max(self.offset, len(header))
+            stop = _last_line_end(f, start, size)
+            n_before = self.n_rows
+            if stop > start:
+                names = pd.read_csv(io.BytesIO(header), nrows=0).columns.tolist()
+                f.seek(start)
+                chunks = pd.read_csv(_BoundedReader(f, stop), header=None, names=names,
+                                     usecols=columns, dtype={self.group_col: str},
+                                     chunksize=chunksize)
+                for chunk in chunks:
+                    self.update(chunk)
+            self.offset = stop
+            self.checkpoint = _line_digest(f, header, stop)
+        return self.n_rows - n_before
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Persist the state as an .npz file.
+
+        The file is written under a temporary name and renamed into place,
+        so an interrupted refresh never leaves a partial state behind.
+        Group labels are stored as strings, so they must be strings (as
+        refresh_csv reads them) to load back unchanged.
+
+        Raises:
+            ValueError: If a group label is not a string
+        """
+        if not all(isinstance(group, str) for group in self.groups):
+            raise ValueError("group labels must be strings to be saved")
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.savez(
+                f,
+                n_iterations=self.n_iterations,
+                random_seed=np.uint64(self.random_seed),
+                n_rows=self.n_rows,
+                offset=self.offset,
+                checkpoint=self.checkpoint,
+                columns=np.array([self.group_col, self.value_col]),
+                key_cols=np.array(self.key_cols or [], dtype=str),
+                groups=np.array(self.groups, dtype=str),
+                totals=self.totals,
+                sizes=self.sizes,
+                sums=self.sums,
+                counts=self.counts
+            )
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Union[str, Path],
+             memory_budget: Optional[int] = None) -> 'IncrementalBootstrap':
+        """Load a state written by save."""
+        with np.load(path) as state:
+            group_col, value_col = state['columns'].tolist()
+            key_cols = state['key_cols'].tolist() or None
+            boot = cls(int(state['n_iterations']), int(state['random_seed']),
+                       group_col, value_col, key_cols, memory_budget)
+            boot.n_rows = int(state['n_rows'])
+            boot.offset = int(state['offset'])
+            boot.checkpoint = str(state['checkpoint'])
+            boot.groups = state['groups'].tolist()
+            boot._codes = {group: code for code, group in enumerate(boot.groups)}
+            boot.totals = state['totals']
+            boot.sizes = state['sizes']
+            boot.sums = state['sums']
+            boot.counts = state['counts']
+        return boot
+
+    @classmethod
+    def load_or_create(cls, path: Union[str, Path],
+                       n_iterations: int,
+                       random_seed: Optional[int] = None,
+                       **options) -> 'IncrementalBootstrap':
+        """
+        Load the state at path, or start an empty one if none exists.
+
+        Raises:
+            ValueError: If a stored state has a different n_iterations or seed
+        """
+        if not Path(path).exists():
+            return cls(n_iterations, random_seed, **options)
+        boot = cls.load(path, options.get('memory_budget'))
+        if boot.n_iterations != n_iterations or (random_seed is not None
+                                                 and boot.random_seed != random_seed):
+            raise ValueError(f"Stored state {path} uses different n_iterations or random_seed")
+        return boot
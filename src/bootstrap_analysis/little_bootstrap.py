@@ -0,0 +1,326 @@
+"""
+Bag of Little Bootstraps (BLB)
+
+For catalogue-scale samples a full-size resample of n rows per replicate
+is memory- and time-bound. The Bag of Little Bootstraps draws s subsets of
+b = n^gamma rows (without replacement) and, within each subset, simulates
+full-size resamples with multinomial weights: a replicate is
+Multinomial(n, 1/b) counts over the b subset rows, so it costs O(b)
+instead of O(n). Each subset yields the percentile offsets of its
+replicates about its own estimate (quantiles of theta* - theta_j); the
+BLB interval adds the averaged offsets to the full-data estimate, so it is
+centred on the sample statistic rather than on the noisy subset
+estimates.
+
+Subsets are independent tasks for ``run_bootstrap_tasks``: every worker
+only receives its b subset values, so per-worker memory is O(n^gamma),
+and every subset gets its own SeedSequence-spawned stream.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional
+
+from ..data_preprocessing.group_index import GroupIndex
+from .bootstrap_means import _genre_values
+from .confidence_intervals import batch_percentile_ci, is_significant
+from .parallel import run_bootstrap_tasks
+from .resampling import iter_blocks
+
+
+# Subset size exponent: b = ceil(n ** gamma)
+DEFAULT_GAMMA = 0.7
+
+
+def subset_size(n: int, gamma: float = DEFAULT_GAMMA) -> int:
+    """
+    BLB subset size ceil(n^gamma), capped at n.
+
+    Raises:
+        ValueError: If gamma is not in (0.5, 1]
+    """
+    if not 0.5 < gamma <= 1:
+        raise ValueError("gamma must be in (0.5, 1]")
+    return min(n, int(np.ceil(n ** gamma)))
+
+
+def blb_mean_kernel(subset: np.ndarray,
+                    n: int,
+                    n_iterations: int,
+                    random_seed: Optional[np.random.SeedSequence] = None) -> np.ndarray:
+    """
+    Full-size bootstrap means simulated on one BLB subset.
+
+    Args:
+        subset: The b subset values
+        n: Size of the full sample each replicate represents
+        n_iterations: Number of replicates
+        random_seed: Seed (or SeedSequence) of this subset's stream
+
+    Returns:
+        Array of replicate means (length n_iterations)
+    """
+    rng = np.random.default_rng(random_seed)
+    subset = np.asarray(subset, dtype=float)
+    probabilities = np.full(len(subset), 1 / len(subset))
+    means = np.empty(n_iterations)
+    # One int64 count per subset value
+    for start, stop in iter_blocks(n_iterations, 8 * len(subset)):
+        counts = rng.multinomial(n, probabilities, size=stop - start)
+        means[start:stop] = counts @ subset / n
+    return means
+
+
+def blb_difference_kernel(subset_A: np.ndarray,
+                          n_A: int,
+                          subset_B: np.ndarray,
+                          n_B: int,
+                          n_iterations: int,
+                          random_seed: Optional[np.random.SeedSequence] = None) -> np.ndarray:
+    """
+    Full-size bootstrap differences simulated on one pair of BLB subsets.
+
+    A and B are resampled independently from the same stream (A first).
+
+    Returns:
+        Array of replicate differences mean_A - mean_B
+    """
+    rng = np.random.default_rng(random_seed)
+    means_A = blb_mean_kernel(subset_A, n_A, n_iterations, rng)
+    return means_A - blb_mean_kernel(subset_B, n_B, n_iterations, rng)
+
+
+def _blb_interval(kernel,
+                  tasks,
+                  estimate: float,
+                  subset_estimates: np.ndarray,
+                  n_resamples: int,
+                  confidence_level: float,
+                  seed: np.random.SeedSequence,
+                  max_workers: Optional[int]) -> Dict:
+    """Run one kernel task per subset and add the averaged CI offsets to estimate."""
+    replicates = run_bootstrap_tasks(kernel, tasks, n_resamples, seed.entropy, max_workers)
+    # Offsets of every subset's replicates about that subset's own estimate
+    offsets = np.column_stack(replicates) - subset_estimates
+    lower, upper = batch_percentile_ci(offsets, confidence_level)
+    return {
+        'ci_lower': estimate + lower.mean(),
+        'ci_upper': estimate + upper.mean(),
+        'subset_lower': subset_estimates + lower,
+        'subset_upper': subset_estimates + upper
+    }
+
+
+def _draw_subsets(data: np.ndarray, b: int, n_subsets: int, rng: np.random.Generator):
+    return [data[rng.choice(len(data), size=b, replace=False)] for _ in range(n_subsets)]
+
+
+def blb_mean_ci(data: np.ndarray,
+                gamma: float = DEFAULT_GAMMA,
+                n_subsets: int = 20,
+                n_resamples: int = 100,
+                confidence_level: float = 0.95,
+                random_seed: Optional[int] = None,
+                max_workers: Optional[int] = None) -> Dict:
+    """
+    Bag of Little Bootstraps percentile CI for a mean.
+
+    Args:
+        data: 1D array of observations
+        gamma: Subset size exponent, b = ceil(n^gamma) (default: 0.7)
+        n_subsets: Number of subsets s
+        n_resamples: Full-size resamples per subset r
+        confidence_level: Confidence level (default: 0.95)
+        random_seed: Root seed for subset selection and resampling
+        max_workers: Worker processes (None: one per CPU; 1: serial)
+
+    Returns:
+        Dictionary with 'ci_lower', 'ci_upper' (full-data mean plus the
+        averaged subset offsets), 'subset_lower', 'subset_upper' (per-subset
+        CIs about the subset means) and 'subset_size'
+
+    Raises:
+        ValueError: If data is empty or a parameter is invalid
+    """
+    if len(data) == 0:
+        raise ValueError("Data array cannot be empty")
+    if n_subsets <= 0 or n_resamples <= 0:
+        raise ValueError("n_subsets and n_resamples must be positive")
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+
+    data = np.asarray(data, dtype=float)
+    b = subset_size(len(data), gamma)
+    # Child n_subsets is unused by run_bootstrap_tasks (children 0..s-1)
+    seed = np.random.SeedSequence(random_seed)
+    rng = np.random.default_rng(seed.spawn(n_subsets + 1)[-1])
+
+    subsets = _draw_subsets(data, b, n_subsets, rng)
+    tasks = [(subset, len(data)) for subset in subsets]
+    result = _blb_interval(blb_mean_kernel, tasks, data.mean(),
+                           np.array([subset.mean() for subset in subsets]),
+                           n_resamples, confidence_level, seed, max_workers)
+    result['subset_size'] = b
+    return result
+
+
+def blb_difference_ci(data_A: np.ndarray,
+                      data_B: np.ndarray,
+                      gamma: float = DEFAULT_GAMMA,
+                      n_subsets: int = 20,
+                      n_resamples: int = 100,
+                      confidence_level: float = 0.95,
+                      random_seed: Optional[int] = None,
+                      max_workers: Optional[int] = None) -> Dict:
+    """
+    Bag of Little Bootstraps percentile CI for mean_A - mean_B.
+
+    Each subset task pairs an n_A^gamma subset of A with an n_B^gamma
+    subset of B; both are resampled to their full sizes independently.
+
+    Args:
+        data_A: 1D array for genre A
+        data_B: 1D array for genre B
+        gamma: Subset size exponent (default: 0.7)
+        n_subsets: Number of subset pairs s
+        n_resamples: Full-size resamples per subset pair r
+        confidence_level: Confidence level (default: 0.95)
+        random_seed: Root seed for subset selection and resampling
+        max_workers: Worker processes (None: one per CPU; 1: serial)
+
+    Returns:
+        Dictionary with 'ci_lower', 'ci_upper', 'subset_lower',
+        'subset_upper' and 'subset_size' (tuple of b_A, b_B)
+
+    Raises:
+        ValueError: If either data array is empty or a parameter is invalid
+    """
+    if len(data_A) == 0 or len(data_B) == 0:
+        raise ValueError("Both data arrays must be non-empty")
+    if n_subsets <= 0 or n_resamples <= 0:
+        raise ValueError("n_subsets and n_resamples must be positive")
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+
+    data_A = np.asarray(data_A, dtype=float)
+    data_B = np.asarray(data_B, dtype=float)
+    b_A = subset_size(len(data_A), gamma)
+    b_B = subset_size(len(data_B), gamma)
+    seed = np.random.SeedSequence(random_seed)
+    rng = np.random.default_rng(seed.spawn(n_subsets + 1)[-1])
+
+    subsets_A = _draw_subsets(data_A, b_A, n_subsets, rng)
+    subsets_B = _draw_subsets(data_B, b_B, n_subsets, rng)
+    tasks = [(subset_A, len(data_A), subset_B, len(data_B))
+             for subset_A, subset_B in zip(subsets_A, subsets_B)]
+    subset_estimates = np.array([subset_A.mean() - subset_B.mean()
+                                 for subset_A, subset_B in zip(subsets_A, subsets_B)])
+    result = _blb_interval(blb_difference_kernel, tasks, data_A.mean() - data_B.mean(),
+                           subset_estimates, n_resamples, confidence_level, seed,
+                           max_workers)
+    result['subset_size'] = (b_A, b_B)
+    return result
+
+
+def blb_genre_mean(data: pd.DataFrame,
+                   genre: str,
+                   region: str,
+                   confidence_level: float = 0.95,
+                   random_seed: Optional[int] = None,
+                   max_workers: Optional[int] = None,
+                   index: Optional[GroupIndex] = None,
+                   **blb_options) -> Dict:
+    """
+    BLB percentile CI for a genre mean in a region.
+
+    Args:
+        data: DataFrame with 'Genre' and 'log_sales' columns
+        genre: Genre name to analyze
+        region: Region name (for identification purposes)
+        confidence_level: Confidence level (default: 0.95)
+        random_seed: Root seed for reproducibility
+        max_workers: Worker processes (None: one per CPU; 1: serial)
+        index: Optional GroupIndex of data by 'Genre'
+        **blb_options: gamma, n_subsets and n_resamples for blb_mean_ci
+
+    Returns:
+        Dictionary with 'genre', 'region', 'mean', 'ci_lower', 'ci_upper',
+        'sample_size' and 'subset_size'
+
+    Raises:
+        ValueError: If columns are missing or the genre has no data
+    """
+    if 'Genre' not in data.columns or 'log_sales' not in data.columns:
+        raise ValueError("DataFrame must contain 'Genre' and 'log_sales' columns")
+    values = _genre_values(data, genre, index)
+    if len(values) == 0:
+        raise ValueError(f"No data found for genre: {genre}")
+
+    interval = blb_mean_ci(values, confidence_level=confidence_level, random_seed=random_seed,
+                           max_workers=max_workers, **blb_options)
+    return {
+        'genre': genre,
+        'region': region,
+        'mean': np.mean(values),
+        'ci_lower': interval['ci_lower'],
+        'ci_upper': interval['ci_upper'],
+        'sample_size': len(values),
+        'subset_size': interval['subset_size']
+    }
+
+
+def blb_genre_difference(data: pd.DataFrame,
+                         genre_A: str,
+                         genre_B: str,
+                         region: str,
+                         confidence_level: float = 0.95,
+                         random_seed: Optional[int] = None,
+                         max_workers: Optional[int] = None,
+                         index: Optional[GroupIndex] = None,
+                         **blb_options) -> Dict:
+    """
+    BLB percentile CI for the difference of two genre means in a region.
+
+    Args:
+        data: DataFrame with 'Genre' and 'log_sales' columns
+        genre_A: First genre name
+        genre_B: Second genre name
+        region: Region name (for identification purposes)
+        confidence_level: Confidence level (default: 0.95)
+        random_seed: Root seed for reproducibility
+        max_workers: Worker processes (None: one per CPU; 1: serial)
+        index: Optional GroupIndex of data by 'Genre'
+        **blb_options: gamma, n_subsets and n_resamples for blb_difference_ci
+
+    Returns:
+        Dictionary with 'genre_A', 'genre_B', 'region', 'mean_difference',
+        'ci_lower', 'ci_upper', 'significant', 'sample_size_A',
+        'sample_size_B' and 'subset_size'
+
+    Raises:
+        ValueError: If columns are missing or either genre has no data
+    """
+    if 'Genre' not in data.columns or 'log_sales' not in data.columns:
+        raise ValueError("DataFrame must contain 'Genre' and 'log_sales' columns")
+    data_A = _genre_values(data, genre_A, index)
+    data_B = _genre_values(data, genre_B, index)
+    if len(data_A) == 0:
+        raise ValueError(f"No data found for genre: {genre_A}")
+    if len(data_B) == 0:
+        raise ValueError(f"No data found for genre: {genre_B}")
+
+    interval = blb_difference_ci(data_A, data_B, confidence_level=confidence_level,
+                                 random_seed=random_seed, max_workers=max_workers,
+                                 **blb_options)
+    return {
+        'genre_A': genre_A,
+        'genre_B': genre_B,
+        'region': region,
+        'mean_difference': np.mean(data_A) - np.mean(data_B),
+        'ci_lower': interval['ci_lower'],
+        'ci_upper': interval['ci_upper'],
+        'significant': is_significant(interval['ci_lower'], interval['ci_upper']),
+        'sample_size_A': len(data_A),
+        'sample_size_B': len(data_B),
+        'subset_size': interval['subset_size']
+    }
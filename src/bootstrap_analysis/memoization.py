@@ -0,0 +1,141 @@
+"""
+In-Process Memoization for Genre Bootstraps
+
+Interactive sessions (notebooks, figure scripts) tend to request the same
+genre/region bootstrap many times. ``BootstrapCache`` keeps recent
+results in memory, keyed on a fingerprint of the relevant DataFrame
+columns plus the call parameters, and evicts least-recently-used entries
+once the replicate arrays it holds exceed a byte budget.
+
+Memoization is opt-in: pass ``cache=BootstrapCache(...)`` to
+``bootstrap_genre_mean_by_region`` or ``bootstrap_genre_difference``.
+"""
+
+import hashlib
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+
+def frame_fingerprint(data: pd.DataFrame, columns: List[str]) -> str:
+    """
+    Compute a fingerprint of selected DataFrame columns.
+
+    Uses pandas' vectorized row hashing, which is cheap compared with a
+    bootstrap of the same data.
+
+    Args:
+        data: DataFrame to fingerprint
+        columns: Columns that the computation depends on
+
+    Returns:
+        Hex digest string
+    """
+    row_hashes = pd.util.hash_pandas_object(data[columns], index=False).to_numpy()
+    return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+
+def _result_nbytes(result: Dict) -> int:
+    """Count the bytes held by the arrays of a result dictionary."""
+    return sum(v.nbytes for v in result.values() if isinstance(v, np.ndarray))
+
+
+class BootstrapCache:
+    """
+    Size-bounded LRU cache of bootstrap result dictionaries.
+
+    Only the bytes of NumPy arrays in the results are counted against the
+    budget. The cache stores read-only copies of the arrays, so the
+    caller's own arrays stay writeable, and every hit returns a new
+    dictionary, so callers cannot corrupt cached entries.
+
+    Example:
+        cache = BootstrapCache(max_bytes=256 * 1024 ** 2)
+        result = bootstrap_genre_mean_by_region(df, 'Action', 'NA',
+                                                random_seed=42, cache=cache)
+        cache.stats()  # {'hits': 0, 'misses': 1, ...}
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 ** 2):
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, Dict]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """
+        Look up a result and mark it as most recently used.
+
+        Returns:
+            Copy of the cached result dictionary, or None on a miss
+        """
+        result = self._entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return dict(result)
+
+    def put(self, key: Hashable, result: Dict) -> None:
+        """
+        Store a result, evicting least-recently-used entries as needed.
+
+        Arrays are copied, so the caller's result is left untouched.
+        Results larger than the whole budget are not stored.
+        """
+        size = _result_nbytes(result)
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self.current_bytes -= _result_nbytes(self._entries.pop(key))
+
+        entry = {}
+        for name, value in result.items():
+            if isinstance(value, np.ndarray):
+                # Freeze a copy; the caller keeps ownership of its array
+                value = value.copy()
+                value.flags.writeable = False
+            entry[name] = value
+        self._entries[key] = entry
+        self.current_bytes += size
+
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= _result_nbytes(evicted)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict:
+        """
+        Report cache usage.
+
+        Returns:
+            Dictionary with 'hits', 'misses', 'evictions', 'entries',
+            'bytes' and 'max_bytes'
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes
+        }
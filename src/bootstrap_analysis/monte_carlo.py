@@ -0,0 +1,260 @@
+"""
+Monte Carlo Error and Adaptive Replicate Counts
+
+A bootstrap CI endpoint computed from B replicates is itself a random
+quantity: another seed moves it. This module estimates that Monte Carlo
+standard error (MCSE) by batch means: the replicates are split into
+equal batches, the endpoint is computed in every batch, and the spread of
+the batch endpoints over sqrt(#batches) estimates the MCSE of the pooled
+endpoint.
+
+The significance decision inherits this uncertainty: ``significance_mcse``
+turns the endpoint MCSEs into the probability that another seed would
+flip the decision and the standard error of the decision indicator.
+
+The adaptive functions use the MCSE as a stopping rule. Replicates are
+generated batch by batch from one random stream and generation stops once
+both endpoints are known to within a tolerance (or a maximum count is
+reached), so easy questions stop early and borderline ones get more
+replicates.
+"""
+
+import numpy as np
+from scipy.special import ndtr
+from typing import Callable, Dict, Optional, Tuple, Union
+
+from .confidence_intervals import batch_percentile_ci
+from .resampling import resample_means
+
+
+# Number of batches used for batch-means Monte Carlo errors
+DEFAULT_N_BATCHES = 20
+
+
+def endpoint_mcse(replicates: np.ndarray,
+                  confidence_level: float = 0.95,
+                  n_batches: int = DEFAULT_N_BATCHES,
+                  interval: Optional[Callable[[np.ndarray], Tuple[float, float]]] = None
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Batch-means Monte Carlo standard errors of CI endpoints.
+
+    Replicates beyond the last full batch are ignored. Works along axis 0,
+    so a (replicates x tasks) matrix gives one error per task.
+
+    Args:
+        replicates: Bootstrap statistics with replicates along axis 0
+        confidence_level: Confidence level of the interval
+        n_batches: Number of batches (at least 2)
+        interval: Optional function mapping 1D replicates to (lower, upper)
+                  for other interval methods (e.g. a bca_ci closure);
+                  default: percentile intervals, all columns at once
+
+    Returns:
+        Tuple of (mcse_lower, mcse_upper) with shape replicates.shape[1:]
+
+    Raises:
+        ValueError: If n_batches < 2 or there are fewer replicates than batches
+    """
+    if n_batches < 2:
+        raise ValueError("n_batches must be at least 2")
+    replicates = np.asarray(replicates, dtype=float)
+    batch_size = len(replicates) // n_batches
+    if batch_size == 0:
+        raise ValueError("Need at least one replicate per batch")
+
+    # (batch_size, n_batches, ...) so that each batch is one column
+    batches = replicates[:batch_size * n_batches].reshape(
+        (n_batches, batch_size) + replicates.shape[1:]
+    ).swapaxes(0, 1)
+    if interval is None:
+        lower, upper = batch_percentile_ci(batches, confidence_level)
+    else:
+        lower, upper = np.array([interval(batches[:, b]) for b in range(n_batches)]).T
+
+    scale = np.sqrt(n_batches)
+    return lower.std(axis=0, ddof=1) / scale, upper.std(axis=0, ddof=1) / scale
+
+
+def significance_mcse(ci_lower: Union[float, np.ndarray],
+                      ci_upper: Union[float, np.ndarray],
+                      mcse_lower: Union[float, np.ndarray],
+                      mcse_upper: Union[float, np.ndarray],
+                      null_value: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Monte Carlo uncertainty of the "CI excludes null_value" decision.
+
+    Treating each endpoint as normal around its estimate with its MCSE, a
+    rerun is significant with probability about
+    Phi((lower - null) / mcse_lower) + Phi((null - upper) / mcse_upper).
+    The flip probability is that chance (or its complement, for a
+    currently significant result), and the decision indicator's MCSE is
+    sqrt(p_flip * (1 - p_flip)).
+
+    Args:
+        ci_lower, ci_upper: Interval endpoints
+        mcse_lower, mcse_upper: Their Monte Carlo standard errors
+        null_value: Null hypothesis value (default: 0.0)
+
+    Returns:
+        Tuple of (flip_probability, decision_mcse), elementwise
+    """
+    ci_lower, ci_upper = np.asarray(ci_lower, dtype=float), np.asarray(ci_upper, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z_lower = (ci_lower - null_value) / np.asarray(mcse_lower, dtype=float)
+        z_upper = (null_value - ci_upper) / np.asarray(mcse_upper, dtype=float)
+    # A zero MCSE means the endpoint does not move; exactly-at-null counts half
+    z_lower = np.nan_to_num(z_lower, nan=0.0)
+    z_upper = np.nan_to_num(z_upper, nan=0.0)
+
+    p_significant = np.clip(ndtr(z_lower) + ndtr(z_upper), 0.0, 1.0)
+    significant = (ci_lower > null_value) | (ci_upper < null_value)
+    flip_probability = np.where(significant, 1 - p_significant, p_significant)
+    return flip_probability, np.sqrt(flip_probability * (1 - flip_probability))
+
+
+def run_adaptive(draw_batch: Callable[[int], np.ndarray],
+                 tolerance: float,
+                 confidence_level: float = 0.95,
+                 batch_size: int = 1000,
+                 max_iterations: int = 100000,
+                 n_batches: int = DEFAULT_N_BATCHES) -> Dict:
+    """
+    Generate replicates until the CI endpoints are stable enough.
+
+    After every batch the endpoint MCSEs of all replicates so far are
+    estimated with endpoint_mcse; generation stops when both are at most
+    tolerance or max_iterations replicates exist.
+
+    Args:
+        draw_batch: Function returning the next k replicates
+        tolerance: Target MCSE of each endpoint (in units of the statistic)
+        confidence_level: Confidence level of the interval
+        batch_size: Replicates generated between checks
+        max_iterations: Upper bound on the number of replicates
+        n_batches: Batches used for the MCSE estimate
+
+    Returns:
+        Dictionary with keys 'replicates', 'n_iterations', 'ci_lower',
+        'ci_upper', 'mcse_lower', 'mcse_upper' and 'converged'
+
+    Raises:
+        ValueError: If tolerance, batch_size or max_iterations is not
+                    positive, or confidence_level is not in (0, 1)
+    """
+    if tolerance <= 0:
+        raise ValueError("tolerance must be positive")
+    if batch_size <= 0 or max_iterations <= 0:
+        raise ValueError("batch_size and max_iterations must be positive")
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+
+    blocks = []
+    n_iterations = 0
+    mcse_lower = mcse_upper = np.inf
+    while n_iterations < max_iterations:
+        size = min(batch_size, max_iterations - n_iterations)
+        blocks.append(draw_batch(size))
+        n_iterations += size
+
+        # The MCSE needs a few replicates in every batch to mean anything
+        if n_iterations >= 2 * n_batches:
+            mcse_lower, mcse_upper = endpoint_mcse(
+                np.concatenate(blocks), confidence_level, n_batches
+            )
+            if max(mcse_lower, mcse_upper) <= tolerance:
+                break
+
+    replicates = np.concatenate(blocks)
+    ci_lower, ci_upper = batch_percentile_ci(replicates, confidence_level)
+    return {
+        'replicates': replicates,
+        'n_iterations': n_iterations,
+        'ci_lower': ci_lower[()],
+        'ci_upper': ci_upper[()],
+        'mcse_lower': float(mcse_lower),
+        'mcse_upper': float(mcse_upper),
+        'converged': bool(max(mcse_lower, mcse_upper) <= tolerance)
+    }
+
+
+def adaptive_bootstrap_mean(data: np.ndarray,
+                            tolerance: float,
+                            confidence_level: float = 0.95,
+                            batch_size: int = 1000,
+                            max_iterations: int = 100000,
+                            random_seed: Optional[int] = None,
+                            scheme: str = 'iid') -> Dict:
+    """
+    Bootstrap the mean with as many replicates as the CI needs.
+
+    Batches are drawn from a single generator, so the replicates are a
+    prefix of bootstrap_mean(data, max_iterations, random_seed) for the
+    'iid' scheme.
+
+    Args:
+        data: 1D array of observations
+        tolerance: Target Monte Carlo SE of each CI endpoint
+        confidence_level: Confidence level of the interval
+        batch_size: Replicates generated between checks
+        max_iterations: Upper bound on the number of replicates
+        random_seed: Random seed for reproducibility
+        scheme: Resampling scheme (default: 'iid')
+
+    Returns:
+        Dictionary as returned by run_adaptive
+
+    Raises:
+        ValueError: If data is empty or a parameter is invalid
+    """
+    if len(data) == 0:
+        raise ValueError("Data array cannot be empty")
+
+    rng = np.random.default_rng(random_seed)
+    return run_adaptive(
+        lambda k: resample_means(data, k, rng, scheme=scheme),
+        tolerance, confidence_level, batch_size, max_iterations
+    )
+
+
+def adaptive_bootstrap_difference(data_A: np.ndarray,
+                                  data_B: np.ndarray,
+                                  tolerance: float,
+                                  confidence_level: float = 0.95,
+                                  batch_size: int = 1000,
+                                  max_iterations: int = 100000,
+                                  random_seed: Optional[int] = None,
+                                  scheme: str = 'iid') -> Dict:
+    """
+    Bootstrap a difference in means with as many replicates as the CI needs.
+
+    Each batch resamples A and then B from one generator (independent
+    resampling per group, as in bootstrap_difference, but interleaved by
+    batch).
+
+    Args:
+        data_A: 1D array for genre A
+        data_B: 1D array for genre B
+        tolerance: Target Monte Carlo SE of each CI endpoint
+        confidence_level: Confidence level of the interval
+        batch_size: Replicates generated between checks
+        max_iterations: Upper bound on the number of replicates
+        random_seed: Random seed for reproducibility
+        scheme: Resampling scheme (default: 'iid')
+
+    Returns:
+        Dictionary as returned by run_adaptive
+
+    Raises:
+        ValueError: If either data array is empty or a parameter is invalid
+    """
+    if len(data_A) == 0 or len(data_B) == 0:
+        raise ValueError("Both data arrays must be non-empty")
+
+    rng = np.random.default_rng(random_seed)
+
+    def draw_batch(k: int) -> np.ndarray:
+        means_A = resample_means(data_A, k, rng, scheme=scheme)
+        return means_A - resample_means(data_B, k, rng, scheme=scheme)
+
+    return run_adaptive(draw_batch, tolerance, confidence_level, batch_size, max_iterations)
@@ -0,0 +1,260 @@
+"""
+Parallel Bootstrap Execution
+
+This module fans bootstrap work out over a process pool. Work is split
+into units of (task, replicate chunk): a task is e.g. one (region, genre)
+mean or one (region, pair) difference, and large tasks are cut into
+fixed-size replicate chunks.
+
+Every unit gets its own random stream derived with ``SeedSequence.spawn``
+from the single user seed. Chunk boundaries and seeds do not depend on
+the number of workers, so results are bit-identical for any worker count
+(including serial execution with ``max_workers=1``).
+
+The genre-level helpers publish the group-sorted log_sales values once
+through shared memory (see ``shared_data.py``); tasks only carry slice
+bounds, not data.
+"""
+
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from .bootstrap_means import _encode_groups
+from .shared_data import SharedArray, shared_difference_kernel, shared_mean_kernel
+
+
+# Replicates per unit of work; fixed so that results do not depend on workers
+DEFAULT_CHUNK_SIZE = 2500
+
+
+def chunk_sizes(n_iterations: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[int]:
+    """
+    Split a replicate count into fixed-size chunks.
+
+    Args:
+        n_iterations: Total number of replicates
+        chunk_size: Maximum replicates per chunk
+
+    Returns:
+        List of chunk lengths summing to n_iterations
+
+    Raises:
+        ValueError: If n_iterations or chunk_size is not positive
+    """
+    if n_iterations <= 0:
+        raise ValueError("n_iterations must be positive")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    full, rest = divmod(n_iterations, chunk_size)
+    return [chunk_size] * full + ([rest] if rest else [])
+
+
+def spawn_seeds(random_seed: Optional[int],
+                n_tasks: int,
+                n_chunks: int) -> List[List[np.random.SeedSequence]]:
+    """
+    Derive one independent seed per (task, chunk) unit from a single seed.
+
+    Args:
+        random_seed: Root seed (None draws fresh OS entropy)
+        n_tasks: Number of tasks
+        n_chunks: Number of replicate chunks per task
+
+    Returns:
+        Nested list indexed as seeds[task][chunk]
+    """
+    root = np.random.SeedSequence(random_seed)
+    return [task_seed.spawn(n_chunks) for task_seed in root.spawn(n_tasks)]
+
+
+def run_bootstrap_tasks(kernel: Callable[..., np.ndarray],
+                        tasks: Sequence[Tuple],
+                        n_iterations: int,
+                        random_seed: Optional[int] = None,
+                        max_workers: Optional[int] = None,
+                        chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        combine: Optional[Callable[[List], object]] = None) -> List:
+    """
+    Run a bootstrap kernel for many tasks on a process pool.
+
+    The kernel is called as ``kernel(*task, n_iterations=k, random_seed=seed)``
+    for every replicate chunk of every task and must return its replicates
+    along axis 0 (``bootstrap_mean`` and ``bootstrap_difference`` qualify).
+    The kernel and task arguments must be picklable.
+
+    Kernels may return another mergeable summary instead, e.g.
+    ``bootstrap_mean_sketch`` with ``combine=merge_sketches``; the chunks
+    of a task are always combined in chunk order.
+
+    Args:
+        kernel: Module-level bootstrap function
+        tasks: Positional arguments for each task
+        n_iterations: Number of bootstrap replicates per task
+        random_seed: Root seed for all tasks
+        max_workers: Number of worker processes (None: one per CPU;
+                     1: run serially in this process)
+        chunk_size: Maximum replicates per unit of work
+        combine: Function merging a task's chunk results (default:
+                 np.concatenate)
+
+    Returns:
+        List of replicate arrays (or combined summaries), one per task,
+        in task order
+    """
+    sizes = chunk_sizes(n_iterations, chunk_size)
+    seeds = spawn_seeds(random_seed, len(tasks), len(sizes))
+    units = [
+        (args, size, seeds[t][c])
+        for t, args in enumerate(tasks)
+        for c, size in enumerate(sizes)
+    ]
+
+    if max_workers == 1:
+        chunks = [kernel(*args, n_iterations=size, random_seed=seed)
+                  for args, size, seed in units]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [executor.submit(kernel, *args, n_iterations=size, random_seed=seed)
+                       for args, size, seed in units]
+            chunks = [future.result() for future in futures]
+
+    combine = np.concatenate if combine is None else combine
+    n_chunks = len(sizes)
+    return [combine(chunks[t * n_chunks:(t + 1) * n_chunks])
+            for t in range(len(tasks))]
+
+
+def _encode_datasets(datasets: Dict[str, pd.DataFrame],
+                     genres: List[str]) -> Tuple[np.ndarray, Dict[Tuple[str, str], Tuple[int, int]]]:
+    """
+    Lay out the log_sales values of all regions as one group-sorted array.
+
+    Args:
+        datasets: Mapping of region name -> DataFrame with 'Genre' and 'log_sales'
+        genres: Genres to keep
+
+    Returns:
+        Tuple of (values, slices) where slices maps (region, genre) to the
+        (start, stop) range of that group in values
+
+    Raises:
+        ValueError: If columns are missing or a genre has no data in a region
+    """
+    parts = []
+    slices = {}
+    base = 0
+
+    for region, data in datasets.items():
+        if 'Genre' not in data.columns or 'log_sales' not in data.columns:
+            raise ValueError("DataFrame must contain 'Genre' and 'log_sales' columns")
+        labels, sorted_values, offsets = _encode_groups(data, 'Genre', 'log_sales', genres)
+        for g, genre in enumerate(labels):
+            slices[(region, genre)] = (int(base + offsets[g]), int(base + offsets[g + 1]))
+        parts.append(sorted_values)
+        base += len(sorted_values)
+
+    values = np.concatenate(parts) if parts else np.empty(0)
+    return values, slices
+
+
+def parallel_genre_means(datasets: Dict[str, pd.DataFrame],
+                         genres: List[str],
+                         n_iterations: int = 10000,
+                         random_seed: Optional[int] = None,
+                         max_workers: Optional[int] = None,
+                         chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict]:
+    """
+    Bootstrap genre means for every (region, genre) task in parallel.
+
+    Args:
+        datasets: Mapping of region name -> DataFrame with 'Genre' and 'log_sales'
+        genres: Genres to analyze in each region
+        n_iterations: Number of bootstrap iterations per task
+        random_seed: Root seed; each task and chunk gets a spawned stream
+        max_workers: Number of worker processes (1: serial)
+        chunk_size: Maximum replicates per unit of work
+
+    Returns:
+        List of dictionaries with the keys of bootstrap_genre_mean_by_region,
+        ordered by region then genre
+
+    Raises:
+        ValueError: If a genre has no data in a region
+    """
+    values, slices = _encode_datasets(datasets, genres)
+    keys = [(region, genre) for region in datasets for genre in genres]
+
+    with SharedArray(values) as handle:
+        tasks = [(handle,) + slices[key] for key in keys]
+        replicates = run_bootstrap_tasks(
+            shared_mean_kernel, tasks, n_iterations, random_seed, max_workers, chunk_size
+        )
+
+    results = []
+    for (region, genre), bootstrap_means in zip(keys, replicates):
+        start, stop = slices[(region, genre)]
+        results.append({
+            'genre': genre,
+            'region': region,
+            'mean': np.mean(values[start:stop]),
+            'bootstrap_means': bootstrap_means,
+            'sample_size': stop - start
+        })
+    return results
+
+
+def parallel_genre_differences(datasets: Dict[str, pd.DataFrame],
+                               genre_pairs: List[Tuple[str, str]],
+                               n_iterations: int = 10000,
+                               random_seed: Optional[int] = None,
+                               max_workers: Optional[int] = None,
+                               chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict]:
+    """
+    Bootstrap genre differences for every (region, pair) task in parallel.
+
+    Args:
+        datasets: Mapping of region name -> DataFrame with 'Genre' and 'log_sales'
+        genre_pairs: (genre_A, genre_B) pairs to compare in each region
+        n_iterations: Number of bootstrap iterations per task
+        random_seed: Root seed; each task and chunk gets a spawned stream
+        max_workers: Number of worker processes (1: serial)
+        chunk_size: Maximum replicates per unit of work
+
+    Returns:
+        List of dictionaries with the keys of bootstrap_genre_difference,
+        ordered by region then pair
+
+    Raises:
+        ValueError: If a genre has no data in a region
+    """
+    genres = list(dict.fromkeys(g for pair in genre_pairs for g in pair))
+    values, slices = _encode_datasets(datasets, genres)
+    keys = [(region, a, b) for region in datasets for a, b in genre_pairs]
+
+    with SharedArray(values) as handle:
+        tasks = [(handle,) + slices[(region, a)] + slices[(region, b)] for region, a, b in keys]
+        replicates = run_bootstrap_tasks(
+            shared_difference_kernel, tasks, n_iterations, random_seed, max_workers, chunk_size
+        )
+
+    results = []
+    for (region, genre_A, genre_B), differences in zip(keys, replicates):
+        start_A, stop_A = slices[(region, genre_A)]
+        start_B, stop_B = slices[(region, genre_B)]
+        mean_A = np.mean(values[start_A:stop_A])
+        mean_B = np.mean(values[start_B:stop_B])
+        results.append({
+            'genre_A': genre_A,
+            'genre_B': genre_B,
+            'region': region,
+            'mean_difference': mean_A - mean_B,
+            'bootstrap_differences': differences,
+            'sample_size_A': stop_A - start_A,
+            'sample_size_B': stop_B - start_B,
+            'mean_A': mean_A,
+            'mean_B': mean_B
+        })
+    return results
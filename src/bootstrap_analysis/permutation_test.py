@@ -0,0 +1,279 @@
+"""
+Vectorized Permutation Tests for Genre Differences
+
+A bootstrap CI describes the uncertainty of a difference; a permutation
+test asks whether the labels matter at all. Under the null hypothesis the
+genre labels are exchangeable, so the p-value of the observed difference
+in means is the share of label permutations whose difference is at least
+as extreme (two-sided, counting the observed labelling: (1 + #) / (1 + B)).
+
+Permutations are generated in memory-bounded blocks: one
+``Generator.permuted`` call shuffles a (block_size x n) copy of the pooled
+values row by row, and one segmented sum (``np.add.reduceat``, i.e. the
+differences of the row cumulative sums at the group boundaries) gives
+every group's permuted sum. Every group mean, and so every pair
+difference, of a block follows from those sums; only exceedance counts are
+kept, so memory does not grow with the number of permutations.
+
+Two modes:
+- per pair (default): each pair pools only its two genres, the exact
+  two-sample permutation test.
+- shared: one permutation stream per region relabels all analysed genres
+  at once, and every pair is read off the same permutations. The pair
+  p-values then test the complete null (no genre differs in the region);
+  in exchange all pairs cost a single shuffle per permutation, and the
+  joint null distribution gives Westfall-Young single-step maxT adjusted
+  p-values that control the family-wise error rate across the pairs.
+
+Tasks and permutation chunks run through ``run_bootstrap_tasks`` with
+SeedSequence-spawned streams on the shared-memory data plane, so results
+do not depend on the number of workers.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .parallel import DEFAULT_CHUNK_SIZE, _encode_datasets, run_bootstrap_tasks
+from .resampling import iter_blocks
+from .shared_data import SharedArray, SharedHandle, attach_array
+
+
+# Relative tolerance under which a permuted statistic counts as a tie
+TIE_TOLERANCE = 1e-10
+
+
+def _pair_statistics(sums: np.ndarray,
+                     sizes: np.ndarray,
+                     pairs: np.ndarray,
+                     scales: np.ndarray) -> np.ndarray:
+    """Standardized differences of group means for every pair (along the last axis)."""
+    means = sums / sizes
+    return (means[..., pairs[:, 0]] - means[..., pairs[:, 1]]) / scales
+
+
+def permutation_counts(values: np.ndarray,
+                       sizes: Sequence[int],
+                       pairs: Sequence[Tuple[int, int]],
+                       n_permutations: int,
+                       rng: np.random.Generator,
+                       memory_budget: Optional[int] = None) -> np.ndarray:
+    """
+    Count permutations at least as extreme as the observed pair differences.
+
+    Args:
+        values: Pooled values, group by group
+        sizes: Size of every group (summing to len(values))
+        pairs: (a, b) group index pairs, statistic mean_a - mean_b
+        n_permutations: Number of label permutations
+        rng: NumPy random generator
+        memory_budget: Budget in bytes for one block (default: MEMORY_BUDGET_BYTES)
+
+    Returns:
+        int64 array of shape (2, n_pairs): row 0 counts |T*_p| >= |T_p|
+        per pair, row 1 counts max_q |T*_q| >= |T_p| (maxT, with the
+        differences standardized by their permutation standard deviation)
+    """
+    values = np.asarray(values, dtype=float)
+    sizes = np.asarray(sizes, dtype=np.int64)
+    pairs = np.asarray(pairs, dtype=np.intp).reshape(-1, 2)
+    n = len(values)
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+
+    # Permutation SD of mean_a - mean_b is sd(pool) * sqrt(1/n_a + 1/n_b);
+    # a constant pool has no spread, and any positive scale keeps ties ties
+    spread = np.std(values, ddof=1) if n > 1 else 0.0
+    spread = spread if spread > 0 else 1.0
+    scales = spread * np.sqrt(1 / sizes[pairs[:, 0]] + 1 / sizes[pairs[:, 1]])
+
+    observed = np.abs(_pair_statistics(np.add.reduceat(values, starts), sizes, pairs, scales))
+    threshold = observed - TIE_TOLERANCE * np.maximum(1.0, observed)
+
+    counts = np.zeros((2, len(pairs)), dtype=np.int64)
+    # One permuted float64 copy per observation plus its row cumulative work
+    for start, stop in iter_blocks(n_permutations, 16 * n, memory_budget):
+        permuted = rng.permuted(np.broadcast_to(values, (stop - start, n)), axis=1)
+        statistics = np.abs(_pair_statistics(np.add.reduceat(permuted, starts, axis=1),
+                                              sizes, pairs, scales))
+        counts[0] += np.count_nonzero(statistics >= threshold, axis=0)
+        counts[1] += np.count_nonzero(statistics.max(axis=1, keepdims=True) >= threshold,
+                                      axis=0)
+    return counts
+
+
+def permutation_test(data_A: np.ndarray,
+                     data_B: np.ndarray,
+                     n_permutations: int = 10000,
+                     random_seed: Optional[int] = None) -> Dict:
+    """
+    Two-sided permutation test for a difference in means.
+
+    Args:
+        data_A: 1D array for genre A
+        data_B: 1D array for genre B
+        n_permutations: Number of label permutations
+        random_seed: Random seed for reproducibility
+
+    Returns:
+        Dictionary with 'mean_difference', 'p_value' and 'n_permutations'
+
+    Raises:
+        ValueError: If either data array is empty or n_permutations is
+                    not positive
+    """
+    if len(data_A) == 0 or len(data_B) == 0:
+        raise ValueError("Both data arrays must be non-empty")
+    if n_permutations <= 0:
+        raise ValueError("n_permutations must be positive")
+
+    rng = np.random.default_rng(random_seed)
+    counts = permutation_counts(np.concatenate([data_A, data_B]), [len(data_A), len(data_B)],
+                                [(0, 1)], n_permutations, rng)
+    return {
+        'mean_difference': np.mean(data_A) - np.mean(data_B),
+        'p_value': (1 + counts[0, 0]) / (1 + n_permutations),
+        'n_permutations': n_permutations
+    }
+
+
+def shared_permutation_kernel(handle: SharedHandle,
+                              segments: Sequence[Tuple[int, int]],
+                              pairs: Sequence[Tuple[int, int]],
+                              n_iterations: int,
+                              random_seed=None) -> np.ndarray:
+    """
+    Run permutation_counts on groups given as slices of a published array.
+
+    Args:
+        handle: Handle of the published values
+        segments: (start, stop) slice of every group
+        pairs: (a, b) indices into segments
+        n_iterations: Number of permutations
+        random_seed: Seed or SeedSequence for this unit of work
+
+    Returns:
+        Exceedance counts as returned by permutation_counts
+    """
+    values = attach_array(handle)
+    pooled = np.concatenate([values[start:stop] for start, stop in segments])
+    sizes = [stop - start for start, stop in segments]
+    return permutation_counts(pooled, sizes, pairs, n_iterations,
+                              np.random.default_rng(random_seed))
+
+
+def _sum_counts(chunks: List[np.ndarray]) -> np.ndarray:
+    return np.sum(chunks, axis=0)
+
+
+def parallel_permutation_tests(datasets: Dict[str, pd.DataFrame],
+                               genre_pairs: List[Tuple[str, str]],
+                               n_permutations: int = 10000,
+                               random_seed: Optional[int] = None,
+                               shared: bool = False,
+                               alpha: float = 0.05,
+                               max_workers: Optional[int] = None,
+                               chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Dict]:
+    """
+    Permutation p-values for every (region, pair) genre difference.
+
+    Args:
+        datasets: Mapping of region name -> DataFrame with 'Genre' and 'log_sales'
+        genre_pairs: (genre_A, genre_B) pairs to test in each region
+        n_permutations: Number of permutations per task
+        random_seed: Root seed; each task and chunk gets a spawned stream
+        shared: One permutation stream per region for all pairs (complete
+                null, adds maxT adjusted p-values) instead of one per pair
+        alpha: Significance level for the 'significant' flag
+        max_workers: Number of worker processes (None: one per CPU; 1: serial)
+        chunk_size: Maximum permutations per unit of work
+
+    Returns:
+        List of dictionaries with 'genre_A', 'genre_B', 'region',
+        'mean_difference', 'p_value', 'significant', 'sample_size_A',
+        'sample_size_B', 'mean_A', 'mean_B', 'n_permutations' and, when
+        shared, 'p_value_adjusted'; ordered by region then pair
+
+    Raises:
+        ValueError: If a genre has no data in a region or a parameter is invalid
+    """
+    if n_permutations <= 0:
+        raise ValueError("n_permutations must be positive")
+    if not 0 < alpha < 1:
+        raise ValueError("alpha must be between 0 and 1")
+
+    genres = list(dict.fromkeys(g for pair in genre_pairs for g in pair))
+    values, slices = _encode_datasets(datasets, genres)
+    position = {genre: g for g, genre in enumerate(genres)}
+    pair_indices = [(position[a], position[b]) for a, b in genre_pairs]
+
+    if shared:
+        tasks_keys = [[(region, a, b) for a, b in genre_pairs] for region in datasets]
+        task_args = [([slices[(region, genre)] for genre in genres], pair_indices)
+                     for region in datasets]
+    else:
+        tasks_keys = [[(region, a, b)] for region in datasets for a, b in genre_pairs]
+        task_args = [([slices[(region, a)], slices[(region, b)]], [(0, 1)])
+                     for region in datasets for a, b in genre_pairs]
+
+    with SharedArray(values) as handle:
+        counts = run_bootstrap_tasks(
+            shared_permutation_kernel, [(handle,) + args for args in task_args],
+            n_permutations, random_seed, max_workers, chunk_size, combine=_sum_counts
+        )
+
+    results = []
+    for keys, task_counts in zip(tasks_keys, counts):
+        for p, (region, genre_A, genre_B) in enumerate(keys):
+            start_A, stop_A = slices[(region, genre_A)]
+            start_B, stop_B = slices[(region, genre_B)]
+            mean_A = np.mean(values[start_A:stop_A])
+            mean_B = np.mean(values[start_B:stop_B])
+            p_value = (1 + task_counts[0, p]) / (1 + n_permutations)
+            result = {
+                'genre_A': genre_A,
+                'genre_B': genre_B,
+                'region': region,
+                'mean_difference': mean_A - mean_B,
+                'p_value': p_value,
+                'significant': bool(p_value < alpha),
+                'sample_size_A': stop_A - start_A,
+                'sample_size_B': stop_B - start_B,
+                'mean_A': mean_A,
+                'mean_B': mean_B,
+                'n_permutations': n_permutations
+            }
+            if shared:
+                result['p_value_adjusted'] = (1 + task_counts[1, p]) / (1 + n_permutations)
+            results.append(result)
+    return results
+
+
+def genre_permutation_test(data: pd.DataFrame,
+                           genre_A: str,
+                           genre_B: str,
+                           region: str,
+                           n_permutations: int = 10000,
+                           random_seed: Optional[int] = None,
+                           alpha: float = 0.05) -> Dict:
+    """
+    Permutation p-value for the difference of two genre means in a region.
+
+    Runs in this process; use parallel_permutation_tests for many pairs.
+
+    Args:
+        data: DataFrame with 'Genre' and 'log_sales' columns
+        genre_A: First genre name
+        genre_B: Second genre name
+        region: Region name (for identification purposes)
+        n_permutations: Number of label permutations
+        random_seed: Random seed for reproducibility
+        alpha: Significance level for the 'significant' flag
+
+    Returns:
+        Dictionary with the keys of parallel_permutation_tests (per pair mode)
+
+    Raises:
+        ValueError: If columns are missing or either genre has no data
+    """
+    return parallel_permutation_tests({region: data}, [(genre_A, genre_B)], n_permutations,
+                                      random_seed, alpha=alpha, max_workers=1)[0]
@@ -0,0 +1,326 @@
+"""
+Streaming Poisson Bootstrap for Out-of-Core Input
+
+The Poisson bootstrap replaces "draw n rows with replacement" by giving
+every row an independent Poisson(1) weight per replicate. A replicate
+mean of a group is then sum(w * x) / sum(w) over the rows of that group,
+so the only state a scan has to keep is one weighted sum and one weight
+count per (group, replicate): O(B x groups) memory, however many rows
+pass through. Rows can arrive in any chunking, e.g. from
+``pd.read_csv(chunksize=...)`` or a Parquet row-group reader.
+
+Because the state is a pair of sums, accumulators of disjoint shards
+combine by addition (``PoissonBootstrap.merge``). Shards must draw
+independent weights, i.e. use different seeds (spawn them from one
+SeedSequence).
+
+For large groups the Poisson bootstrap is equivalent to the multinomial
+one; the replicate sample size is random, and a replicate in which a
+group receives zero total weight is undefined (NaN) and is dropped when
+intervals are extracted.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, Iterable, List, Optional, Union
+
+from .confidence_intervals import is_significant
+from .resampling import iter_blocks
+
+
+# Rows per pd.read_csv chunk in stream_csv_bootstrap
+DEFAULT_CSV_CHUNKSIZE = 100_000
+
+
+class PoissonBootstrap:
+    """
+    Per-group Poisson bootstrap accumulator fed by row chunks.
+
+    Example:
+        boot = PoissonBootstrap(n_iterations=10000, random_seed=42)
+        for chunk in pd.read_csv(path, chunksize=100_000):
+            boot.update(chunk)
+        boot.interval('Action')
+    """
+
+    def __init__(self,
+                 n_iterations: int,
+                 random_seed: Optional[Union[int, np.random.SeedSequence]] = None,
+                 group_col: str = 'Genre',
+                 value_col: str = 'log_sales',
+                 memory_budget: Optional[int] = None):
+        if n_iterations <= 0:
+            raise ValueError("n_iterations must be positive")
+        self.n_iterations = n_iterations
+        self.group_col = group_col
+        self.value_col = value_col
+        self.memory_budget = memory_budget
+        self._rng = np.random.default_rng(random_seed)
+
+        self.groups: List[Hashable] = []
+        self._codes: Dict[Hashable, int] = {}
+        # Observed (unit-weight) sums and row counts, for the point estimates
+        self.totals = np.zeros(0)
+        self.sizes = np.zeros(0, dtype=np.int64)
+        # Per (group, replicate) weighted sums and total weights
+        self.sums = np.zeros((0, n_iterations))
+        self.counts = np.zeros((0, n_iterations), dtype=np.int64)
+
+    def _group_codes(self, labels: np.ndarray) -> np.ndarray:
+        """Map labels to accumulator rows, adding rows for new groups."""
+        chunk_codes, uniques = pd.factorize(labels, sort=False)
+        if (chunk_codes < 0).any():
+            # factorize codes missing labels as -1, which would index the last group
+            raise ValueError("group labels must not contain NaN")
+        for label in uniques:
+            if label not in self._codes:
+                self._codes[label] = len(self.groups)
+                self.groups.append(label)
+        n_new = len(self.groups) - len(self.totals)
+        if n_new:
+            self.totals = np.concatenate([self.totals, np.zeros(n_new)])
+            self.sizes = np.concatenate([self.sizes, np.zeros(n_new, dtype=np.int64)])
+            self.sums = np.vstack([self.sums, np.zeros((n_new, self.n_iterations))])
+            self.counts = np.vstack([self.counts,
+                                     np.zeros((n_new, self.n_iterations), dtype=np.int64)])
+        mapping = np.array([self._codes[label] for label in uniques], dtype=np.intp)
+        return mapping[chunk_codes]
+
+    def _accumulate(self, codes: np.ndarray, values: np.ndarray, weight_rows) -> None:
+        """Add rows to the state; weight_rows(start, stop) gives the weights of rows start:stop."""
+        np.add.at(self.totals, codes, values)
+        self.sizes += np.bincount(codes, minlength=len(self.sizes))
+
+        # Per row: weights, their generation temporaries and weighted values
+        for start, stop in iter_blocks(len(values), 32 * self.n_iterations, self.memory_budget):
+            weights = weight_rows(start, stop)
+            # Sort the block by group and reduce every run of one group at once
+            order = np.argsort(codes[start:stop], kind='stable')
+            block_codes = codes[start:stop][order]
+            weights = weights[order]
+            starts = np.flatnonzero(np.r_[True, block_codes[1:] != block_codes[:-1]])
+            present = block_codes[starts]
+            self.sums[present] += np.add.reduceat(weights * values[start:stop][order, None],
+                                                  starts, axis=0)
+            self.counts[present] += np.add.reduceat(weights, starts, axis=0)
+
+    def update(self, chunk: pd.DataFrame) -> 'PoissonBootstrap':
+        """
+        Add a chunk of rows.
+
+        Weights come from the accumulator's random stream in row order, so
+        results are reproducible for a given seed and chunking.
+
+        Args:
+            chunk: DataFrame with the group and value columns
+
+        Returns:
+            The accumulator itself
+
+        Raises:
+            ValueError: If a column is missing or a value or label is NaN
+        """
+        if self.group_col not in chunk.columns or self.value_col not in chunk.columns:
+            raise ValueError(
+                f"DataFrame must contain '{self.group_col}' and '{self.value_col}' columns"
+            )
+        if len(chunk) == 0:
+            return self
+        values = chunk[self.value_col].to_numpy(dtype=float)
+        if np.isnan(values).any():
+            raise ValueError("values must not contain NaN")
+
+        codes = self._group_codes(chunk[self.group_col].to_numpy())
+        # Blocks are drawn in row order, so the stream does not depend on grouping
+        self._accumulate(codes, values, lambda start, stop: self._rng.poisson(
+            1.0, size=(stop - start, self.n_iterations)))
+        return self
+
+    def merge(self, other: 'PoissonBootstrap') -> 'PoissonBootstrap':
+        """
+        Add the state of an accumulator fed with a disjoint shard.
+
+        Args:
+            other: Accumulator with the same n_iterations
+
+        Returns:
+            The accumulator itself
+
+        Raises:
+            ValueError: If the replicate counts differ
+        """
+        if other.n_iterations != self.n_iterations:
+            raise ValueError("Only accumulators with the same n_iterations can be merged")
+        codes = self._group_codes(np.asarray(other.groups, dtype=object))
+        self.totals[codes] += other.totals
+        self.sizes[codes] += other.sizes
+        self.sums[codes] += other.sums
+        self.counts[codes] += other.counts
+        return self
+
+    def _code(self, group: Hashable) -> int:
+        if group not in self._codes:
+            raise ValueError(f"No data found for genre: {group}")
+        return self._codes[group]
+
+    def mean(self, group: Hashable) -> float:
+        """Observed mean of a group."""
+        code = self._code(group)
+        return self.totals[code] / self.sizes[code]
+
+    def replicates(self, group: Hashable) -> np.ndarray:
+        """
+        Bootstrap means of a group (NaN where the group got zero weight).
+
+        Raises:
+            ValueError: If the group has not been seen
+        """
+        code = self._code(group)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.sums[code] / self.counts[code]
+
+    def difference_replicates(self, group_A: Hashable, group_B: Hashable) -> np.ndarray:
+        """Bootstrap differences mean_A - mean_B (NaN where either is undefined)."""
+        return self.replicates(group_A) - self.replicates(group_B)
+
+    def interval(self,
+                 group: Hashable,
+                 confidence_level: float = 0.95,
+                 group_B: Optional[Hashable] = None) -> Dict:
+        """
+        Percentile CI of a group mean, or of mean(group) - mean(group_B).
+
+        Args:
+            group: Group label
+            confidence_level: Confidence level (default: 0.95)
+            group_B: Optional second group for a difference
+
+        Returns:
+            Dictionary with 'ci_lower', 'ci_upper' and 'n_valid' (replicates
+            with positive weight in every involved group)
+
+        Raises:
+            ValueError: If a group is unknown or confidence_level is invalid
+        """
+        if not 0 < confidence_level < 1:
+            raise ValueError("confidence_level must be between 0 and 1")
+        replicates = (self.replicates(group) if group_B is None
+                      else self.difference_replicates(group, group_B))
+        replicates = replicates[~np.isnan(replicates)]
+        alpha = 1 - confidence_level
+        ci_lower, ci_upper = np.percentile(replicates, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+        return {'ci_lower': ci_lower, 'ci_upper': ci_upper, 'n_valid': len(replicates)}
+
+    def mean_results(self,
+                     region: str,
+                     genres: Optional[List[Hashable]] = None,
+                     confidence_level: float = 0.95) -> List[Dict]:
+        """
+        Genre mean results in the format of create_summary_table.
+
+        Args:
+            region: Region name (for identification purposes)
+            genres: Genres to report (default: all seen, in order of appearance)
+            confidence_level: Confidence level (default: 0.95)
+
+        Returns:
+            List of dictionaries with 'genre', 'region', 'mean', 'ci_lower',
+            'ci_upper' and 'sample_size'
+        """
+        results = []
+        for genre in self.groups if genres is None else genres:
+            interval = self.interval(genre, confidence_level)
+            results.append({
+                'genre': genre,
+                'region': region,
+                'mean': self.mean(genre),
+                'ci_lower': interval['ci_lower'],
+                'ci_upper': interval['ci_upper'],
+                'sample_size': int(self.sizes[self._code(genre)])
+            })
+        return results
+
+    def difference_result(self,
+                          genre_A: Hashable,
+                          genre_B: Hashable,
+                          region: str,
+                          confidence_level: float = 0.95) -> Dict:
+        """
+        Genre difference result in the format of create_summary_table.
+
+        Returns:
+            Dictionary with 'genre_A', 'genre_B', 'region', 'mean_difference',
+            'ci_lower', 'ci_upper', 'significant', 'sample_size_A',
+            'sample_size_B', 'mean_A' and 'mean_B'
+        """
+        interval = self.interval(genre_A, confidence_level, group_B=genre_B)
+        mean_A, mean_B = self.mean(genre_A), self.mean(genre_B)
+        return {
+            'genre_A': genre_A,
+            'genre_B': genre_B,
+            'region': region,
+            'mean_difference': mean_A - mean_B,
+            'ci_lower': interval['ci_lower'],
+            'ci_upper': interval['ci_upper'],
+            'significant': is_significant(interval['ci_lower'], interval['ci_upper']),
+            'sample_size_A': int(self.sizes[self._code(genre_A)]),
+            'sample_size_B': int(self.sizes[self._code(genre_B)]),
+            'mean_A': mean_A,
+            'mean_B': mean_B
+        }
+
+
+def stream_bootstrap(chunks: Iterable[pd.DataFrame],
+                     n_iterations: int = 10000,
+                     random_seed: Optional[int] = None,
+                     group_col: str = 'Genre',
+                     value_col: str = 'log_sales',
+                     genres: Optional[List[Hashable]] = None) -> PoissonBootstrap:
+    """
+    Poisson-bootstrap a stream of row chunks in one sequential pass.
+
+    Args:
+        chunks: Iterable of DataFrames (CSV chunks, Parquet row groups, ...)
+        n_iterations: Number of bootstrap replicates
+        random_seed: Random seed for reproducibility
+        group_col: Grouping column (default: 'Genre')
+        value_col: Value column (default: 'log_sales')
+        genres: Optional groups to keep; other rows are skipped
+
+    Returns:
+        The filled PoissonBootstrap accumulator
+    """
+    boot = PoissonBootstrap(n_iterations, random_seed, group_col, value_col)
+    for chunk in chunks:
+        if genres is not None:
+            chunk = chunk[chunk[group_col].isin(genres)]
+        boot.update(chunk)
+    return boot
+
+
+def stream_csv_bootstrap(filepath: str,
+                         n_iterations: int = 10000,
+                         random_seed: Optional[int] = None,
+                         group_col: str = 'Genre',
+                         value_col: str = 'log_sales',
+                         genres: Optional[List[Hashable]] = None,
+                         chunksize: int = DEFAULT_CSV_CHUNKSIZE) -> PoissonBootstrap:
+    """
+    Poisson-bootstrap a CSV file without loading it into memory.
+
+    Only the group and value columns are read, chunksize rows at a time.
+
+    Args:
+        filepath: Path to a CSV file (e.g. a cleaned_data_<region> file)
+        n_iterations: Number of bootstrap replicates
+        random_seed: Random seed for reproducibility
+        group_col: Grouping column (default: 'Genre')
+        value_col: Value column (default: 'log_sales')
+        genres: Optional groups to keep
+        chunksize: Rows per chunk
+
+    Returns:
+        The filled PoissonBootstrap accumulator
+    """
+    chunks = pd.read_csv(filepath, usecols=[group_col, value_col], chunksize=chunksize)
+    return stream_bootstrap(chunks, n_iterations, random_seed, group_col, value_col, genres)
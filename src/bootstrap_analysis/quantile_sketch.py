@@ -0,0 +1,233 @@
+"""
+Mergeable Quantile Sketch for Streaming Bootstrap Replicates
+
+With very many replicates (or many tasks), holding every replicate array
+just to read off two percentiles wastes memory. ``QuantileSketch`` is a
+compactor-based summary in the style of KLL/MRL sketches: replicate
+blocks are fed in as they are produced, each level keeps at most ``k``
+items, and an overflowing level is sorted and halved (every other item is
+promoted to the next level with twice the weight).
+
+Every compaction of a level with item weight ``w`` can shift any rank
+query by at most ``w``, so the sketch tracks a deterministic worst-case
+rank error alongside its estimates. Sketches merge by concatenating their
+levels and adding their error bounds, so workers can sketch their own
+chunks and the results combine exactly as if one sketch had seen all
+replicates in the same order.
+
+Until the first compaction the sketch is exact and its quantiles equal
+``np.percentile`` of the replicates.
+"""
+
+import numpy as np
+from typing import Dict, Iterable, List, Tuple
+
+
+# Items kept per level; larger is more accurate (rank error ~ levels * n / k)
+DEFAULT_SKETCH_SIZE = 2048
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile summary with a tracked rank error bound.
+
+    Example:
+        sketch = QuantileSketch()
+        for block in replicate_blocks:
+            sketch.update(block)
+        lower, upper = sketch.quantiles([0.025, 0.975])
+        sketch.rank_error  # worst-case error of those ranks (in replicates)
+    """
+
+    def __init__(self, k: int = DEFAULT_SKETCH_SIZE):
+        if k < 2:
+            raise ValueError("k must be at least 2")
+        self.k = k
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.compaction_error = 0
+        self._levels: List[np.ndarray] = []
+        self._offsets: List[int] = []
+
+    def _ensure_level(self, level: int) -> None:
+        while len(self._levels) <= level:
+            self._levels.append(np.empty(0))
+            self._offsets.append(0)
+
+    def _compact(self, start_level: int = 0) -> None:
+        """Halve every level above capacity, from start_level upwards."""
+        level = start_level
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self.k:
+                items = np.sort(items)
+                # Compact an even number of items; an odd leftover stays
+                n_pairs = len(items) // 2
+                kept = items[2 * n_pairs:]
+                # Alternate the offset per level so errors tend to cancel
+                offset = self._offsets[level]
+                self._offsets[level] = 1 - offset
+                promoted = items[offset:2 * n_pairs:2]
+
+                self._ensure_level(level + 1)
+                self._levels[level] = kept
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+                self.compaction_error += 2 ** level
+            level += 1
+
+    def update(self, values: np.ndarray) -> 'QuantileSketch':
+        """
+        Add a block of values.
+
+        Args:
+            values: 1D array of new replicates (NaNs are not allowed)
+
+        Returns:
+            The sketch itself
+        """
+        values = np.asarray(values, dtype=float).ravel()
+        if len(values) == 0:
+            return self
+        if np.isnan(values).any():
+            raise ValueError("values must not contain NaN")
+
+        self._ensure_level(0)
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self.n += len(values)
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        self._compact()
+        return self
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Merge another sketch into this one.
+
+        Args:
+            other: Sketch with the same k
+
+        Returns:
+            The sketch itself
+
+        Raises:
+            ValueError: If the sketches have different k
+        """
+        if other.k != self.k:
+            raise ValueError("Only sketches with the same k can be merged")
+
+        self._ensure_level(len(other._levels) - 1)
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compaction_error += other.compaction_error
+        self._compact()
+        return self
+
+    @property
+    def is_exact(self) -> bool:
+        """True while no compaction has happened (all replicates are kept)."""
+        return self.compaction_error == 0
+
+    @property
+    def rank_error(self) -> int:
+        """
+        Worst-case rank error of a returned quantile, in replicates.
+
+        Compaction error plus the weight of the heaviest item (the
+        resolution of the weighted inverse CDF).
+        """
+        if self.is_exact:
+            return 0
+        return self.compaction_error + 2 ** (len(self._levels) - 1)
+
+    @property
+    def size(self) -> int:
+        """Number of items currently stored."""
+        return sum(len(items) for items in self._levels)
+
+    def _weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self._levels) if self._levels else np.empty(0)
+        weights = np.concatenate([np.full(len(level_items), 2.0 ** level)
+                                  for level, level_items in enumerate(self._levels)]
+                                 ) if self._levels else np.empty(0)
+        order = np.argsort(items, kind='stable')
+        return items[order], weights[order]
+
+    def quantiles(self, q: Iterable[float]) -> np.ndarray:
+        """
+        Estimate quantiles.
+
+        Exact sketches interpolate like ``np.percentile``; compacted ones
+        return the weighted inverse CDF.
+
+        Args:
+            q: Quantile levels in [0, 1]
+
+        Returns:
+            Array of quantile estimates
+
+        Raises:
+            ValueError: If the sketch is empty
+        """
+        if self.n == 0:
+            raise ValueError("Cannot compute quantiles of an empty sketch")
+        q = np.asarray(list(q), dtype=float)
+
+        items, weights = self._weighted_items()
+        if self.is_exact:
+            return np.percentile(items, 100 * q)
+
+        cumulative = np.cumsum(weights)
+        positions = np.searchsorted(cumulative, q * self.n, side='left')
+        return items[np.clip(positions, 0, len(items) - 1)]
+
+    def quantile_range(self, q: float) -> Tuple[float, float]:
+        """
+        Bracket the true q-quantile using the rank error bound.
+
+        Returns:
+            (low, high) estimates at q -/+ rank_error / n
+        """
+        eps = self.rank_error / self.n
+        low, high = self.quantiles([max(0.0, q - eps), min(1.0, q + eps)])
+        return low, high
+
+    def histogram(self, n_bins: int = 50) -> Dict:
+        """
+        Compact histogram of the sketched distribution.
+
+        Args:
+            n_bins: Number of equal-width bins between min and max
+
+        Returns:
+            Dictionary with 'counts' (approximate, summing to n) and 'edges'
+        """
+        items, weights = self._weighted_items()
+        counts, edges = np.histogram(items, bins=n_bins, range=(self.min, self.max),
+                                     weights=weights)
+        return {'counts': counts, 'edges': edges}
+
+
+def merge_sketches(sketches: Iterable[QuantileSketch]) -> QuantileSketch:
+    """
+    Merge sketches in order into a new sketch.
+
+    Args:
+        sketches: Sketches with a common k (e.g. one per replicate chunk)
+
+    Returns:
+        Merged sketch
+
+    Raises:
+        ValueError: If no sketch is given or k differs
+    """
+    sketches = list(sketches)
+    if not sketches:
+        raise ValueError("At least one sketch is required")
+    merged = QuantileSketch(sketches[0].k)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
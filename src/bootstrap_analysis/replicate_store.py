@@ -0,0 +1,155 @@
+"""
+On-Disk Bootstrap Replicate Store
+
+Bootstrap replicates are deterministic given the input data, the
+statistic, the groups, the number of iterations and the seed. This module
+stores replicate arrays as ``.npy`` files named by a content hash of
+exactly those inputs, so a later run (e.g. figure generation after
+``run_bootstrap_analysis.py``) loads them memory-mapped instead of
+recomputing the bootstrap.
+
+Entries are immutable: a key never maps to different data, so there is no
+invalidation beyond deleting the store directory. Keys include
+STORE_VERSION, which is bumped whenever the resampling code changes the
+replicates that a set of parameters produces; entries of older versions
+are then simply no longer found.
+"""
+
+import hashlib
+import json
+import os
+import numpy as np
+from pathlib import Path
+from typing import Callable, Dict, Optional, Sequence, Union
+
+
+# Hashed into every key; bump when the replicates for given parameters change
+STORE_VERSION = 2
+
+def fingerprint_arrays(*arrays: np.ndarray) -> str:
+    """
+    Compute a content fingerprint of one or more arrays.
+
+    Dtype and shape are hashed along with the raw bytes, so equal-looking
+    data with a different layout gets a different fingerprint.
+
+    Args:
+        *arrays: Arrays to fingerprint
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(f"{array.dtype.str}{array.shape}".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class ReplicateStore:
+    """
+    Content-addressed store of bootstrap replicate arrays.
+
+    Example:
+        store = ReplicateStore("results/replicates")
+        replicates = store.get_or_compute(
+            {'statistic': 'mean', 'scheme': 'iid', 'data': fingerprint_arrays(values),
+             'n_iterations': 10000, 'random_seed': 42},
+            lambda: bootstrap_mean(values, 10000, 42)
+        )
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root)
+
+    @staticmethod
+    def make_key(params: Dict) -> str:
+        """
+        Hash the parameters that fully determine a replicate array.
+
+        STORE_VERSION is hashed along with them.
+
+        Args:
+            params: JSON-serializable description (data fingerprint,
+                    statistic, scheme, groups, region, n_iterations, seed, ...)
+
+        Returns:
+            Hex digest used as the file name
+        """
+        payload = json.dumps(dict(params, store_version=STORE_VERSION), sort_keys=True,
+                             default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        """Return the file path of a key."""
+        return self.root / f"{key}.npy"
+
+    def load(self, key: str) -> Optional[np.ndarray]:
+        """
+        Load a stored replicate array memory-mapped (read-only).
+
+        Returns:
+            The array, or None if the key is not stored
+        """
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        return np.load(path, mmap_mode='r')
+
+    def save(self, key: str, replicates: np.ndarray) -> None:
+        """
+        Store a replicate array.
+
+        The file is written under a temporary name and renamed into place,
+        so concurrent readers never see a partial file.
+        """
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.path_for(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.asarray(replicates))
+        os.replace(tmp_path, path)
+
+    def get_or_compute(self, params: Dict,
+                       compute: Callable[[], np.ndarray]) -> np.ndarray:
+        """
+        Return stored replicates for params, computing and storing on a miss.
+
+        Args:
+            params: Description of the computation (see make_key)
+            compute: Zero-argument function producing the replicates
+
+        Returns:
+            Replicate array (memory-mapped on a hit)
+        """
+        key = self.make_key(params)
+        replicates = self.load(key)
+        if replicates is None:
+            replicates = compute()
+            self.save(key, replicates)
+        return replicates
+
+
+def cached_replicates(store: Optional[ReplicateStore],
+                      params: Dict,
+                      data: Sequence[np.ndarray],
+                      compute: Callable[[], np.ndarray]) -> np.ndarray:
+    """
+    Route a replicate computation through a store when one is given.
+
+    The input arrays are only fingerprinted when a store is used, and
+    unseeded runs are not reproducible and are never cached.
+
+    Args:
+        store: ReplicateStore, or None to always compute
+        params: Description of the computation, including 'random_seed'
+        data: Input arrays the replicates are computed from
+        compute: Zero-argument function producing the replicates
+
+    Returns:
+        Replicate array
+    """
+    if store is None or params.get('random_seed') is None:
+        return compute()
+    return store.get_or_compute(dict(params, data=fingerprint_arrays(*data)), compute)
@@ -0,0 +1,469 @@
+"""
+Vectorized Resampling Engine
+
+This module provides the shared machinery behind the bootstrap functions.
+Instead of drawing one resample per Python loop iteration, replicates are
+generated in blocks: one NumPy call draws the resample indices for a whole
+block and one reduction turns the block into replicate statistics.
+
+The block size adapts to a memory budget so that large samples or very
+large replicate counts never materialize more than a bounded amount of
+temporary data at once.
+
+Available resampling schemes:
+- 'iid': ordinary bootstrap, n index draws per replicate
+- 'multinomial': ordinary bootstrap on tie-compressed data; the sample is
+  collapsed to (unique value, count) pairs once and each replicate is one
+  multinomial draw over the distinct values. Statistically equivalent to
+  'iid', with per-replicate cost proportional to the number of distinct
+  values instead of the sample size.
+- 'balanced': balanced bootstrap; across the replicates of one call every
+  observation is used exactly n_iterations times. Conceptually the indices
+  0..n-1 are repeated n_iterations times, shuffled and cut into rows of n.
+  The shuffle is generated block by block (see ``_balanced_index_blocks``),
+  so memory stays within the budget. Balancing removes the first-order
+  simulation error: the mean of the replicate means equals the sample mean.
+- 'bayesian': Bayesian bootstrap; instead of integer resample counts each
+  replicate weights the observations with Dirichlet(1, ..., 1) weights
+  (normalized standard exponentials), so a block of replicate means is one
+  BLAS matrix-vector product of the (block_size x n) weight matrix with
+  the data. The replicates are draws from the posterior of the mean under
+  a non-informative Dirichlet prior and vary smoothly, which helps small
+  groups whose ordinary bootstrap distribution is lumpy.
+
+``resample_moments`` runs the same schemes but also keeps each
+replicate's sum of squares, which gives every replicate its own analytic
+standard error (used by the studentized bootstrap-t intervals).
+``resample_antithetic_means`` draws negatively correlated replicate pairs
+for the variance reduction estimators.
+"""
+
+import numpy as np
+from typing import Iterator, Optional, Tuple
+
+
+# Upper bound (in bytes) on the temporary arrays held by one replicate block.
+# Change this module attribute to trade memory for fewer NumPy calls.
+MEMORY_BUDGET_BYTES = 64 * 1024 ** 2
+
+# Cap on the block temporaries of resample_group_means: blocks below glibc's
+# largest mmap threshold (32 MiB) are reused from the heap instead of being
+# page-faulted in again for every block, which is ~25% faster at genre scale
+GROUP_BLOCK_BYTES = 16 * 1024 ** 2
+
+SCHEMES = ('iid', 'multinomial', 'balanced', 'bayesian')
+
+
+def iter_blocks(n_iterations: int,
+                bytes_per_replicate: int,
+                memory_budget: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """
+    Split a replicate range into blocks that fit the memory budget.
+
+    Args:
+        n_iterations: Total number of replicates
+        bytes_per_replicate: Temporary memory needed by one replicate
+        memory_budget: Budget in bytes (default: MEMORY_BUDGET_BYTES)
+
+    Yields:
+        (start, stop) replicate ranges; every block holds at least one replicate
+    """
+    budget = MEMORY_BUDGET_BYTES if memory_budget is None else memory_budget
+    block_size = max(1, int(budget // max(1, bytes_per_replicate)))
+
+    for start in range(0, n_iterations, block_size):
+        yield start, min(start + block_size, n_iterations)
+
+
+def validate_scheme(scheme: str) -> None:
+    """
+    Check that a resampling scheme name is supported.
+
+    Raises:
+        ValueError: If scheme is not one of SCHEMES
+    """
+    if scheme not in SCHEMES:
+        raise ValueError(f"scheme must be one of {list(SCHEMES)}, got '{scheme}'")
+
+
+def compress_ties(data: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Collapse a sample to its distinct values and their multiplicities.
+
+    Args:
+        data: 1D array of observations
+
+    Returns:
+        Tuple of (unique_values, counts)
+    """
+    return np.unique(np.asarray(data, dtype=float), return_counts=True)
+
+
+def resample_means(data: np.ndarray,
+                   n_iterations: int,
+                   rng: np.random.Generator,
+                   scheme: str = 'iid',
+                   memory_budget: Optional[int] = None) -> np.ndarray:
+    """
+    Compute bootstrap means with the requested resampling scheme.
+
+    Args:
+        data: 1D array of observations
+        n_iterations: Number of bootstrap replicates
+        rng: NumPy random generator
+        scheme: Resampling scheme, one of SCHEMES (default: 'iid')
+        memory_budget: Budget in bytes for one block (default: MEMORY_BUDGET_BYTES)
+
+    Returns:
+        Array of bootstrap means (length n_iterations)
+    """
+    bootstrap_means = np.empty(n_iterations)
+    for start, stop, block in iter_mean_blocks(data, n_iterations, rng, scheme, memory_budget):
+        bootstrap_means[start:stop] = block
+    return bootstrap_means
+
+
+def iter_mean_blocks(data: np.ndarray,
+                     n_iterations: int,
+                     rng: np.random.Generator,
+                     scheme: str = 'iid',
+                     memory_budget: Optional[int] = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Generate bootstrap means block by block without keeping earlier blocks.
+
+    This is the streaming form of ``resample_means`` (same random stream):
+    consumers such as a quantile sketch can fold each block in and drop it,
+    so memory stays bounded by one block regardless of n_iterations.
+
+    Args:
+        data: 1D array of observations
+        n_iterations: Number of bootstrap replicates
+        rng: NumPy random generator
+        scheme: Resampling scheme, one of SCHEMES (default: 'iid')
+        memory_budget: Budget in bytes for one block (default: MEMORY_BUDGET_BYTES)
+
+    Yields:
+        (start, stop, block_means) for consecutive replicate ranges
+    """
+    validate_scheme(scheme)
+
+    if scheme == 'multinomial':
+        return _multinomial_mean_blocks(data, n_iterations, rng, memory_budget)
+    if scheme == 'bayesian':
+        return _bayesian_mean_blocks(data, n_iterations, rng, memory_budget)
+    return _indexed_mean_blocks(data, n_iterations, rng, scheme, memory_budget)
+
+
+def _index_blocks(n: int,
+                  n_iterations: int,
+                  rng: np.random.Generator,
+                  scheme: str,
+                  bytes_per_replicate: int,
+                  memory_budget: Optional[int] = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Draw (block_size x n) resample index matrices for 'iid' or 'balanced'.
+
+    Args:
+        n: Sample size
+        n_iterations: Number of bootstrap replicates
+        rng: NumPy random generator
+        scheme: 'iid' or 'balanced'
+        bytes_per_replicate: Temporary memory needed by one replicate
+        memory_budget: Budget in bytes for one block (default: MEMORY_BUDGET_BYTES)
+
+    Yields:
+        (start, stop, indices) for consecutive replicate ranges
+    """
+    if scheme == 'balanced':
+        yield from _balanced_index_blocks(n, n_iterations, rng, bytes_per_replicate,
+                                          memory_budget)
+        return
+    for start, stop in iter_blocks(n_iterations, bytes_per_replicate, memory_budget):
+        yield start, stop, rng.integers(0, n, size=(stop - start, n))
+
+
+def _balanced_index_blocks(n: int,
+                           n_iterations: int,
+                           rng: np.random.Generator,
+                           bytes_per_replicate: int,
+                           memory_budget: Optional[int] = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Generate the balanced bootstrap's shuffled index sequence block by block.
+
+    A block of k replicates is the next k * n entries of a uniform shuffle
+    of n_iterations copies of every index. Which indices land in the block
+    is a multivariate hypergeometric draw from the copies still left, and
+    their order within the block is a permutation of that multiset, so the
+    full (n_iterations x n) shuffle is never materialized.
+
+    Yields:
+        (start, stop, indices) for consecutive replicate ranges
+    """
+    remaining = np.full(n, n_iterations, dtype=np.int64)
+    for start, stop in iter_blocks(n_iterations, bytes_per_replicate, memory_budget):
+        if stop == n_iterations:
+            # The last block takes every remaining copy
+            taken = remaining
+        else:
+            taken = rng.multivariate_hypergeometric(remaining, (stop - start) * n)
+            remaining = remaining - taken
+        indices = rng.permutation(np.repeat(np.arange(n), taken))
+        yield start, stop, indices.reshape(stop - start, n)
+
+
+def _indexed_mean_blocks(data: np.ndarray,
+                         n_iterations: int,
+                         rng: np.random.Generator,
+                         scheme: str = 'iid',
+                         memory_budget: Optional[int] = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Compute bootstrap means block by block from resample index matrices.
+
+    Each block draws a (block_size x n) matrix of resample indices and
+    reduces it with a single row-wise mean. For 'iid' the index stream is
+    the same one that repeated ``rng.choice(data, n)`` calls would consume,
+    so results do not depend on the block size.
+
+    Args:
+        data: 1D array of observations
+        n_iterations: Number of bootstrap replicates
+        rng: NumPy random generator
+        scheme: 'iid' or 'balanced'
+        memory_budget: Budget in bytes for one block (default: MEMORY_BUDGET_BYTES)
+
+    Yields:
+        (start, stop, block_means) for consecutive replicate ranges
+    """
+    data = np.asarray(data, dtype=float)
+    n = len(data)
+
+    # One int64 index plus one gathered float64 value per observation
+    for start, stop, indices in _index_blocks(n, n_iterations, rng, scheme, 16 * n,
+                                              memory_budget):
+        yield start, stop, data[indices].mean(axis=1)
+
+
+def _multinomial_mean_blocks(data: np.ndarray,
+                             n_iterations: int,
+                             rng: np.random.Generator,
+                             memory_budget: Optional[int] = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Compute bootstrap means from multinomial counts over distinct values.
+
+    Resampling n observations with replacement is the same as drawing how
+    many times each distinct value is picked from Multinomial(n, counts / n).
+    The mean of a replicate is then a dot product with the distinct values.
+
+    Args:
+        data: 1D array of observations
+        n_iterations: Number of bootstrap replicates
+        rng: NumPy random generator
+        memory_budget: Budget in bytes for one block (default: MEMORY_BUDGET_BYTES)
+
+    Yields:
+        (start, stop, block_means) for consecutive replicate ranges
+    """
+    values, counts = compress_ties(data)
+    n = counts.sum()
+    probabilities = counts / n
+
+    # One int64 count per distinct value
+    for start, stop in iter_blocks(n_iterations, 8 * len(values), memory_budget):
+        draws = rng.multinomial(n, probabilities, size=stop - start)
+        yield start, stop, draws @ values / n
+
+
+def _dirichlet_weight_blocks(n: int,
+                             n_iterations: int,
+                             rng: np.random.Generator,
+                             memory_budget: Optional[int] = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Draw (block_size x n) Dirichlet(1, ..., 1) weight matrices.
+
+    Each row is a vector of standard exponentials divided by its sum,
+    normalized in place.
+
+    Yields:
+        (start, stop, weights) for consecutive replicate ranges
+    """
+    # One float64 weight per observation
+    for start, stop in iter_blocks(n_iterations, 8 * n, memory_budget):
+        weights = rng.standard_exponential(size=(stop - start, n))
+        weights /= weights.sum(axis=1, keepdims=True)
+        yield start, stop, weights
+
+
+def _bayesian_mean_blocks(data: np.ndarray,
+                          n_iterations: int,
+                          rng: np.random.Generator,
+                          memory_budget: Optional[int] = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+    """
+    Compute Bayesian bootstrap means block by block.
+
+    The weighted means of a whole block are one matrix-vector product,
+    which NumPy hands to the (multithreaded) BLAS library.
+
+    Yields:
+        (start, stop, block_means) for consecutive replicate ranges
+    """
+    data = np.asarray(data, dtype=float)
+    for start, stop, weights in _dirichlet_weight_blocks(len(data), n_iterations, rng,
+                                                         memory_budget):
+        yield start, stop, weights @ data
+
+
+def resample_antithetic_means(data: np.ndarray,
+                              n_pairs: int,
+                              rng: np.random.Generator,
+                              memory_budget: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute pairs of antithetic bootstrap means.
+
+    The sample is sorted once; each pair draws one iid index matrix and
+    gathers both ``sorted[i]`` and the reflected ``sorted[n - 1 - i]``.
+    Each half is an ordinary bootstrap sample of means, and the halves are
+    negatively correlated.
+
+    Args:
+        data: 1D array of observations
+        n_pairs: Number of replicate pairs
+        rng: NumPy random generator
+        memory_budget: Budget in bytes for one block (default: MEMORY_BUDGET_BYTES)
+
+    Returns:
+        Tuple of (means, antithetic_means), each of length n_pairs
+    """
+    ordered = np.sort(np.asarray(data, dtype=float))
+    n = len(ordered)
+    means = np.empty(n_pairs)
+    antithetic_means = np.empty(n_pairs)
+
+    # One index plus two gathered values per observation
+    for start, stop, indices in _index_blocks(n, n_pairs, rng, 'iid', 24 * n, memory_budget):
+        means[start:stop] = ordered[indices].mean(axis=1)
+        antithetic_means[start:stop] = ordered[n - 1 - indices].mean(axis=1)
+    return means, antithetic_means
+
+
+def resample_moments(data: np.ndarray,
+                     n_iterations: int,
+                     rng: np.random.Generator,
+                     scheme: str = 'iid',
+                     memory_budget: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute bootstrap means and variances in a single resampling pass.
+
+    Each replicate's sum and sum of squares are reduced from the same
+    resample, so the replicate variance costs one extra dot product instead
+    of an inner bootstrap. Squares are taken about the sample mean to avoid
+    cancellation. The random stream is the one ``resample_means`` consumes,
+    so the means are identical to it for the same generator state.
+
+    Args:
+        data: 1D array of at least two observations
+        n_iterations: Number of bootstrap replicates
+        rng: NumPy random generator
+        scheme: Resampling scheme, one of SCHEMES (default: 'iid')
+        memory_budget: Budget in bytes for one block (default: MEMORY_BUDGET_BYTES)
+
+    Returns:
+        Tuple of (bootstrap_means, bootstrap_variances); variances use ddof=1
+
+    Raises:
+        ValueError: If data has fewer than two observations
+    """
+    validate_scheme(scheme)
+    data = np.asarray(data, dtype=float)
+    n = len(data)
+    if n < 2:
+        raise ValueError("data must contain at least two observations")
+
+    shift = data.mean()
+    sums = np.empty(n_iterations)
+    squares = np.empty(n_iterations)
+
+    if scheme == 'bayesian':
+        # n * weights plays the role of the resample counts
+        centered_squares = (data - shift) ** 2
+        for start, stop, weights in _dirichlet_weight_blocks(n, n_iterations, rng,
+                                                             memory_budget):
+            sums[start:stop] = n * (weights @ data)
+            squares[start:stop] = n * (weights @ centered_squares)
+    elif scheme == 'multinomial':
+        values, counts = compress_ties(data)
+        probabilities = counts / n
+        centered_squares = (values - shift) ** 2
+        # One int64 count per distinct value
+        for start, stop in iter_blocks(n_iterations, 8 * len(values), memory_budget):
+            draws = rng.multinomial(n, probabilities, size=stop - start)
+            sums[start:stop] = draws @ values
+            squares[start:stop] = draws @ centered_squares
+    else:
+        # Same footprint (and so the same blocks) as resample_means: the
+        # gathered values are centered in place
+        for start, stop, indices in _index_blocks(n, n_iterations, rng, scheme, 16 * n,
+                                                  memory_budget):
+            gathered = data[indices]
+            sums[start:stop] = gathered.sum(axis=1)
+            gathered -= shift
+            squares[start:stop] = np.einsum('ij,ij->i', gathered, gathered)
+
+    means = sums / n
+    # Sum of squares about the replicate mean, from the one about the sample mean
+    variances = (squares - n * (means - shift) ** 2) / (n - 1)
+    return means, np.maximum(variances, 0.0)
+
+
+def resample_group_means(sorted_values: np.ndarray,
+                         offsets: np.ndarray,
+                         n_iterations: int,
+                         rng: np.random.Generator,
+                         memory_budget: Optional[int] = None) -> np.ndarray:
+    """
+    Compute bootstrap means for every group of a grouped sample at once.
+
+    Observations must be sorted so that each group occupies a contiguous
+    slice ``sorted_values[offsets[g]:offsets[g + 1]]``. Every replicate
+    resamples each group independently within its own slice. Groups are
+    resampled one after another, each in blocks sized for that group, with
+    a scalar upper bound and gathers from its own slice only: a single draw
+    with a per-observation bound is several times slower, and gathers across
+    the whole sample are less cache friendly, which made the grouped path
+    slower than looping over the genres. It is now faster than that loop
+    (10,000 replicates; NA, 3 genres: 0.30 s vs 0.41 s; vgsales, 12 genres:
+    0.94 s vs 1.33 s).
+
+    ``sorted_values`` may also be a 2D (observations x columns) matrix, e.g.
+    one log-sales column per region. Resample indices are then drawn once
+    per replicate and shared by all columns, so the column replicates are
+    jointly (pairwise) consistent.
+
+    Args:
+        sorted_values: 1D array or 2D matrix of observations sorted by group
+        offsets: Group boundaries (length n_groups + 1, starting at 0)
+        n_iterations: Number of bootstrap replicates
+        rng: NumPy random generator
+        memory_budget: Budget in bytes for one block (default:
+                       MEMORY_BUDGET_BYTES; capped at GROUP_BLOCK_BYTES)
+
+    Returns:
+        Array of bootstrap means with shape (n_iterations, n_groups), or
+        (n_iterations, n_groups, n_columns) for 2D input
+    """
+    sorted_values = np.asarray(sorted_values, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    sizes = np.diff(offsets)
+    n_columns = 1 if sorted_values.ndim == 1 else sorted_values.shape[1]
+    bootstrap_means = np.empty((n_iterations, len(sizes)) + sorted_values.shape[1:])
+
+    budget = min(MEMORY_BUDGET_BYTES if memory_budget is None else memory_budget,
+                 GROUP_BLOCK_BYTES)
+    for g, (offset, size) in enumerate(zip(offsets[:-1], sizes)):
+        group_values = sorted_values[offset:offset + size]
+        # One int64 index plus one gathered float64 value per observation and
+        # column, so small groups get correspondingly larger blocks
+        for start, stop in iter_blocks(n_iterations, 8 * int(size) * (1 + n_columns), budget):
+            indices = rng.integers(0, size, size=(stop - start, size))
+            bootstrap_means[start:stop, g] = group_values[indices].mean(axis=1)
+
+    return bootstrap_means
@@ -0,0 +1,135 @@
+"""
+Shared-Memory Data Plane for Bootstrap Workers
+
+Pickling a region DataFrame (or even its value arrays) into every task
+makes per-task transfer cost grow with the data. This module publishes
+the encoded log_sales values once in a ``multiprocessing.shared_memory``
+block; tasks only carry a small handle plus the (start, stop) slice of
+their group, and workers attach to the block zero-copy.
+
+Each worker process attaches to a given block once and reuses the
+attachment for all later tasks, so worker startup and per-task transfer
+cost stay flat as the data grows.
+"""
+
+import numpy as np
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple
+
+from .bootstrap_differences import bootstrap_difference
+from .bootstrap_means import bootstrap_mean
+
+
+# Picklable reference to a published array: (block name, shape, dtype string)
+SharedHandle = Tuple[str, Tuple[int, ...], str]
+
+# Attachments held by the current process, keyed by block name
+_ATTACHED: Dict[str, Tuple[shared_memory.SharedMemory, np.ndarray]] = {}
+
+
+class SharedArray:
+    """
+    Context manager that publishes a NumPy array in shared memory.
+
+    The block is created and filled on entry and unlinked on exit, so it
+    must outlive every task that uses its handle.
+
+    Example:
+        with SharedArray(values) as handle:
+            run_bootstrap_tasks(shared_mean_kernel, [(handle, 0, 10)], 1000)
+    """
+
+    def __init__(self, array: np.ndarray):
+        self.array = np.ascontiguousarray(array)
+        self.shm: Optional[shared_memory.SharedMemory] = None
+
+    def __enter__(self) -> SharedHandle:
+        # Zero-size blocks are not allowed; a one-byte block backs empty arrays
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, self.array.nbytes))
+        view = np.ndarray(self.array.shape, dtype=self.array.dtype, buffer=self.shm.buf)
+        view[...] = self.array
+        return (self.shm.name, self.array.shape, self.array.dtype.str)
+
+    def __exit__(self, *exc_info) -> None:
+        detach_array(self.shm.name)
+        self.shm.close()
+        self.shm.unlink()
+        self.shm = None
+
+
+def attach_array(handle: SharedHandle) -> np.ndarray:
+    """
+    Return a read-only, zero-copy view of a published array.
+
+    The attachment is cached per process, so repeated tasks on the same
+    block do not reopen it.
+
+    Args:
+        handle: Handle returned by SharedArray
+
+    Returns:
+        NumPy view backed by the shared memory block
+    """
+    name, shape, dtype = handle
+    if name not in _ATTACHED:
+        shm = shared_memory.SharedMemory(name=name)
+        view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        view.flags.writeable = False
+        _ATTACHED[name] = (shm, view)
+    return _ATTACHED[name][1]
+
+
+def detach_array(name: str) -> None:
+    """Drop this process's cached attachment to a block, if any."""
+    entry = _ATTACHED.pop(name, None)
+    if entry is not None:
+        shm, view = entry
+        del view
+        shm.close()
+
+
+def shared_mean_kernel(handle: SharedHandle,
+                       start: int,
+                       stop: int,
+                       n_iterations: int,
+                       random_seed=None) -> np.ndarray:
+    """
+    Run bootstrap_mean on the slice [start, stop) of a published array.
+
+    Args:
+        handle: Handle of the published values
+        start: First index of the group slice
+        stop: End index (exclusive) of the group slice
+        n_iterations: Number of bootstrap iterations
+        random_seed: Seed or SeedSequence for this unit of work
+
+    Returns:
+        Array of bootstrap means
+    """
+    values = attach_array(handle)
+    return bootstrap_mean(values[start:stop], n_iterations, random_seed)
+
+
+def shared_difference_kernel(handle: SharedHandle,
+                             start_A: int,
+                             stop_A: int,
+                             start_B: int,
+                             stop_B: int,
+                             n_iterations: int,
+                             random_seed=None) -> np.ndarray:
+    """
+    Run bootstrap_difference on two slices of a published array.
+
+    Args:
+        handle: Handle of the published values
+        start_A, stop_A: Slice of group A
+        start_B, stop_B: Slice of group B
+        n_iterations: Number of bootstrap iterations
+        random_seed: Seed or SeedSequence for this unit of work
+
+    Returns:
+        Array of bootstrap differences (mean_A - mean_B)
+    """
+    values = attach_array(handle)
+    return bootstrap_difference(values[start_A:stop_A], values[start_B:stop_B],
+                                n_iterations, random_seed)
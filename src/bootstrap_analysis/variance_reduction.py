@@ -0,0 +1,232 @@
+"""
+Variance Reduction for Bootstrap Replicate Distributions
+
+Two opt-in estimators that extract more precision from a fixed number of
+replicates. Both return the bootstrap bias, variance and percentile CI
+together with the variance reduction factor achieved for each of them:
+the Monte Carlo variance of the plain estimator divided by that of the
+reduced one (estimated from the same replicates; > 1 is a gain).
+
+- 'control': control variates from the linear (first-order)
+  approximation of the statistic. Its bootstrap mean and variance are
+  known in closed form, so the replicate distribution is reweighted by the
+  regression estimator until the weighted replicates reproduce them
+  exactly. Bias and variance then carry no Monte Carlo error for linear
+  statistics (means and differences of means are their own linear
+  approximation), and the weighted quantiles of the CI borrow strength
+  from the controls.
+- 'antithetic': replicates come in pairs, the second using the reflected
+  ranks of the first (observation of rank j becomes rank n + 1 - j). The
+  pair members are strongly negatively correlated, which mostly helps the
+  bias and variance estimates.
+"""
+
+import numpy as np
+from typing import Dict, Iterable
+
+from .confidence_intervals import batch_percentile_ci
+
+
+VARIANCE_REDUCTION_METHODS = ('control', 'antithetic')
+
+
+def validate_variance_reduction(method: str) -> None:
+    """
+    Check that a variance reduction method name is supported.
+
+    Raises:
+        ValueError: If method is not one of VARIANCE_REDUCTION_METHODS
+    """
+    if method not in VARIANCE_REDUCTION_METHODS:
+        raise ValueError(
+            f"method must be one of {list(VARIANCE_REDUCTION_METHODS)}, got '{method}'"
+        )
+
+
+def linear_variance(data: np.ndarray) -> float:
+    """
+    Exact bootstrap variance of the sample mean, sum((x - mean)^2) / n^2.
+
+    Args:
+        data: 1D array of observations
+
+    Returns:
+        Variance of the linear approximation (the mean itself)
+    """
+    data = np.asarray(data, dtype=float)
+    return float(np.mean((data - data.mean()) ** 2) / len(data))
+
+
+def control_variate_weights(controls: np.ndarray, control_means: np.ndarray) -> np.ndarray:
+    """
+    Regression-estimator weights for replicates with known control means.
+
+    The weights sum to one and reproduce the known means exactly:
+    weights @ controls == control_means. Individual weights can be
+    negative.
+
+    Args:
+        controls: (n_replicates x n_controls) control values
+        control_means: Known expectations of the controls
+
+    Returns:
+        Array of weights (length n_replicates)
+    """
+    controls = np.asarray(controls, dtype=float)
+    if controls.ndim == 1:
+        controls = controls[:, None]
+    n = len(controls)
+    centered = controls - controls.mean(axis=0)
+    covariance = centered.T @ centered / n
+    shift = np.linalg.lstsq(covariance, controls.mean(axis=0) - control_means, rcond=None)[0]
+    return (1 - centered @ shift) / n
+
+
+def weighted_quantiles(values: np.ndarray,
+                       weights: np.ndarray,
+                       q: Iterable[float]) -> np.ndarray:
+    """
+    Quantiles of a weighted empirical distribution.
+
+    The cumulative weights are made non-decreasing (running maximum) so
+    that negative control-variate weights still give a valid inverse CDF.
+
+    Args:
+        values: 1D array of values
+        weights: Weights summing to one
+        q: Quantile levels in [0, 1]
+
+    Returns:
+        Array of quantile estimates
+    """
+    order = np.argsort(values, kind='stable')
+    cumulative = np.maximum.accumulate(np.cumsum(weights[order]))
+    positions = np.searchsorted(cumulative, np.asarray(list(q), dtype=float), side='left')
+    return values[order][np.clip(positions, 0, len(values) - 1)]
+
+
+def _regression_factor(quantity: np.ndarray, controls: np.ndarray) -> float:
+    """Variance of quantity over that of its residual after regressing on controls."""
+    quantity = quantity - quantity.mean()
+    centered = controls - controls.mean(axis=0)
+    residual = quantity - centered @ np.linalg.lstsq(centered, quantity, rcond=None)[0]
+    total = quantity.var()
+    # Quantities that are (numerically) linear in the controls are exact
+    if residual.var() <= 1e-12 * total:
+        return np.inf
+    return float(total / residual.var())
+
+
+def _antithetic_factor(quantity: np.ndarray, antithetic: np.ndarray) -> float:
+    """Variance of one replicate's quantity over twice that of the pair average."""
+    paired = (quantity + antithetic) / 2
+    if paired.var() == 0:
+        return np.inf
+    return float(quantity.var() / (2 * paired.var()))
+
+
+def control_variate_summary(replicates: np.ndarray,
+                            estimate: float,
+                            variance: float,
+                            confidence_level: float = 0.95) -> Dict:
+    """
+    Bias, variance and percentile CI with linear-approximation control variates.
+
+    The controls are the linear approximation L* and (L* - estimate)^2,
+    whose bootstrap means are estimate and variance. For means and
+    differences of means L* is the replicate itself.
+
+    Args:
+        replicates: Bootstrap replicates of a (linear) statistic
+        estimate: Observed statistic (bootstrap mean of L*)
+        variance: Bootstrap variance of L* (e.g. from linear_variance)
+        confidence_level: Confidence level of the interval
+
+    Returns:
+        Dictionary with 'bias', 'variance', 'ci_lower', 'ci_upper' and
+        'reduction_factor' (dict with the same four keys)
+
+    Raises:
+        ValueError: If confidence_level is not in (0, 1) or there are
+                    fewer than two replicates
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+    replicates = np.asarray(replicates, dtype=float)
+    if len(replicates) < 2:
+        raise ValueError("At least two replicates are required")
+
+    controls = np.column_stack([replicates, (replicates - estimate) ** 2])
+    weights = control_variate_weights(controls, np.array([estimate, variance]))
+    mean = weights @ replicates
+    alpha = 1 - confidence_level
+    ci_lower, ci_upper = weighted_quantiles(replicates, weights, [alpha / 2, 1 - alpha / 2])
+
+    # Plain estimators for the factors: replicate mean, squared deviation
+    # and the CDF indicators at the plain percentile endpoints
+    plain_lower, plain_upper = batch_percentile_ci(replicates, confidence_level)
+    return {
+        'bias': float(mean - estimate),
+        'variance': float(weights @ (replicates - mean) ** 2),
+        'ci_lower': ci_lower,
+        'ci_upper': ci_upper,
+        'reduction_factor': {
+            'bias': _regression_factor(replicates, controls),
+            'variance': _regression_factor((replicates - estimate) ** 2, controls),
+            'ci_lower': _regression_factor((replicates <= plain_lower).astype(float), controls),
+            'ci_upper': _regression_factor((replicates <= plain_upper).astype(float), controls)
+        }
+    }
+
+
+def antithetic_summary(replicates: np.ndarray,
+                       antithetic_replicates: np.ndarray,
+                       estimate: float,
+                       confidence_level: float = 0.95) -> Dict:
+    """
+    Bias, variance and percentile CI from antithetic replicate pairs.
+
+    Both halves follow the bootstrap distribution, so the estimates pool
+    all replicates; the pairing only changes their Monte Carlo error.
+
+    Args:
+        replicates: First replicate of every pair
+        antithetic_replicates: Antithetic partner of every pair
+        estimate: Observed statistic
+        confidence_level: Confidence level of the interval
+
+    Returns:
+        Dictionary with 'bias', 'variance', 'ci_lower', 'ci_upper' and
+        'reduction_factor' (dict with the same four keys)
+
+    Raises:
+        ValueError: If the halves differ in length, there are fewer than
+                    two pairs or confidence_level is not in (0, 1)
+    """
+    if not 0 < confidence_level < 1:
+        raise ValueError("confidence_level must be between 0 and 1")
+    replicates = np.asarray(replicates, dtype=float)
+    antithetic_replicates = np.asarray(antithetic_replicates, dtype=float)
+    if replicates.shape != antithetic_replicates.shape:
+        raise ValueError("replicates and antithetic_replicates must have the same length")
+    if len(replicates) < 2:
+        raise ValueError("At least two replicate pairs are required")
+
+    pooled = np.concatenate([replicates, antithetic_replicates])
+    ci_lower, ci_upper = batch_percentile_ci(pooled, confidence_level)
+    mean = pooled.mean()
+    return {
+        'bias': float(mean - estimate),
+        'variance': float(pooled.var()),
+        'ci_lower': ci_lower[()],
+        'ci_upper': ci_upper[()],
+        'reduction_factor': {
+            'bias': _antithetic_factor(replicates, antithetic_replicates),
+            'variance': _antithetic_factor((replicates - mean) ** 2,
+                                           (antithetic_replicates - mean) ** 2),
+            'ci_lower': _antithetic_factor((replicates <= ci_lower).astype(float),
+                                           (antithetic_replicates <= ci_lower).astype(float)),
+            'ci_upper': _antithetic_factor((replicates <= ci_upper).astype(float),
+                                           (antithetic_replicates <= ci_upper).astype(float))
+        }
+    }
@@ -10,9 +10,11 @@ from .clean_data import (
     filter_time_window,
     select_genres
 )
+from .group_index import GroupIndex
 from .transform_data import (
     apply_log_transform,
     reshape_for_analysis,
+    combine_region_data,
     save_cleaned_data
 )
 
@@ -22,8 +24,10 @@ __all__ = [
     'remove_invalid_entries',
     'filter_time_window',
     'select_genres',
+    'GroupIndex',
     'apply_log_transform',
     'reshape_for_analysis',
+    'combine_region_data',
     'save_cleaned_data'
 ]
 
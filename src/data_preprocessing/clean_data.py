@@ -8,6 +8,8 @@ import pandas as pd
 import numpy as np
 from typing import List, Optional
 
+from .group_index import GroupIndex
+
 
 def remove_invalid_entries(df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -75,21 +77,29 @@ def filter_time_window(df: pd.DataFrame,
     return df_filtered
 
 
-def select_genres(df: pd.DataFrame, genres: List[str]) -> pd.DataFrame:
+def select_genres(df: pd.DataFrame, genres: List[str],
+                  index: Optional[GroupIndex] = None) -> pd.DataFrame:
     """
     Filter data to include only specified genres.
     
     Args:
         df: Input DataFrame
         genres: List of genre names to include (case-sensitive)
+        index: Optional GroupIndex of df by 'Genre'; rows are then taken
+               from the precomputed genre slices instead of a full scan
         
     Returns:
         Filtered DataFrame containing only specified genres
     """
     if 'Genre' not in df.columns:
         raise ValueError("Genre column not found in DataFrame")
+    if index is not None and (index.data is not df or index.group_col != 'Genre'):
+        raise ValueError("index must be a Genre GroupIndex of this DataFrame")
     
-    available_genres = df['Genre'].unique().tolist()
+    if index is not None:
+        available_genres = index.labels_by_appearance()
+    else:
+        available_genres = df['Genre'].unique().tolist()
     invalid_genres = set(genres) - set(available_genres)
     
     if invalid_genres:
@@ -97,7 +107,10 @@ def select_genres(df: pd.DataFrame, genres: List[str]) -> pd.DataFrame:
         print(f"Available genres: {available_genres}")
     
     valid_genres = [g for g in genres if g in available_genres]
-    df_filtered = df[df['Genre'].isin(valid_genres)].copy()
+    if index is not None:
+        df_filtered = df.iloc[index.rows(valid_genres)].copy()
+    else:
+        df_filtered = df[df['Genre'].isin(valid_genres)].copy()
     
     return df_filtered
 
@@ -0,0 +1,180 @@
+"""
+Group Index
+
+Filtering a frame with ``df[df['Genre'] == genre]`` scans every row and
+copies the matching values on each lookup. ``GroupIndex`` encodes the
+group column once (categorical codes plus a stable sort of the row
+positions into contiguous per-group slices with offsets), after which a
+group lookup is an O(1) slice and column values come back as views of a
+single sorted copy.
+
+Build one index per frame and pass it to the functions that accept an
+``index`` argument (bootstrap wrappers, ``select_genres``,
+``region_specific_tables``).
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Hashable, List, Optional
+
+
+class GroupIndex:
+    """
+    Precomputed grouping of a DataFrame's rows by one column.
+
+    Rows of each group are contiguous in ``positions`` and keep their
+    original relative order (stable sort), so ``positions[offsets[g]]`` is
+    the first row of group ``g``.
+
+    Example:
+        index = GroupIndex(df, 'Genre')
+        action = index.values('Action', 'log_sales')   # view, no scan
+        result = bootstrap_genre_mean_by_region(df, 'Action', 'NA', index=index)
+    """
+
+    def __init__(self, data: pd.DataFrame,
+                 group_col: str = 'Genre',
+                 groups: Optional[List[Hashable]] = None):
+        """
+        Encode and sort the rows of a DataFrame by group.
+
+        Args:
+            data: DataFrame to index
+            group_col: Column to group by (default: 'Genre')
+            groups: Groups to keep, in slice order (default: all, sorted).
+                    Rows of other groups and missing labels are dropped.
+
+        Raises:
+            ValueError: If group_col is missing or a requested group has no data
+        """
+        if group_col not in data.columns:
+            raise ValueError(f"{group_col} column not found in DataFrame")
+
+        codes, labels = pd.factorize(data[group_col], sort=True)
+        labels = list(labels)
+
+        if groups is not None:
+            missing = [g for g in groups if g not in labels]
+            if missing:
+                raise ValueError(f"No data found for group: {missing[0]}")
+            # Remap codes to the requested order; rows of other groups get -1
+            # (the extra trailing slot maps factorize's -1 for missing labels)
+            remap = np.full(len(labels) + 1, -1)
+            for new_code, g in enumerate(groups):
+                remap[labels.index(g)] = new_code
+            codes = remap[codes]
+            labels = list(groups)
+
+        rows = np.flatnonzero(codes >= 0)
+        codes = codes[rows]
+        order = np.argsort(codes, kind='stable')
+
+        self.data = data
+        self.group_col = group_col
+        self.labels = labels
+        self.positions = rows[order]
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(labels)))])
+        self._codes = {label: g for g, label in enumerate(labels)}
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def __contains__(self, group: Hashable) -> bool:
+        return group in self._codes
+
+    @property
+    def sizes(self) -> np.ndarray:
+        """Number of rows per group, in label order."""
+        return np.diff(self.offsets)
+
+    def group_slice(self, group: Hashable) -> slice:
+        """
+        Return the slice of a group in the sorted layout.
+
+        Unknown groups map to an empty slice.
+        """
+        g = self._codes.get(group)
+        if g is None:
+            return slice(0, 0)
+        return slice(int(self.offsets[g]), int(self.offsets[g + 1]))
+
+    def sorted_column(self, column: str) -> np.ndarray:
+        """
+        Return a column's values in group-sorted order.
+
+        The sorted copy is made once per column and cached; it is read-only.
+
+        Args:
+            column: Column name
+
+        Returns:
+            1D float array aligned with ``positions``
+        """
+        if column not in self._columns:
+            values = self.data[column].to_numpy(dtype=float)[self.positions]
+            values.flags.writeable = False
+            self._columns[column] = values
+        return self._columns[column]
+
+    def values(self, group: Hashable, column: str) -> np.ndarray:
+        """
+        Return the values of one group as a view into the sorted column.
+
+        Args:
+            group: Group label
+            column: Column name
+
+        Returns:
+            Read-only 1D array (empty for unknown groups)
+        """
+        return self.sorted_column(column)[self.group_slice(group)]
+
+    def rows(self, groups: List[Hashable]) -> np.ndarray:
+        """
+        Return the row positions of several groups in original frame order.
+
+        Args:
+            groups: Group labels (unknown labels are ignored)
+
+        Returns:
+            Sorted array of integer row positions
+        """
+        parts = [self.positions[self.group_slice(g)] for g in groups]
+        return np.sort(np.concatenate(parts)) if parts else np.empty(0, dtype=int)
+
+    def labels_by_appearance(self) -> List[Hashable]:
+        """Return the labels ordered by first appearance (like ``unique()``)."""
+        first_rows = self.positions[self.offsets[:-1][self.sizes > 0]]
+        present = [label for label, size in zip(self.labels, self.sizes) if size > 0]
+        return [present[i] for i in np.argsort(first_rows, kind='stable')]
+
+    def subset(self, groups: List[Hashable]) -> 'GroupIndex':
+        """
+        Return an index restricted to some groups, in the given order.
+
+        Reuses this index's sort, so the cost is proportional to the rows kept.
+
+        Args:
+            groups: Groups to keep, in slice order
+
+        Returns:
+            New GroupIndex over the same DataFrame
+
+        Raises:
+            ValueError: If a requested group has no data
+        """
+        missing = [g for g in groups if g not in self._codes]
+        if missing:
+            raise ValueError(f"No data found for group: {missing[0]}")
+
+        subset = GroupIndex.__new__(GroupIndex)
+        subset.data = self.data
+        subset.group_col = self.group_col
+        subset.labels = list(groups)
+        parts = [self.positions[self.group_slice(g)] for g in groups]
+        subset.positions = np.concatenate(parts) if parts else np.empty(0, dtype=int)
+        subset.offsets = np.concatenate([[0], np.cumsum([len(p) for p in parts])]).astype(int)
+        subset._codes = {label: g for g, label in enumerate(subset.labels)}
+        subset._columns = {}
+        return subset
@@ -8,7 +8,7 @@ including log transformations and data reshaping for analysis.
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Literal
+from typing import Dict, Literal
 
 
 def apply_log_transform(df: pd.DataFrame) -> pd.DataFrame:
@@ -58,7 +58,8 @@ def reshape_for_analysis(df: pd.DataFrame,
         region: One of ['Global', 'NA', 'EU', 'JP', 'Other']
         
     Returns:
-        DataFrame with columns: Genre, log_sales, (optional: Year, Platform)
+        DataFrame with columns: Genre, log_sales, (optional: Year, Platform,
+        Name; Name, Platform and Year identify a game across rebuilds)
         
     Raises:
         ValueError: If region is invalid or required columns are missing
@@ -88,6 +89,8 @@ def reshape_for_analysis(df: pd.DataFrame,
         columns_to_keep.append('Year')
     if 'Platform' in df.columns:
         columns_to_keep.append('Platform')
+    if 'Name' in df.columns:
+        columns_to_keep.append('Name')
     
     df_reshaped = df[columns_to_keep].copy()
     
@@ -100,6 +103,41 @@ def reshape_for_analysis(df: pd.DataFrame,
     return df_reshaped
 
 
+def combine_region_data(region_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Combine per-region analysis frames into one games x regions frame.
+    
+    The per-region frames produced by reshape_for_analysis are row-aligned
+    splits of the same games, so their log_sales columns can be placed side
+    by side as log_sales_<region>.
+    
+    Args:
+        region_data: Mapping of region name -> DataFrame with 'Genre' and 'log_sales'
+        
+    Returns:
+        DataFrame with 'Genre' and one log_sales_<region> column per region
+        
+    Raises:
+        ValueError: If region_data is empty or the frames are not row-aligned
+    """
+    if not region_data:
+        raise ValueError("region_data must contain at least one region")
+    
+    combined = None
+    for region, df in region_data.items():
+        if 'Genre' not in df.columns or 'log_sales' not in df.columns:
+            raise ValueError(f"Data for {region} must contain 'Genre' and 'log_sales' columns")
+        
+        if combined is None:
+            combined = df[['Genre']].reset_index(drop=True)
+        elif len(df) != len(combined) or not (df['Genre'].values == combined['Genre'].values).all():
+            raise ValueError(f"Data for {region} is not row-aligned with the other regions")
+        
+        combined[f"log_sales_{region.lower()}"] = df['log_sales'].values
+    
+    return combined
+
+
 def save_cleaned_data(df: pd.DataFrame, 
                      region: str, 
                      time_window: str = 'all',
@@ -7,6 +7,7 @@ Completed by Person 2:
 - Added input validation
 - Added numeric formatting options
 - Added CI width and SE columns
+- Added Monte Carlo standard error columns
 - Added sorting options
 - Added optional separation of means vs differences
 - Added LaTeX export and region-specific tables
@@ -15,7 +16,9 @@ Completed by Person 2:
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Union
+
+from ..data_preprocessing.group_index import GroupIndex
 
 
 # ------------------------------------------------------------
@@ -58,6 +61,10 @@ def create_summary_table(
             - For means: 'genre', 'region', 'mean', 'ci_lower', 'ci_upper', 'sample_size'
             - For differences: 'genre_A', 'genre_B', 'region', 'mean_difference', 
                               'ci_lower', 'ci_upper', 'sample_size_A', 'sample_size_B'
+            - Optional Monte Carlo errors: 'mcse_lower', 'mcse_upper' and,
+              for differences, 'mcse_significant' (NaN columns if missing).
+              Methods without resampling (saddlepoint) report NaN, which
+              means "not applicable" rather than "zero error"
         decimals: Number of decimal places for rounding
         sci: Use scientific notation if True
         separate_tables: If True, return dict with 'means' and 'differences' DataFrames
@@ -90,6 +97,9 @@ def create_summary_table(
                 'CI_Upper': r.get('ci_upper', np.nan),
                 'CI_Width': abs(r.get('ci_upper', np.nan) - r.get('ci_lower', np.nan)),
                 'Significant': r.get('significant', False),
+                'MCSE_Lower': r.get('mcse_lower', np.nan),
+                'MCSE_Upper': r.get('mcse_upper', np.nan),
+                'MCSE_Significant': r.get('mcse_significant', np.nan),
                 'Sample_Size_A': r.get('sample_size_A', 0),
                 'Sample_Size_B': r.get('sample_size_B', 0),
             }
@@ -102,6 +112,8 @@ def create_summary_table(
                 'CI_Lower': r.get('ci_lower', np.nan),
                 'CI_Upper': r.get('ci_upper', np.nan),
                 'CI_Width': abs(r.get('ci_upper', np.nan) - r.get('ci_lower', np.nan)),
+                'MCSE_Lower': r.get('mcse_lower', np.nan),
+                'MCSE_Upper': r.get('mcse_upper', np.nan),
                 'Sample_Size': r.get('sample_size', 0)
             }
         
@@ -116,9 +128,11 @@ def create_summary_table(
         else:
             df = df.sort_values(by=['Region', 'Genre_A', 'Genre_B'], ascending=True)
     
-    # Number formatting
+    # Number formatting; Monte Carlo errors are orders of magnitude smaller
+    # than the estimates, so they keep two extra decimals
     for col in df.select_dtypes(include=[np.number]).columns:
-        df[col] = df[col].apply(lambda x: format_number(x, decimals, sci))
+        places = decimals + 2 if col.startswith('MCSE_') else decimals
+        df[col] = df[col].apply(lambda x: format_number(x, places, sci))
     
     # Optional: return separate tables
     if separate_tables:
@@ -171,12 +185,15 @@ def make_latex_table(df: pd.DataFrame, filepath: str) -> None:
     print(f"LaTeX table saved to: {filepath}")
 
 
-def region_specific_tables(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+def region_specific_tables(df: pd.DataFrame,
+                           index: Optional[GroupIndex] = None) -> Dict[str, pd.DataFrame]:
     """
     Create a dict of tables, one per region.
     
     Args:
         df: DataFrame with 'Region' column
+        index: Optional GroupIndex of df by 'Region' (built here if omitted);
+               each table is taken from its precomputed row slice
     
     Returns:
         Dictionary with region names as keys and filtered DataFrames as values
@@ -187,9 +204,15 @@ def region_specific_tables(df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
     if 'Region' not in df.columns:
         raise ValueError("DataFrame must contain a Region column")
     
+    if index is None:
+        index = GroupIndex(df, 'Region')
+    elif index.data is not df or index.group_col != 'Region':
+        raise ValueError("index must be a Region GroupIndex of this DataFrame")
+    
     tables = {}
-    for region in df['Region'].unique():
-        tables[region] = df[df['Region'] == region].reset_index(drop=True)
+    for region in index.labels_by_appearance():
+        rows = index.positions[index.group_slice(region)]
+        tables[region] = df.iloc[rows].reset_index(drop=True)
     return tables
 
 
@@ -12,6 +12,8 @@ from pathlib import Path
 from typing import Optional, Tuple, Dict, List
 import pandas as pd
 
+from ..data_preprocessing.group_index import GroupIndex
+
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.dpi'] = 300
@@ -123,17 +125,20 @@ def plot_genre_means_by_region(results: Dict[str, Dict],
     fig, ax = plt.subplots(figsize=(12, 6))
     
     # Group by region for different subplots or grouped bars
-    regions = df['Region'].unique()
+    region_index = GroupIndex(df, 'Region')
+    regions = region_index.labels_by_appearance()
     genres = df['Genre'].unique()
     
     x = np.arange(len(genres))
     width = 0.15
     
     for i, region in enumerate(regions):
-        region_data = df[df['Region'] == region]
-        means = [region_data[region_data['Genre'] == g]['Mean'].values[0] 
-                if len(region_data[region_data['Genre'] == g]) > 0 else 0 
-                for g in genres]
+        rows = region_index.positions[region_index.group_slice(region)]
+        # First entry per genre wins, as with the previous boolean masks
+        region_means = {}
+        for genre, mean in zip(df['Genre'].values[rows], df['Mean'].values[rows]):
+            region_means.setdefault(genre, mean)
+        means = [region_means.get(g, 0) for g in genres]
         offset = (i - len(regions) / 2) * width + width / 2
         ax.bar(x + offset, means, width, label=region)
     
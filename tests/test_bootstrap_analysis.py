@@ -20,16 +20,104 @@ sys.path.insert(0, str(PROJECT_ROOT))
 
 from src.bootstrap_analysis.bootstrap_means import (
     bootstrap_mean,
-    bootstrap_genre_mean_by_region
+    bootstrap_mean_t,
+    bootstrap_mean_sketch,
+    bootstrap_mean_reduced,
+    bootstrap_genre_mean_by_region,
+    bootstrap_group_means,
+    bootstrap_region_means
 )
 from src.bootstrap_analysis.bootstrap_differences import (
     bootstrap_difference,
-    bootstrap_genre_difference
+    bootstrap_difference_t,
+    bootstrap_difference_sketch,
+    bootstrap_difference_reduced,
+    bootstrap_genre_difference,
+    bootstrap_all_pair_differences
 )
 from src.bootstrap_analysis.confidence_intervals import (
     percentile_ci,
+    batch_percentile_ci,
+    bca_ci,
+    jackknife_acceleration,
+    studentized_ci,
+    sketch_ci,
     is_significant
 )
+from src.bootstrap_analysis.resampling import (
+    iter_blocks,
+    resample_means,
+    resample_moments,
+    resample_group_means,
+    _balanced_index_blocks,
+    _dirichlet_weight_blocks
+)
+from src.bootstrap_analysis.parallel import (
+    chunk_sizes,
+    spawn_seeds,
+    run_bootstrap_tasks,
+    parallel_genre_means,
+    parallel_genre_differences
+)
+from src.bootstrap_analysis.replicate_store import (
+    ReplicateStore,
+    fingerprint_arrays,
+    cached_replicates
+)
+from src.data_preprocessing.group_index import GroupIndex
+from src.bootstrap_analysis.monte_carlo import (
+    endpoint_mcse,
+    significance_mcse,
+    adaptive_bootstrap_mean,
+    adaptive_bootstrap_difference
+)
+from src.bootstrap_analysis.quantile_sketch import QuantileSketch, merge_sketches
+from src.bootstrap_analysis.variance_reduction import (
+    control_variate_weights,
+    weighted_quantiles,
+    linear_variance
+)
+from src.bootstrap_analysis.saddlepoint import (
+    saddlepoint_quantiles,
+    saddlepoint_ci,
+    saddlepoint_genre_mean,
+    saddlepoint_genre_difference
+)
+from src.bootstrap_analysis.exact_bootstrap import (
+    lattice_units,
+    exact_mean_quantiles,
+    exact_difference_quantiles,
+    exact_ci,
+    exact_genre_mean,
+    exact_genre_difference
+)
+from src.bootstrap_analysis.poisson_bootstrap import (
+    PoissonBootstrap,
+    stream_bootstrap,
+    stream_csv_bootstrap
+)
+from src.bootstrap_analysis.incremental import IncrementalBootstrap, keyed_poisson_weights
+from src.bootstrap_analysis.little_bootstrap import (
+    subset_size,
+    blb_mean_kernel,
+    blb_mean_ci,
+    blb_difference_ci,
+    blb_genre_mean,
+    blb_genre_difference
+)
+from src.bootstrap_analysis.permutation_test import (
+    permutation_counts,
+    permutation_test,
+    genre_permutation_test,
+    parallel_permutation_tests
+)
+from src.bootstrap_analysis.memoization import BootstrapCache, frame_fingerprint
+from src.bootstrap_analysis.shared_data import (
+    SharedArray,
+    attach_array,
+    shared_mean_kernel,
+    shared_difference_kernel
+)
 
 
 # ============================================================================
@@ -127,6 +215,200 @@ def test_bootstrap_mean_small_sample():
     assert 1.5 < result.mean() < 2.5
 
 
+def test_bootstrap_mean_matches_loop_reference(sample_data):
+    """Test that the vectorized engine reproduces the per-replicate loop."""
+    rng = np.random.default_rng(42)
+    expected = np.array([
+        rng.choice(sample_data, size=len(sample_data), replace=True).mean()
+        for _ in range(200)
+    ])
+    
+    result = bootstrap_mean(sample_data, n_iterations=200, random_seed=42)
+    
+    np.testing.assert_allclose(result, expected)
+
+
+# ============================================================================
+# Tests for resampling engine
+# ============================================================================
+
+def test_iter_blocks_covers_range():
+    """Test that blocks cover every replicate exactly once."""
+    blocks = list(iter_blocks(10, bytes_per_replicate=100, memory_budget=300))
+    
+    assert blocks == [(0, 3), (3, 6), (6, 9), (9, 10)]
+
+
+def test_iter_blocks_minimum_one_replicate():
+    """Test that a tiny budget still yields one replicate per block."""
+    blocks = list(iter_blocks(3, bytes_per_replicate=1000, memory_budget=1))
+    
+    assert blocks == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_resample_means_independent_of_block_size(sample_data):
+    """Test that the memory budget does not change the results."""
+    small = resample_means(sample_data, 500, np.random.default_rng(7), memory_budget=1)
+    large = resample_means(sample_data, 500, np.random.default_rng(7), memory_budget=10**9)
+    
+    np.testing.assert_allclose(small, large)
+
+
+# ============================================================================
+# Tests for tie-compressed multinomial scheme
+# ============================================================================
+
+@pytest.fixture
+def tied_data():
+    """Create heavily tied data on a 0.01 grid with many zeros."""
+    rng = np.random.default_rng(0)
+    sales = np.round(rng.exponential(0.2, size=2000), 2)
+    sales[:600] = 0.0
+    return np.log1p(sales)
+
+
+def test_bootstrap_mean_multinomial_matches_iid_distribution(tied_data):
+    """Test that multinomial resampling is statistically equivalent to iid."""
+    iid = bootstrap_mean(tied_data, n_iterations=5000, random_seed=1)
+    multinomial = bootstrap_mean(tied_data, n_iterations=5000, random_seed=1,
+                                 scheme='multinomial')
+    
+    assert np.abs(multinomial.mean() - tied_data.mean()) < 0.002
+    assert 0.9 < multinomial.std() / iid.std() < 1.1
+
+
+def test_bootstrap_mean_multinomial_reproducibility(tied_data):
+    """Test that multinomial resampling is reproducible with same seed."""
+    result1 = bootstrap_mean(tied_data, n_iterations=100, random_seed=3, scheme='multinomial')
+    result2 = bootstrap_mean(tied_data, n_iterations=100, random_seed=3, scheme='multinomial')
+    
+    np.testing.assert_array_equal(result1, result2)
+
+
+def test_bootstrap_mean_multinomial_single_value():
+    """Test multinomial resampling when all values are tied."""
+    result = bootstrap_mean(np.full(10, 2.0), n_iterations=50, scheme='multinomial')
+    
+    assert np.allclose(result, 2.0)
+
+
+def test_bootstrap_difference_multinomial(tied_data):
+    """Test multinomial scheme for bootstrap differences."""
+    result = bootstrap_difference(tied_data, tied_data + 0.1, n_iterations=2000,
+                                  random_seed=5, scheme='multinomial')
+    
+    assert len(result) == 2000
+    assert np.abs(result.mean() + 0.1) < 0.01
+
+
+# ============================================================================
+# Tests for the balanced scheme
+# ============================================================================
+
+def test_balanced_scheme_uses_every_observation_equally(sample_data):
+    """Test the balance property across memory-bounded blocks."""
+    rng = np.random.default_rng(6)
+    counts = np.zeros(len(sample_data), dtype=np.int64)
+    blocks = 0
+    # A tiny budget forces many blocks
+    for _, _, indices in _balanced_index_blocks(len(sample_data), 500, rng, 16 * len(sample_data),
+                                                memory_budget=16 * len(sample_data) * 64):
+        counts += np.bincount(indices.ravel(), minlength=len(sample_data))
+        blocks += 1
+    
+    assert blocks == 8
+    assert np.all(counts == 500)
+
+
+def test_bootstrap_mean_balanced(sample_data):
+    """Test that balanced replicates average exactly to the sample mean."""
+    balanced = bootstrap_mean(sample_data, n_iterations=3000, random_seed=7, scheme='balanced')
+    iid = bootstrap_mean(sample_data, n_iterations=3000, random_seed=7)
+    
+    assert balanced.mean() == pytest.approx(sample_data.mean(), abs=1e-12)
+    assert 0.9 < balanced.std() / iid.std() < 1.1
+    np.testing.assert_array_equal(
+        balanced, bootstrap_mean(sample_data, n_iterations=3000, random_seed=7, scheme='balanced')
+    )
+    means, _ = bootstrap_mean_t(sample_data, n_iterations=3000, random_seed=7, scheme='balanced')
+    np.testing.assert_array_equal(means, balanced)
+
+
+def test_bootstrap_difference_balanced(sample_data):
+    """Test balanced differences: exact centering and independence of groups."""
+    data_B = sample_data[:50] + 0.3
+    result = bootstrap_difference(sample_data, data_B, n_iterations=2000,
+                                  random_seed=8, scheme='balanced')
+    
+    assert len(result) == 2000
+    assert result.mean() == pytest.approx(sample_data.mean() - data_B.mean(), abs=1e-12)
+
+
+def test_bootstrap_mean_invalid_scheme(sample_data):
+    """Test that an unknown scheme raises ValueError."""
+    with pytest.raises(ValueError, match="scheme must be one of"):
+        bootstrap_mean(sample_data, n_iterations=10, scheme='unknown')
+
+
+# ============================================================================
+# Tests for the Bayesian bootstrap scheme
+# ============================================================================
+
+def test_dirichlet_weight_blocks(sample_data):
+    """Test that Bayesian weights are Dirichlet(1, ..., 1) rows in every block."""
+    rng = np.random.default_rng(2)
+    blocks = list(_dirichlet_weight_blocks(len(sample_data), 1000, rng,
+                                           memory_budget=8 * len(sample_data) * 300))
+    weights = np.vstack([w for _, _, w in blocks])
+    
+    assert len(blocks) == 4
+    assert weights.shape == (1000, 100)
+    assert np.all(weights > 0)
+    np.testing.assert_allclose(weights.sum(axis=1), 1.0)
+    # Dirichlet(1, ..., 1) marginal: mean 1/n, variance (n - 1) / (n^2 (n + 1))
+    assert weights.var() == pytest.approx(99 / (100 ** 2 * 101), rel=0.05)
+
+
+def test_bootstrap_mean_bayesian(sample_data):
+    """Test Bayesian replicates: centered, bootstrap-like spread, block invariant."""
+    bayesian = bootstrap_mean(sample_data, n_iterations=4000, random_seed=3, scheme='bayesian')
+    rng = np.random.default_rng(3)
+    blocked = resample_means(sample_data, 4000, rng, scheme='bayesian',
+                             memory_budget=8 * len(sample_data) * 7)
+    
+    assert bayesian.mean() == pytest.approx(sample_data.mean(), abs=0.005)
+    # Posterior sd of the mean: sd / sqrt(n + 1)
+    assert bayesian.std() == pytest.approx(np.std(sample_data) / np.sqrt(101), rel=0.05)
+    np.testing.assert_allclose(blocked, bayesian)
+    
+    means, t_stats = bootstrap_mean_t(sample_data, n_iterations=4000, random_seed=3,
+                                      scheme='bayesian')
+    np.testing.assert_allclose(means, bayesian)
+    assert np.all(np.isfinite(t_stats))
+
+
+def test_genre_wrappers_bayesian_scheme(sample_dataframe):
+    """Test that the genre wrappers pass the scheme through."""
+    mean_result = bootstrap_genre_mean_by_region(sample_dataframe, 'Simulation', 'NA',
+                                                 n_iterations=500, random_seed=1,
+                                                 scheme='bayesian')
+    diff_result = bootstrap_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA',
+                                             n_iterations=500, random_seed=1,
+                                             scheme='bayesian')
+    values = sample_dataframe.loc[sample_dataframe['Genre'] == 'Simulation', 'log_sales'].values
+    
+    np.testing.assert_array_equal(
+        mean_result['bootstrap_means'],
+        bootstrap_mean(values, n_iterations=500, random_seed=1, scheme='bayesian')
+    )
+    assert not np.array_equal(
+        mean_result['bootstrap_means'],
+        bootstrap_genre_mean_by_region(sample_dataframe, 'Simulation', 'NA', n_iterations=500,
+                                       random_seed=1)['bootstrap_means']
+    )
+    assert len(diff_result['bootstrap_differences']) == 500
+
+
 # ============================================================================
 # Tests for bootstrap_genre_mean_by_region
 # ============================================================================
@@ -169,6 +451,145 @@ def test_bootstrap_genre_mean_by_region_nonexistent_genre(sample_dataframe):
         bootstrap_genre_mean_by_region(sample_dataframe, 'Nonexistent', 'Global')
 
 
+# ============================================================================
+# Tests for bootstrap_group_means
+# ============================================================================
+
+def test_bootstrap_group_means_basic(sample_dataframe):
+    """Test grouped bootstrap over all genres at once."""
+    result = bootstrap_group_means(sample_dataframe, n_iterations=1000, random_seed=42)
+    
+    assert result['groups'] == ['Action', 'Role-Playing', 'Simulation']
+    assert result['bootstrap_means'].shape == (1000, 3)
+    np.testing.assert_array_equal(result['sample_sizes'], [50, 30, 20])
+    expected_means = sample_dataframe.groupby('Genre')['log_sales'].mean().values
+    np.testing.assert_allclose(result['means'], expected_means)
+
+
+def test_bootstrap_group_means_matches_per_group_distribution(sample_dataframe):
+    """Test that each column has the spread of a per-genre bootstrap."""
+    grouped = bootstrap_group_means(sample_dataframe, n_iterations=5000, random_seed=1)
+    
+    for i, genre in enumerate(grouped['groups']):
+        single = bootstrap_genre_mean_by_region(
+            sample_dataframe, genre, 'Global', n_iterations=5000, random_seed=2
+        )
+        column = grouped['bootstrap_means'][:, i]
+        assert np.abs(column.mean() - single['mean']) < 0.02
+        assert 0.85 < column.std() / single['bootstrap_means'].std() < 1.15
+
+
+def test_resample_group_means_matches_per_group_loop():
+    """Test that grouped resampling draws what a per-group loop would."""
+    values = np.random.default_rng(0).normal(size=60)
+    offsets = np.array([0, 35, 50, 60])
+    grouped = resample_group_means(values, offsets, 300, np.random.default_rng(3),
+                                   memory_budget=2000)
+    
+    rng = np.random.default_rng(3)
+    for g in range(3):
+        expected = resample_means(values[offsets[g]:offsets[g + 1]], 300, rng)
+        np.testing.assert_allclose(grouped[:, g], expected)
+
+
+def test_bootstrap_group_means_selected_groups_order(sample_dataframe):
+    """Test that requested groups define the column order."""
+    result = bootstrap_group_means(
+        sample_dataframe, groups=['Simulation', 'Action'], n_iterations=10, random_seed=0
+    )
+    
+    assert result['groups'] == ['Simulation', 'Action']
+    assert result['bootstrap_means'].shape == (10, 2)
+    np.testing.assert_array_equal(result['sample_sizes'], [20, 50])
+
+
+def test_bootstrap_group_means_reproducibility(sample_dataframe):
+    """Test that grouped bootstrap is reproducible with same seed."""
+    result1 = bootstrap_group_means(sample_dataframe, n_iterations=100, random_seed=42)
+    result2 = bootstrap_group_means(sample_dataframe, n_iterations=100, random_seed=42)
+    
+    np.testing.assert_array_equal(result1['bootstrap_means'], result2['bootstrap_means'])
+
+
+def test_bootstrap_group_means_errors(sample_dataframe):
+    """Test error handling for grouped bootstrap."""
+    with pytest.raises(ValueError, match="must contain"):
+        bootstrap_group_means(sample_dataframe, group_col='Publisher')
+    
+    with pytest.raises(ValueError, match="No data found"):
+        bootstrap_group_means(sample_dataframe, groups=['Nonexistent'])
+    
+    with pytest.raises(ValueError, match="must be positive"):
+        bootstrap_group_means(sample_dataframe, n_iterations=0)
+
+
+# ============================================================================
+# Tests for bootstrap_region_means
+# ============================================================================
+
+@pytest.fixture
+def region_dataframe(sample_dataframe):
+    """Create a games x regions frame with one log-sales column per region."""
+    df = sample_dataframe[['Genre']].copy()
+    df['log_sales_na'] = sample_dataframe['log_sales']
+    df['log_sales_jp'] = sample_dataframe['log_sales'] * 0.5 + 0.1
+    return df
+
+
+def test_bootstrap_region_means_basic(region_dataframe):
+    """Test joint multi-region bootstrap shapes and summary results."""
+    result = bootstrap_region_means(
+        region_dataframe,
+        region_cols={'NA': 'log_sales_na', 'JP': 'log_sales_jp'},
+        n_iterations=500,
+        random_seed=42
+    )
+    
+    assert result['regions'] == ['NA', 'JP']
+    assert result['bootstrap_means'].shape == (500, 3, 2)
+    assert result['means'].shape == (3, 2)
+    assert len(result['results']) == 6
+    for r in result['results']:
+        assert set(r) == {'genre', 'region', 'mean', 'ci_lower', 'ci_upper',
+                          'mcse_lower', 'mcse_upper', 'sample_size'}
+        assert r['ci_lower'] < r['mean'] < r['ci_upper']
+
+
+def test_bootstrap_region_means_matches_single_region(region_dataframe):
+    """Test that each region column equals a single-column grouped bootstrap."""
+    joint = bootstrap_region_means(
+        region_dataframe,
+        region_cols={'NA': 'log_sales_na', 'JP': 'log_sales_jp'},
+        n_iterations=200,
+        random_seed=7
+    )
+    single = bootstrap_group_means(
+        region_dataframe, value_col='log_sales_jp', n_iterations=200, random_seed=7
+    )
+    
+    np.testing.assert_allclose(joint['bootstrap_means'][:, :, 1], single['bootstrap_means'])
+
+
+def test_bootstrap_region_means_paired_replicates(region_dataframe):
+    """Test that regions share resample indices (replicates are paired)."""
+    result = bootstrap_region_means(
+        region_dataframe,
+        region_cols={'NA': 'log_sales_na', 'JP': 'log_sales_jp'},
+        n_iterations=200,
+        random_seed=1
+    )
+    
+    # JP is an exact linear function of NA, so paired replicates must be too
+    replicates = result['bootstrap_means']
+    np.testing.assert_allclose(replicates[:, :, 1], replicates[:, :, 0] * 0.5 + 0.1)
+
+
+def test_bootstrap_region_means_empty_regions(region_dataframe):
+    """Test that an empty region mapping raises ValueError."""
+    with pytest.raises(ValueError, match="at least one region"):
+        bootstrap_region_means(region_dataframe, region_cols={})
+
+
 # ============================================================================
 # Tests for bootstrap_difference
 # ============================================================================
@@ -282,6 +703,380 @@ def test_bootstrap_genre_difference_nonexistent_genre(sample_dataframe):
         bootstrap_genre_difference(sample_dataframe, 'Action', 'Nonexistent', 'Global')
 
 
+# ============================================================================
+# Tests for bootstrap_all_pair_differences
+# ============================================================================
+
+def test_bootstrap_all_pair_differences_basic(sample_dataframe):
+    """Test all-pairs differences derived from one grouped bootstrap."""
+    results = bootstrap_all_pair_differences(
+        sample_dataframe, region='Global', n_iterations=1000, random_seed=42
+    )
+    
+    pairs = [(r['genre_A'], r['genre_B']) for r in results]
+    assert pairs == [('Action', 'Role-Playing'), ('Action', 'Simulation'),
+                     ('Role-Playing', 'Simulation')]
+    for r in results:
+        assert len(r['bootstrap_differences']) == 1000
+        assert r['ci_lower'] < r['ci_upper']
+        assert r['significant'] == is_significant(r['ci_lower'], r['ci_upper'])
+        assert np.isclose(r['mean_difference'], r['mean_A'] - r['mean_B'])
+
+
+def test_bootstrap_all_pair_differences_consistent_with_pair_bootstrap(sample_dataframe):
+    """Test that derived differences match a direct pairwise bootstrap in spread."""
+    results = bootstrap_all_pair_differences(
+        sample_dataframe, region='Global', genres=['Action', 'Simulation'],
+        n_iterations=5000, random_seed=1
+    )
+    direct = bootstrap_genre_difference(
+        sample_dataframe, 'Action', 'Simulation', 'Global', n_iterations=5000, random_seed=2
+    )
+    
+    assert len(results) == 1
+    derived = results[0]['bootstrap_differences']
+    assert np.isclose(results[0]['mean_difference'], direct['mean_difference'])
+    assert 0.85 < derived.std() / direct['bootstrap_differences'].std() < 1.15
+
+
+def test_bootstrap_all_pair_differences_ci_matches_percentile_ci(sample_dataframe):
+    """Test that broadcast CIs equal percentile_ci on each column."""
+    results = bootstrap_all_pair_differences(
+        sample_dataframe, region='Global', n_iterations=500, random_seed=3
+    )
+    
+    for r in results:
+        expected = percentile_ci(r['bootstrap_differences'], confidence_level=0.95)
+        np.testing.assert_allclose((r['ci_lower'], r['ci_upper']), expected)
+
+
+def test_bootstrap_all_pair_differences_errors(sample_dataframe):
+    """Test error handling for all-pairs differences."""
+    with pytest.raises(ValueError, match="At least two genres"):
+        bootstrap_all_pair_differences(sample_dataframe, 'Global', genres=['Action'])
+    
+    with pytest.raises(ValueError, match="No data found"):
+        bootstrap_all_pair_differences(sample_dataframe, 'Global', genres=['Action', 'Nonexistent'])
+
+
+# ============================================================================
+# Tests for parallel execution
+# ============================================================================
+
+def test_chunk_sizes():
+    """Test fixed-size replicate chunking."""
+    assert chunk_sizes(10, 4) == [4, 4, 2]
+    assert chunk_sizes(8, 4) == [4, 4]
+    assert chunk_sizes(3, 10) == [3]
+    
+    with pytest.raises(ValueError, match="must be positive"):
+        chunk_sizes(0, 4)
+
+
+def test_spawn_seeds_deterministic():
+    """Test that spawned seeds are deterministic and distinct."""
+    seeds1 = spawn_seeds(42, n_tasks=2, n_chunks=3)
+    seeds2 = spawn_seeds(42, n_tasks=2, n_chunks=3)
+    
+    states1 = [s.generate_state(2).tolist() for task in seeds1 for s in task]
+    states2 = [s.generate_state(2).tolist() for task in seeds2 for s in task]
+    assert states1 == states2
+    assert len({tuple(state) for state in states1}) == 6
+
+
+def test_run_bootstrap_tasks_independent_of_workers(sample_data):
+    """Test that results are bit-identical for serial and pooled execution."""
+    tasks = [(sample_data,), (sample_data[:50],)]
+    
+    serial = run_bootstrap_tasks(bootstrap_mean, tasks, n_iterations=1000,
+                                 random_seed=42, max_workers=1, chunk_size=300)
+    pooled = run_bootstrap_tasks(bootstrap_mean, tasks, n_iterations=1000,
+                                 random_seed=42, max_workers=2, chunk_size=300)
+    
+    assert len(serial) == 2
+    for a, b in zip(serial, pooled):
+        assert len(a) == 1000
+        np.testing.assert_array_equal(a, b)
+
+
+def test_parallel_genre_means(sample_dataframe):
+    """Test (region, genre) mean tasks."""
+    datasets = {'NA': sample_dataframe, 'EU': sample_dataframe}
+    results = parallel_genre_means(datasets, ['Action', 'Simulation'],
+                                   n_iterations=500, random_seed=1, max_workers=1)
+    
+    assert [(r['region'], r['genre']) for r in results] == [
+        ('NA', 'Action'), ('NA', 'Simulation'), ('EU', 'Action'), ('EU', 'Simulation')
+    ]
+    assert results[0]['sample_size'] == 50
+    assert len(results[0]['bootstrap_means']) == 500
+    # Identical inputs in two regions still get independent streams
+    assert not np.array_equal(results[0]['bootstrap_means'], results[2]['bootstrap_means'])
+
+
+def test_parallel_genre_differences(sample_dataframe):
+    """Test (region, pair) difference tasks."""
+    results = parallel_genre_differences({'NA': sample_dataframe}, [('Action', 'Role-Playing')],
+                                         n_iterations=500, random_seed=1, max_workers=1)
+    
+    assert len(results) == 1
+    assert results[0]['sample_size_A'] == 50
+    assert results[0]['sample_size_B'] == 30
+    assert len(results[0]['bootstrap_differences']) == 500
+    
+    with pytest.raises(ValueError, match="No data found"):
+        parallel_genre_differences({'NA': sample_dataframe}, [('Action', 'Nonexistent')],
+                                   n_iterations=10, max_workers=1)
+
+
+def test_parallel_genre_means_pooled_matches_serial(sample_dataframe):
+    """Test that shared-memory pooled tasks reproduce serial results."""
+    datasets = {'NA': sample_dataframe}
+    serial = parallel_genre_means(datasets, ['Action'], n_iterations=300,
+                                  random_seed=5, max_workers=1, chunk_size=100)
+    pooled = parallel_genre_means(datasets, ['Action'], n_iterations=300,
+                                  random_seed=5, max_workers=2, chunk_size=100)
+    
+    np.testing.assert_array_equal(serial[0]['bootstrap_means'], pooled[0]['bootstrap_means'])
+
+
+# ============================================================================
+# Tests for shared-memory data plane
+# ============================================================================
+
+def test_shared_array_roundtrip(sample_data):
+    """Test that a published array is visible zero-copy and read-only."""
+    with SharedArray(sample_data) as handle:
+        view = attach_array(handle)
+        np.testing.assert_array_equal(view, sample_data)
+        assert not view.flags.writeable
+        del view
+
+
+def test_shared_array_unlinked_on_exit(sample_data):
+    """Test that the shared block is released when the context exits."""
+    from multiprocessing import shared_memory
+    
+    with SharedArray(sample_data) as handle:
+        name = handle[0]
+    
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=name)
+
+
+def test_shared_kernels_match_direct_kernels(sample_data):
+    """Test that shared kernels equal bootstrap_mean/bootstrap_difference on slices."""
+    with SharedArray(sample_data) as handle:
+        means = shared_mean_kernel(handle, 10, 60, n_iterations=100, random_seed=3)
+        diffs = shared_difference_kernel(handle, 0, 40, 40, 100, n_iterations=100, random_seed=3)
+    
+    np.testing.assert_array_equal(means, bootstrap_mean(sample_data[10:60], 100, 3))
+    np.testing.assert_array_equal(
+        diffs, bootstrap_difference(sample_data[:40], sample_data[40:], 100, 3)
+    )
+
+
+# ============================================================================
+# Tests for replicate store
+# ============================================================================
+
+def test_fingerprint_arrays_content_sensitive(sample_data):
+    """Test that fingerprints change with content, dtype and shape."""
+    base = fingerprint_arrays(sample_data)
+    
+    assert fingerprint_arrays(sample_data.copy()) == base
+    assert fingerprint_arrays(sample_data + 1e-12) != base
+    assert fingerprint_arrays(sample_data.astype(np.float32)) != base
+    assert fingerprint_arrays(sample_data.reshape(10, 10)) != base
+
+
+def test_replicate_store_roundtrip(tmp_path, sample_data):
+    """Test that a stored array is returned memory-mapped on the next call."""
+    store = ReplicateStore(tmp_path / "replicates")
+    params = {'statistic': 'mean', 'n_iterations': 100, 'random_seed': 1}
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return bootstrap_mean(sample_data, 100, 1)
+    
+    first = store.get_or_compute(params, compute)
+    second = store.get_or_compute(params, compute)
+    
+    assert len(calls) == 1
+    assert isinstance(second, np.memmap)
+    np.testing.assert_array_equal(first, second)
+
+
+def test_replicate_store_key_includes_version_and_scheme(monkeypatch):
+    """Test that keys change with the store version and the resampling scheme."""
+    from src.bootstrap_analysis import replicate_store
+    params = {'statistic': 'mean', 'scheme': 'iid', 'n_iterations': 100, 'random_seed': 1}
+    key = ReplicateStore.make_key(params)
+    
+    assert ReplicateStore.make_key(dict(params, scheme='balanced')) != key
+    monkeypatch.setattr(replicate_store, 'STORE_VERSION', replicate_store.STORE_VERSION + 1)
+    assert ReplicateStore.make_key(params) != key
+
+
+def test_cached_replicates_skips_unseeded(tmp_path, sample_data):
+    """Test that unseeded runs are never stored."""
+    store = ReplicateStore(tmp_path)
+    cached_replicates(store, {'random_seed': None}, [sample_data],
+                      lambda: bootstrap_mean(sample_data, 10))
+    
+    assert list(tmp_path.glob("*.npy")) == []
+
+
+def test_bootstrap_genre_mean_by_region_uses_store(tmp_path, sample_dataframe):
+    """Test that repeated genre bootstraps load the stored replicates."""
+    store = ReplicateStore(tmp_path)
+    first = bootstrap_genre_mean_by_region(sample_dataframe, 'Action', 'NA',
+                                           n_iterations=200, random_seed=4, store=store)
+    second = bootstrap_genre_mean_by_region(sample_dataframe, 'Action', 'NA',
+                                            n_iterations=200, random_seed=4, store=store)
+    other_seed = bootstrap_genre_mean_by_region(sample_dataframe, 'Action', 'NA',
+                                                n_iterations=200, random_seed=5, store=store)
+    
+    assert len(list(tmp_path.glob("*.npy"))) == 2
+    np.testing.assert_array_equal(first['bootstrap_means'], second['bootstrap_means'])
+    assert not np.array_equal(first['bootstrap_means'], other_seed['bootstrap_means'])
+
+
+def test_all_pair_differences_share_group_store(tmp_path, sample_dataframe):
+    """Test that all-pairs differences reuse the stored grouped replicates."""
+    store = ReplicateStore(tmp_path)
+    genres = ['Action', 'Role-Playing', 'Simulation']
+    grouped = bootstrap_group_means(sample_dataframe, groups=genres, n_iterations=100,
+                                    random_seed=9, store=store)
+    pairs = bootstrap_all_pair_differences(sample_dataframe, 'NA', genres=genres,
+                                           n_iterations=100, random_seed=9, store=store)
+    
+    assert len(list(tmp_path.glob("*.npy"))) == 1
+    replicates = grouped['bootstrap_means']
+    np.testing.assert_array_equal(pairs[0]['bootstrap_differences'],
+                                  replicates[:, 0] - replicates[:, 1])
+
+
+# ============================================================================
+# Tests for GroupIndex lookups
+# ============================================================================
+
+def test_genre_wrappers_with_index(sample_dataframe):
+    """Test that indexed genre lookups reproduce the masked results."""
+    index = GroupIndex(sample_dataframe, 'Genre')
+    
+    plain = bootstrap_genre_mean_by_region(sample_dataframe, 'Role-Playing', 'NA',
+                                           n_iterations=300, random_seed=4)
+    indexed = bootstrap_genre_mean_by_region(sample_dataframe, 'Role-Playing', 'NA',
+                                             n_iterations=300, random_seed=4, index=index)
+    np.testing.assert_array_equal(indexed['bootstrap_means'], plain['bootstrap_means'])
+    
+    plain = bootstrap_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA',
+                                       n_iterations=300, random_seed=4)
+    indexed = bootstrap_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA',
+                                         n_iterations=300, random_seed=4, index=index)
+    np.testing.assert_array_equal(indexed['bootstrap_differences'],
+                                  plain['bootstrap_differences'])
+    
+    with pytest.raises(ValueError, match="No data found"):
+        bootstrap_genre_mean_by_region(sample_dataframe, 'Puzzle', 'NA', index=index)
+
+
+def test_group_means_with_index(sample_dataframe):
+    """Test that a prebuilt index (incl. a group subset) gives identical replicates."""
+    index = GroupIndex(sample_dataframe, 'Genre')
+    genres = ['Simulation', 'Action']
+    
+    plain = bootstrap_group_means(sample_dataframe, groups=genres,
+                                  n_iterations=200, random_seed=6)
+    indexed = bootstrap_group_means(sample_dataframe, groups=genres,
+                                    n_iterations=200, random_seed=6, index=index)
+    
+    assert indexed['groups'] == genres
+    np.testing.assert_array_equal(indexed['bootstrap_means'], plain['bootstrap_means'])
+    with pytest.raises(ValueError, match="different DataFrame"):
+        bootstrap_group_means(sample_dataframe.copy(), index=index)
+
+
+# ============================================================================
+# Tests for in-process memoization
+# ============================================================================
+
+def test_frame_fingerprint_detects_changes(sample_dataframe):
+    """Test that the frame fingerprint follows the selected columns only."""
+    columns = ['Genre', 'log_sales']
+    base = frame_fingerprint(sample_dataframe, columns)
+    
+    changed = sample_dataframe.copy()
+    changed.loc[0, 'log_sales'] += 1.0
+    other_column = sample_dataframe.copy()
+    other_column['Platform'] = 'PC'
+    
+    assert frame_fingerprint(changed, columns) != base
+    assert frame_fingerprint(other_column, columns) == base
+
+
+def test_genre_mean_memoization_hits(sample_dataframe):
+    """Test that repeated seeded calls are served from the cache."""
+    cache = BootstrapCache()
+    first = bootstrap_genre_mean_by_region(sample_dataframe, 'Action', 'NA',
+                                           n_iterations=200, random_seed=1, cache=cache)
+    second = bootstrap_genre_mean_by_region(sample_dataframe, 'Action', 'NA',
+                                            n_iterations=200, random_seed=1, cache=cache)
+    
+    assert cache.stats()['hits'] == 1
+    assert cache.stats()['misses'] == 1
+    np.testing.assert_array_equal(second['bootstrap_means'], first['bootstrap_means'])
+    assert first['bootstrap_means'].flags.writeable
+    assert not second['bootstrap_means'].flags.writeable
+
+
+def test_genre_difference_memoization_and_unseeded(sample_dataframe):
+    """Test memoized differences and that unseeded calls bypass the cache."""
+    cache = BootstrapCache()
+    for _ in range(3):
+        bootstrap_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA',
+                                   n_iterations=100, random_seed=2, cache=cache)
+    bootstrap_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA',
+                               n_iterations=100, cache=cache)
+    
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['misses'] == 1
+    assert len(cache) == 1
+
+
+def test_bootstrap_cache_lru_eviction():
+    """Test byte-bounded LRU eviction."""
+    cache = BootstrapCache(max_bytes=2 * 800)
+    cache.put('a', {'replicates': np.zeros(100)})
+    cache.put('b', {'replicates': np.zeros(100)})
+    cache.get('a')
+    cache.put('c', {'replicates': np.zeros(100)})
+    
+    assert cache.get('b') is None
+    assert cache.get('a') is not None
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 1600
+    
+    # Entries larger than the whole budget are not stored
+    cache.put('big', {'replicates': np.zeros(1000)})
+    assert cache.get('big') is None
+
+
+def test_bootstrap_cache_freezes_copies():
+    """Test that put leaves the caller's arrays writeable and unshared."""
+    cache = BootstrapCache()
+    replicates = np.zeros(10)
+    cache.put('a', {'replicates': replicates, 'mean': 0.0})
+    replicates[0] = 1.0
+    
+    cached = cache.get('a')
+    assert replicates.flags.writeable
+    assert not cached['replicates'].flags.writeable
+    assert cached['replicates'][0] == 0.0 and cached['mean'] == 0.0
+
+
 # ============================================================================
 # Tests for percentile_ci
 # ============================================================================
@@ -331,6 +1126,852 @@ def test_percentile_ci_invalid_confidence_level():
         percentile_ci(bootstrap_stats, confidence_level=1.5)
 
 
+def test_batch_percentile_ci_matches_np_percentile():
+    """Test batched bounds for several levels against np.percentile."""
+    rng = np.random.default_rng(11)
+    levels = [0.90, 0.95, 0.99]
+    
+    for n in (1, 2, 9, 1001):
+        replicates = rng.normal(size=(n, 4))
+        lower, upper = batch_percentile_ci(replicates, levels)
+        assert lower.shape == upper.shape == (3, 4)
+        for i, level in enumerate(levels):
+            alpha = 1 - level
+            expected = np.percentile(replicates, [100 * (alpha / 2), 100 * (1 - alpha / 2)], axis=0)
+            np.testing.assert_array_equal(lower[i], expected[0])
+            np.testing.assert_array_equal(upper[i], expected[1])
+
+
+def test_batch_percentile_ci_shapes_and_validation():
+    """Test single-level shapes, agreement with percentile_ci and errors."""
+    rng = np.random.default_rng(12)
+    replicates = rng.normal(size=(500, 3, 2))
+    
+    lower, upper = batch_percentile_ci(replicates, 0.95)
+    assert lower.shape == (3, 2)
+    assert (lower[1, 0], upper[1, 0]) == percentile_ci(replicates[:, 1, 0])
+    
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        batch_percentile_ci(replicates, [0.9, 1.0])
+    with pytest.raises(ValueError, match="cannot be empty"):
+        batch_percentile_ci(np.empty((0, 3)))
+
+
+# ============================================================================
+# Tests for bca_ci
+# ============================================================================
+
+def _brute_force_acceleration(samples):
+    """Acceleration from explicit leave-one-out recomputation."""
+    influence = []
+    for sample, sign in samples:
+        loo = np.array([np.delete(sample, i).mean() for i in range(len(sample))])
+        influence.append(sign * (loo.mean() - loo))
+    d = np.concatenate(influence)
+    return np.sum(d ** 3) / (6 * np.sum(d ** 2) ** 1.5)
+
+
+def test_jackknife_acceleration_closed_form():
+    """Test that the O(n) jackknife matches leave-one-out recomputation."""
+    rng = np.random.default_rng(21)
+    data_A = rng.lognormal(size=40)
+    data_B = rng.exponential(size=25)
+    
+    assert np.isclose(jackknife_acceleration(data_A),
+                      _brute_force_acceleration([(data_A, 1.0)]))
+    assert np.isclose(jackknife_acceleration(data_A, data_B),
+                      _brute_force_acceleration([(data_A, 1.0), (data_B, -1.0)]))
+    assert jackknife_acceleration(np.ones(10)) == 0.0
+    assert jackknife_acceleration(np.array([3.0])) == 0.0
+
+
+def test_bca_ci_skewed_data():
+    """Test that BCa shifts the interval towards the long tail of skewed data."""
+    rng = np.random.default_rng(22)
+    data = rng.lognormal(sigma=1.0, size=60)
+    bootstrap_stats = bootstrap_mean(data, n_iterations=5000, random_seed=22)
+    
+    bca_lower, bca_upper = bca_ci(bootstrap_stats, data)
+    pct_lower, pct_upper = percentile_ci(bootstrap_stats)
+    
+    assert bca_lower < np.mean(data) < bca_upper
+    assert bca_lower > pct_lower
+    assert bca_upper > pct_upper
+
+
+def test_bca_ci_difference_and_validation(sample_data):
+    """Test BCa for a difference of means and input validation."""
+    other = sample_data + 1.0
+    differences = bootstrap_difference(sample_data, other, n_iterations=2000, random_seed=3)
+    
+    lower, upper = bca_ci(differences, sample_data, data_B=other)
+    assert lower < -1.0 < upper
+    
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        bca_ci(differences, sample_data, confidence_level=1.0)
+    with pytest.raises(ValueError, match="cannot be empty"):
+        bca_ci(differences, np.array([]))
+
+
+# ============================================================================
+# Tests for bootstrap-t (studentized) intervals
+# ============================================================================
+
+def test_resample_moments_matches_explicit_resamples(sample_data):
+    """Test replicate means and variances against the explicit resamples."""
+    means, variances = resample_moments(sample_data, 50, np.random.default_rng(8),
+                                        memory_budget=4000)
+    
+    indices = np.random.default_rng(8).integers(0, len(sample_data), size=(50, len(sample_data)))
+    np.testing.assert_array_equal(means, sample_data[indices].mean(axis=1))
+    np.testing.assert_allclose(variances, np.var(sample_data[indices], axis=1, ddof=1))
+    
+    with pytest.raises(ValueError, match="at least two"):
+        resample_moments(np.array([1.0]), 10, np.random.default_rng(0))
+
+
+def test_bootstrap_t_reuses_the_mean_stream(sample_data, tied_data):
+    """Test that bootstrap-t replicates share the plain bootstrap's stream."""
+    means, bootstrap_t = bootstrap_mean_t(sample_data, n_iterations=300, random_seed=9)
+    np.testing.assert_array_equal(means, bootstrap_mean(sample_data, 300, 9))
+    assert np.all(np.isfinite(bootstrap_t))
+    
+    means, _ = bootstrap_mean_t(tied_data, n_iterations=300, random_seed=9, scheme='multinomial')
+    np.testing.assert_array_equal(means, bootstrap_mean(tied_data, 300, 9, scheme='multinomial'))
+    
+    other = sample_data[:40] + 0.5
+    differences, _ = bootstrap_difference_t(sample_data, other, n_iterations=300, random_seed=9)
+    np.testing.assert_array_equal(differences, bootstrap_difference(sample_data, other, 300, 9))
+
+
+
+def test_bootstrap_t_requires_two_observations(sample_data):
+    """Test that bootstrap-t rejects samples without a standard deviation."""
+    with pytest.raises(ValueError, match="at least two"):
+        bootstrap_mean_t(np.array([1.0]), n_iterations=10)
+    
+    with pytest.raises(ValueError, match="at least two"):
+        bootstrap_difference_t(sample_data, np.array([1.0]), n_iterations=10)
+
+def test_studentized_ci():
+    """Test bootstrap-t bounds and that undefined t statistics are dropped."""
+    bootstrap_t = np.concatenate([np.linspace(-2, 2, 401), [np.nan, np.inf]])
+    lower, upper = studentized_ci(bootstrap_t, estimate=1.0, standard_error=0.5)
+    
+    assert np.isclose(lower, 1.0 - 1.9 * 0.5)
+    assert np.isclose(upper, 1.0 + 1.9 * 0.5)
+    with pytest.raises(ValueError, match="cannot be empty"):
+        studentized_ci(np.array([np.nan]), 0.0, 1.0)
+
+
+def test_genre_difference_studentized(sample_dataframe, tmp_path):
+    """Test the studentized option of bootstrap_genre_difference, incl. the store."""
+    store = ReplicateStore(tmp_path)
+    plain = bootstrap_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA',
+                                       n_iterations=400, random_seed=10)
+    result = bootstrap_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA',
+                                        n_iterations=400, random_seed=10,
+                                        store=store, studentized=True)
+    reloaded = bootstrap_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA',
+                                          n_iterations=400, random_seed=10,
+                                          store=store, studentized=True)
+    
+    np.testing.assert_array_equal(result['bootstrap_differences'], plain['bootstrap_differences'])
+    np.testing.assert_array_equal(reloaded['bootstrap_t'], result['bootstrap_t'])
+    assert 'bootstrap_t' not in plain
+    
+    lower, upper = studentized_ci(result['bootstrap_t'], result['mean_difference'],
+                                  result['standard_error'])
+    assert lower < result['mean_difference'] < upper
+
+
+# ============================================================================
+# Tests for the streaming quantile sketch
+# ============================================================================
+
+def test_sketch_is_exact_below_capacity(sample_data):
+    """Test that an uncompacted sketch reproduces percentile_ci."""
+    sketch = bootstrap_mean_sketch(sample_data, n_iterations=1000, random_seed=13)
+    summary = sketch_ci(sketch, confidence_level=0.95, n_bins=20)
+    
+    assert sketch.is_exact
+    assert (summary['ci_lower'], summary['ci_upper']) == percentile_ci(
+        bootstrap_mean(sample_data, 1000, 13))
+    assert summary['rank_error'] == 0
+    assert summary['histogram']['counts'].sum() == 1000
+    assert len(summary['histogram']['edges']) == 21
+
+
+def test_sketch_rank_error_bound():
+    """Test that compacted quantiles stay within the reported rank error."""
+    rng = np.random.default_rng(14)
+    values = rng.lognormal(size=50000)
+    sketch = QuantileSketch(k=256)
+    for block in np.array_split(values, 37):
+        sketch.update(block)
+    
+    assert not sketch.is_exact
+    assert sketch.size < 256 * 10
+    sorted_values = np.sort(values)
+    for q in (0.005, 0.025, 0.5, 0.975):
+        estimate = sketch.quantiles([q])[0]
+        true_rank = np.searchsorted(sorted_values, estimate, side='right')
+        assert abs(true_rank - q * len(values)) <= sketch.rank_error
+        low, high = sketch.quantile_range(q)
+        assert low <= np.quantile(values, q) <= high
+
+
+def test_sketch_merge_across_chunks(sample_data):
+    """Test merging per-chunk sketches, serially and on a process pool."""
+    serial, = run_bootstrap_tasks(bootstrap_mean_sketch, [(sample_data,)], 4000,
+                                  random_seed=15, max_workers=1, chunk_size=1000,
+                                  combine=merge_sketches)
+    pooled, = run_bootstrap_tasks(bootstrap_mean_sketch, [(sample_data,)], 4000,
+                                  random_seed=15, max_workers=2, chunk_size=1000,
+                                  combine=merge_sketches)
+    
+    assert serial.n == pooled.n == 4000
+    np.testing.assert_array_equal(serial.quantiles([0.025, 0.975]),
+                                  pooled.quantiles([0.025, 0.975]))
+    with pytest.raises(ValueError):
+        QuantileSketch(k=64).merge(QuantileSketch(k=128))
+
+
+def test_difference_sketch(sample_data):
+    """Test that the streaming difference matches the replicate distribution."""
+    other = sample_data[:60] + 0.3
+    sketch = bootstrap_difference_sketch(sample_data, other, n_iterations=5000,
+                                         random_seed=16, sketch_size=512)
+    summary = sketch_ci(sketch)
+    expected = percentile_ci(bootstrap_difference(sample_data, other, 5000, 16))
+    
+    assert summary['n_replicates'] == 5000
+    assert summary['ci_lower'] == pytest.approx(expected[0], abs=0.05)
+    assert summary['ci_upper'] == pytest.approx(expected[1], abs=0.05)
+
+
+# ============================================================================
+# Tests for variance reduction estimators
+# ============================================================================
+
+def test_control_variate_weights_reproduce_known_means():
+    """Test that the regression weights sum to one and match the control means."""
+    controls = np.random.default_rng(30).normal(size=(500, 2))
+    known = np.array([0.1, -0.2])
+    weights = control_variate_weights(controls, known)
+    
+    assert weights.sum() == pytest.approx(1.0)
+    np.testing.assert_allclose(weights @ controls, known, atol=1e-12)
+    
+    # Uniform weights reduce to the ordinary quantile
+    values = np.arange(10.0)
+    assert weighted_quantiles(values, np.full(10, 0.1), [0.5])[0] == 4.0
+
+
+def test_bootstrap_mean_reduced_control(sample_data):
+    """Test that control variates make bias and variance exact for the mean."""
+    result = bootstrap_mean_reduced(sample_data, n_iterations=2000, random_seed=31)
+    
+    np.testing.assert_array_equal(result['bootstrap_means'],
+                                  bootstrap_mean(sample_data, 2000, 31))
+    assert result['bias'] == pytest.approx(0.0, abs=1e-12)
+    assert result['variance'] == pytest.approx(linear_variance(sample_data))
+    assert result['reduction_factor']['bias'] == np.inf
+    assert result['reduction_factor']['ci_lower'] > 1
+    assert result['ci_lower'] < np.mean(sample_data) < result['ci_upper']
+
+
+def test_bootstrap_mean_reduced_antithetic(sample_data):
+    """Test antithetic pairs: correct marginal distribution, reduced bias error."""
+    result = bootstrap_mean_reduced(sample_data, n_iterations=2000, random_seed=32,
+                                    method='antithetic')
+    
+    assert len(result['bootstrap_means']) == 2000
+    assert result['reduction_factor']['bias'] > 1
+    assert result['variance'] == pytest.approx(linear_variance(sample_data), rel=0.15)
+    
+    with pytest.raises(ValueError, match="must be even"):
+        bootstrap_mean_reduced(sample_data, n_iterations=101, method='antithetic')
+    with pytest.raises(ValueError, match="method must be one of"):
+        bootstrap_mean_reduced(sample_data, method='importance')
+
+
+def test_bootstrap_difference_reduced(sample_data):
+    """Test both estimators for a difference in means."""
+    data_B = sample_data[:40] + 0.25
+    observed = sample_data.mean() - data_B.mean()
+    
+    control = bootstrap_difference_reduced(sample_data, data_B, 2000, random_seed=33)
+    np.testing.assert_array_equal(control['bootstrap_differences'],
+                                  bootstrap_difference(sample_data, data_B, 2000, 33))
+    assert control['variance'] == pytest.approx(
+        linear_variance(sample_data) + linear_variance(data_B)
+    )
+    
+    antithetic = bootstrap_difference_reduced(sample_data, data_B, 2000, random_seed=33,
+                                              method='antithetic')
+    assert abs(antithetic['bias']) < 0.01
+    for result in (control, antithetic):
+        assert result['ci_lower'] < observed < result['ci_upper']
+
+
+# ============================================================================
+# Tests for the saddlepoint approximation
+# ============================================================================
+
+def test_saddlepoint_quantiles_match_large_bootstrap(tied_data):
+    """Test saddlepoint quantiles against a large resampling run."""
+    sample = tied_data[560:640]
+    levels = [0.01, 0.025, 0.5, 0.975, 0.99]
+    approx = saddlepoint_quantiles(sample, levels)
+    reference = np.percentile(bootstrap_mean(sample, 100000, random_seed=40),
+                              100 * np.array(levels))
+    
+    np.testing.assert_allclose(approx, reference, atol=0.002)
+    assert np.all(np.diff(approx) > 0)
+
+
+def test_saddlepoint_ci_difference(sample_data):
+    """Test the saddlepoint CI of a difference against resampling."""
+    data_B = sample_data[:40] + 0.25
+    lower, upper = saddlepoint_ci(sample_data, data_B)
+    ref_lower, ref_upper = percentile_ci(
+        bootstrap_difference(sample_data, data_B, 50000, random_seed=41)
+    )
+    
+    assert lower == pytest.approx(ref_lower, abs=0.01)
+    assert upper == pytest.approx(ref_upper, abs=0.01)
+    assert saddlepoint_ci(np.full(5, 1.0)) == (1.0, 1.0)
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        saddlepoint_quantiles(sample_data, [0.0])
+
+
+def test_saddlepoint_small_skewed_samples():
+    """Test that skewed small samples give finite bounds within the data range."""
+    skewed = np.array([0, 0, 0, 0.01, 0.02, 0.5, 1.3])
+    lower, upper = saddlepoint_ci(skewed)
+
+    assert 0 <= lower < np.mean(skewed) < upper <= 1.3
+    rng = np.random.default_rng(19)
+    for n in (5, 10, 30, 100):
+        data_A = np.round(rng.lognormal(0, 2, n), 1)
+        data_B = rng.exponential(1, n)
+        bounds = saddlepoint_quantiles(data_A, [0.005, 0.025, 0.975, 0.995])
+        lower, upper = saddlepoint_ci(data_A, data_B)
+
+        assert np.all(np.isfinite(bounds)) and np.all(np.diff(bounds) >= 0)
+        assert data_A.min() - 1e-9 <= bounds[0] and bounds[-1] <= data_A.max() + 1e-9
+        assert data_A.min() - data_B.max() <= lower < upper <= data_A.max() - data_B.min()
+
+    with pytest.raises(ValueError, match="Saddlepoint quantiles"):
+        saddlepoint_quantiles(skewed, [0.025], max_iterations=2)
+
+
+def test_saddlepoint_genre_results(sample_dataframe):
+    """Test the genre wrappers and their summary-table format."""
+    index = GroupIndex(sample_dataframe, 'Genre')
+    mean = saddlepoint_genre_mean(sample_dataframe, 'Action', 'NA', index=index)
+    difference = saddlepoint_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA')
+    
+    assert mean['ci_lower'] < mean['mean'] < mean['ci_upper']
+    assert mean['method'] == 'saddlepoint'
+    assert difference['ci_lower'] < difference['mean_difference'] < difference['ci_upper']
+    assert isinstance(difference['significant'], bool)
+    
+    with pytest.raises(ValueError, match="No data found"):
+        saddlepoint_genre_mean(sample_dataframe, 'Nonexistent', 'NA')
+
+
+# ============================================================================
+# Tests for the exact lattice bootstrap
+# ============================================================================
+
+def _ideal_quantiles(values, levels):
+    """min{x : G(x) >= q} of an enumerated bootstrap distribution."""
+    values = np.sort(values)
+    return values[np.ceil(np.array(levels) * len(values) - 1e-9).astype(int) - 1]
+
+
+def test_exact_quantiles_match_enumeration():
+    """Test exact quantiles against all n^n resamples of tiny samples."""
+    from itertools import product
+    
+    data_A = np.array([0.01, 0.03, 0.03, 0.10])
+    data_B = np.array([0.02, 0.05, 0.07])
+    means_A = np.array([np.mean(r) for r in product(data_A, repeat=4)])
+    means_B = np.array([np.mean(r) for r in product(data_B, repeat=3)])
+    levels = [0.025, 0.3, 0.5, 0.975]
+    
+    np.testing.assert_allclose(exact_mean_quantiles(data_A, levels),
+                               _ideal_quantiles(means_A, levels))
+    np.testing.assert_allclose(exact_difference_quantiles(data_A, data_B, levels),
+                               _ideal_quantiles(np.subtract.outer(means_A, means_B).ravel(),
+                                                levels))
+
+
+def test_exact_ci_is_oracle_for_resampling(tied_data):
+    """Test that resampling CIs converge to the exact lattice CI."""
+    sales = np.round(np.expm1(tied_data), 2)
+    exact = exact_ci(sales)
+    lower, upper = percentile_ci(bootstrap_mean(sales, 50000, random_seed=50))
+    
+    assert exact['exact']
+    assert exact['ci_lower'] == pytest.approx(lower, abs=1e-3)
+    assert exact['ci_upper'] == pytest.approx(upper, abs=1e-3)
+    assert lattice_units(sales) is not None
+
+
+def test_exact_ci_falls_back_off_lattice(sample_data):
+    """Test the resampling fallback for non-lattice data such as log_sales."""
+    result = exact_ci(sample_data, random_seed=51)
+    
+    assert not result['exact']
+    assert (result['ci_lower'], result['ci_upper']) == percentile_ci(
+        bootstrap_mean(sample_data, 10000, random_seed=51)
+    )
+
+
+def test_exact_genre_results():
+    """Test the genre wrappers on raw-style sales columns."""
+    raw = pd.DataFrame({
+        'Genre': ['Action'] * 30 + ['Puzzle'] * 20,
+        'NA_Sales': np.round(np.random.default_rng(52).exponential(0.3, 50), 2)
+    })
+    mean = exact_genre_mean(raw, 'Action', 'NA', value_col='NA_Sales')
+    difference = exact_genre_difference(raw, 'Action', 'Puzzle', 'NA', value_col='NA_Sales',
+                                        index=GroupIndex(raw, 'Genre'))
+    
+    assert mean['exact'] and difference['exact']
+    assert mean['ci_lower'] < mean['mean'] < mean['ci_upper']
+    assert difference['ci_lower'] < difference['mean_difference'] < difference['ci_upper']
+    with pytest.raises(ValueError, match="No data found"):
+        exact_genre_mean(raw, 'Sports', 'NA', value_col='NA_Sales')
+
+
+# ============================================================================
+# Tests for the streaming Poisson bootstrap
+# ============================================================================
+
+def test_poisson_bootstrap_chunking_invariance(sample_dataframe, tmp_path):
+    """Test that CSV chunks and memory blocks do not change the replicates."""
+    path = tmp_path / 'sales.csv'
+    sample_dataframe.to_csv(path, index=False)
+    
+    whole = PoissonBootstrap(500, random_seed=3).update(sample_dataframe)
+    streamed = stream_csv_bootstrap(path, 500, random_seed=3, chunksize=7)
+    blocked = PoissonBootstrap(500, random_seed=3, memory_budget=1000).update(sample_dataframe)
+    
+    assert streamed.groups == whole.groups
+    for boot in (streamed, blocked):
+        np.testing.assert_array_equal(boot.counts, whole.counts)
+        np.testing.assert_allclose(boot.sums, whole.sums)
+    assert streamed.mean('Action') == pytest.approx(
+        sample_dataframe.loc[sample_dataframe['Genre'] == 'Action', 'log_sales'].mean())
+
+
+def test_poisson_bootstrap_matches_multinomial_ci():
+    """Test that Poisson CIs agree with the ordinary bootstrap for large groups."""
+    rng = np.random.default_rng(8)
+    values = rng.normal(2.0, 1.0, 5000)
+    chunks = [pd.DataFrame({'Genre': 'Action', 'log_sales': values[i:i + 1000]})
+              for i in range(0, 5000, 1000)]
+    
+    boot = stream_bootstrap(chunks, 4000, random_seed=1)
+    result = boot.mean_results('NA')[0]
+    lower, upper = percentile_ci(bootstrap_mean(values, 4000, random_seed=1))
+    
+    assert result['sample_size'] == 5000
+    assert result['ci_lower'] == pytest.approx(lower, abs=0.01)
+    assert result['ci_upper'] == pytest.approx(upper, abs=0.01)
+
+
+def test_poisson_bootstrap_merge_adds_shards(sample_dataframe):
+    """Test that shard accumulators combine by addition."""
+    first = PoissonBootstrap(200, random_seed=1).update(sample_dataframe.iloc[:60])
+    second = PoissonBootstrap(200, random_seed=2).update(sample_dataframe.iloc[60:])
+    expected_sums = {g: (first.sums[first.groups.index(g)] if g in first.groups else 0)
+                     + (second.sums[second.groups.index(g)] if g in second.groups else 0)
+                     for g in ['Action', 'Role-Playing', 'Simulation']}
+    
+    first.merge(second)
+    
+    assert list(first.sizes) == [50, 30, 20]
+    for genre, sums in expected_sums.items():
+        np.testing.assert_allclose(first.sums[first.groups.index(genre)], sums)
+    result = first.difference_result('Action', 'Simulation', 'NA')
+    assert result['ci_lower'] < result['mean_difference'] < result['ci_upper']
+    
+    with pytest.raises(ValueError, match="same n_iterations"):
+        first.merge(PoissonBootstrap(100))
+
+
+def test_poisson_bootstrap_validation(sample_dataframe):
+    """Test error handling of the streaming accumulator."""
+    boot = PoissonBootstrap(100).update(sample_dataframe)
+    
+    with pytest.raises(ValueError, match="must contain"):
+        boot.update(sample_dataframe[['Genre']])
+    with pytest.raises(ValueError, match="No data found for genre"):
+        boot.interval('Puzzle')
+    with pytest.raises(ValueError, match="n_iterations must be positive"):
+        PoissonBootstrap(0)
+
+
+def test_poisson_bootstrap_rejects_missing_labels(sample_dataframe):
+    """Test that rows without a group label are not folded into another group."""
+    unlabelled = sample_dataframe.copy()
+    unlabelled.loc[unlabelled.index[-1], 'Genre'] = np.nan
+    
+    for boot in (PoissonBootstrap(100, random_seed=0), IncrementalBootstrap(100, random_seed=0)):
+        with pytest.raises(ValueError, match="group labels must not contain NaN"):
+            boot.update(unlabelled)
+        assert boot.groups == [] and boot.sums.shape == (0, 100)
+
+
+# ============================================================================
+# Tests for incremental bootstrap updates
+# ============================================================================
+
+def test_keyed_poisson_weights_distribution():
+    """Test that keyed weights are Poisson(1) and a pure function of key and seed."""
+    keys = np.arange(2000, dtype=np.uint64)
+    weights = keyed_poisson_weights(keys, 42, 500)
+    
+    assert weights.shape == (2000, 500)
+    assert weights.mean() == pytest.approx(1.0, abs=0.01)
+    assert weights.var() == pytest.approx(1.0, abs=0.02)
+    assert np.mean(weights == 0) == pytest.approx(np.exp(-1), abs=0.005)
+    np.testing.assert_array_equal(keyed_poisson_weights(keys[1500:], 42, 500), weights[1500:])
+    assert not np.array_equal(keyed_poisson_weights(keys, 43, 500), weights)
+
+
+def test_incremental_refresh_matches_full_run(sample_dataframe, tmp_path):
+    """Test that appending rows and refreshing equals processing everything at once."""
+    csv_path = tmp_path / 'cleaned.csv'
+    state_path = tmp_path / 'state' / 'na.npz'
+    full = IncrementalBootstrap(300, random_seed=5).update(sample_dataframe)
+    
+    sample_dataframe.iloc[:70].to_csv(csv_path, index=False)
+    boot = IncrementalBootstrap.load_or_create(state_path, 300, random_seed=5)
+    assert boot.refresh_csv(csv_path, chunksize=9) == 70
+    assert boot.offset == csv_path.stat().st_size
+    boot.save(state_path)
+    
+    # A half-written last line waits for the next refresh
+    appended = sample_dataframe.iloc[70:].to_csv(index=False, header=False)
+    with open(csv_path, 'a') as f:
+        f.write(appended[:-5])
+    boot = IncrementalBootstrap.load_or_create(state_path, 300, random_seed=5)
+    assert boot.n_rows == 70
+    assert boot.refresh_csv(csv_path) == 29
+    with open(csv_path, 'a') as f:
+        f.write(appended[-5:])
+    assert boot.refresh_csv(csv_path) == 1
+    assert boot.refresh_csv(csv_path) == 0
+    
+    assert boot.groups == full.groups
+    np.testing.assert_array_equal(boot.counts, full.counts)
+    np.testing.assert_allclose(boot.sums, full.sums)
+    # Chunked sums may differ from the one-pass sums in the last bits
+    for refreshed, reference in zip(boot.mean_results('NA'), full.mean_results('NA')):
+        assert refreshed == pytest.approx(reference)
+
+
+def test_incremental_key_columns_and_validation(sample_dataframe, tmp_path):
+    """Test content-keyed weights and the refresh/loading safeguards."""
+    keyed = sample_dataframe.assign(Title=[f"game-{i}" for i in range(100)])
+    shuffled = keyed.sample(frac=1, random_state=0)
+    
+    first = IncrementalBootstrap(200, random_seed=1, key_cols=['Title']).update(keyed)
+    second = IncrementalBootstrap(200, random_seed=1, key_cols=['Title']).update(shuffled)
+    np.testing.assert_array_equal(
+        first.counts[first.groups.index('Action')], second.counts[second.groups.index('Action')]
+    )
+    
+    csv_path = tmp_path / 'cleaned.csv'
+    sample_dataframe.iloc[:10].to_csv(csv_path, index=False)
+    boot = IncrementalBootstrap(200, random_seed=1).update(sample_dataframe)
+    with pytest.raises(ValueError, match="already processed"):
+        boot.refresh_csv(csv_path)
+    
+    # A file rewritten shorter than the processed part is rejected
+    refreshed = IncrementalBootstrap(200, random_seed=1)
+    refreshed.refresh_csv(csv_path)
+    sample_dataframe.iloc[:5].to_csv(csv_path, index=False)
+    with pytest.raises(ValueError, match="already processed"):
+        refreshed.refresh_csv(csv_path)
+    
+    # So is a longer file whose processed part was regenerated in another order
+    refreshed = IncrementalBootstrap(200, random_seed=1)
+    refreshed.refresh_csv(csv_path)
+    sample_dataframe.iloc[::-1].to_csv(csv_path, index=False)
+    with pytest.raises(ValueError, match="rebuild the state"):
+        refreshed.refresh_csv(csv_path)
+    
+    state_path = tmp_path / 'state.npz'
+    boot.save(state_path)
+    with pytest.raises(ValueError, match="different n_iterations or random_seed"):
+        IncrementalBootstrap.load_or_create(state_path, 200, random_seed=2)
+    with pytest.raises(ValueError, match="must be strings"):
+        IncrementalBootstrap(200, random_seed=1).update(
+            sample_dataframe.assign(Genre=np.arange(100) % 3)
+        ).save(state_path)
+
+
+# ============================================================================
+# Tests for the Bag of Little Bootstraps
+# ============================================================================
+
+def test_blb_subset_size():
+    """Test b = ceil(n^gamma) and gamma validation."""
+    assert subset_size(10000, 0.7) == int(np.ceil(10000 ** 0.7))
+    assert subset_size(5, 1.0) == 5
+    
+    with pytest.raises(ValueError, match="gamma"):
+        subset_size(100, 0.4)
+
+
+def test_blb_mean_kernel_full_size_spread():
+    """Test that subset replicates have the spread of full-size resamples."""
+    rng = np.random.default_rng(0)
+    subset = rng.normal(0, 1, 200)
+    
+    means = blb_mean_kernel(subset, 20000, 4000, random_seed=1)
+    
+    assert means.shape == (4000,)
+    assert np.std(means) == pytest.approx(np.std(subset) / np.sqrt(20000), rel=0.1)
+
+
+def test_blb_mean_ci_matches_percentile_ci():
+    """Test that the BLB CI is comparable to the full-data percentile CI."""
+    data = np.random.default_rng(3).lognormal(0, 0.5, 20000)
+    
+    blb = blb_mean_ci(data, n_subsets=10, n_resamples=200, random_seed=42, max_workers=1)
+    full_lower, full_upper = percentile_ci(bootstrap_mean(data, 2000, random_seed=42))
+    
+    width = full_upper - full_lower
+    assert blb['subset_size'] == subset_size(20000)
+    assert len(blb['subset_lower']) == 10
+    assert abs(blb['ci_lower'] - full_lower) < 0.5 * width
+    assert abs(blb['ci_upper'] - full_upper) < 0.5 * width
+    assert blb['ci_upper'] - blb['ci_lower'] == pytest.approx(width, rel=0.25)
+
+
+def test_blb_mean_ci_centred_on_sample_mean():
+    """Test that the BLB CI is centred on the full-data mean at large n."""
+    data = np.random.default_rng(11).lognormal(0, 1, 500000)
+    standard_error = data.std() / np.sqrt(len(data))
+    
+    for seed in range(3):
+        blb = blb_mean_ci(data, n_subsets=10, n_resamples=100, random_seed=seed, max_workers=1)
+        centre = (blb['ci_lower'] + blb['ci_upper']) / 2
+        assert abs(centre - data.mean()) < 0.25 * standard_error
+        assert blb['ci_lower'] < data.mean() < blb['ci_upper']
+
+
+def test_blb_worker_count_invariance():
+    """Test that BLB results do not depend on the number of workers."""
+    data_A = np.random.default_rng(4).normal(1.0, 1, 3000)
+    data_B = np.random.default_rng(5).normal(0.0, 1, 2000)
+    
+    serial = blb_difference_ci(data_A, data_B, n_subsets=4, n_resamples=50,
+                               random_seed=7, max_workers=1)
+    pooled = blb_difference_ci(data_A, data_B, n_subsets=4, n_resamples=50,
+                               random_seed=7, max_workers=2)
+    
+    assert serial['ci_lower'] == pooled['ci_lower']
+    assert serial['ci_upper'] == pooled['ci_upper']
+    assert serial['subset_size'] == (subset_size(3000), subset_size(2000))
+    assert serial['ci_lower'] < 1.0 < serial['ci_upper']
+
+
+def test_blb_genre_wrappers(sample_dataframe):
+    """Test genre-level BLB results and validation."""
+    mean_result = blb_genre_mean(sample_dataframe, 'Action', 'NA', random_seed=1,
+                                 max_workers=1, n_subsets=5)
+    diff_result = blb_genre_difference(sample_dataframe, 'Action', 'Simulation', 'NA',
+                                       random_seed=1, max_workers=1, n_subsets=5)
+    
+    assert mean_result['ci_lower'] < mean_result['mean'] < mean_result['ci_upper']
+    assert mean_result['sample_size'] == 50
+    assert diff_result['significant'] == is_significant(diff_result['ci_lower'],
+                                                        diff_result['ci_upper'])
+    
+    with pytest.raises(ValueError, match="No data found for genre"):
+        blb_genre_mean(sample_dataframe, 'Puzzle', 'NA', max_workers=1)
+    with pytest.raises(ValueError, match="cannot be empty"):
+        blb_mean_ci(np.array([]))
+
+
+# ============================================================================
+# Tests for Monte Carlo error and adaptive replicate counts
+# ============================================================================
+
+def test_endpoint_mcse_tracks_seed_variability(sample_data):
+    """Test batch-means MCSE against the spread of endpoints over seeds."""
+    replicates = bootstrap_mean(sample_data, n_iterations=4000, random_seed=17)
+    mcse_lower, mcse_upper = endpoint_mcse(replicates, n_batches=20)
+    
+    endpoints = np.array([percentile_ci(bootstrap_mean(sample_data, 4000, seed))
+                          for seed in range(30)])
+    observed_sd = endpoints.std(axis=0, ddof=1)
+    assert 0.4 * observed_sd[0] < mcse_lower < 2.5 * observed_sd[0]
+    assert 0.4 * observed_sd[1] < mcse_upper < 2.5 * observed_sd[1]
+    
+    # Columns are handled independently
+    matrix = np.column_stack([replicates, 2 * replicates])
+    lower, upper = endpoint_mcse(matrix, n_batches=20)
+    np.testing.assert_allclose(lower, [mcse_lower, 2 * mcse_lower])
+    
+    with pytest.raises(ValueError):
+        endpoint_mcse(replicates[:5], n_batches=20)
+
+
+def test_endpoint_mcse_custom_interval(sample_data):
+    """Test that a custom interval function is applied per batch."""
+    replicates = bootstrap_mean(sample_data, n_iterations=2000, random_seed=20)
+    
+    default = endpoint_mcse(replicates, n_batches=10)
+    custom = endpoint_mcse(replicates, n_batches=10, interval=percentile_ci)
+    np.testing.assert_allclose(custom, default)
+    
+    lower, upper = endpoint_mcse(replicates, n_batches=10,
+                                 interval=lambda batch: bca_ci(batch, sample_data))
+    assert lower > 0 and upper > 0
+
+
+def test_significance_mcse():
+    """Test flip probabilities of clear, borderline and fixed decisions."""
+    flip, mcse = significance_mcse([0.5, 0.0, -1.0, 0.1],
+                                   [1.0, 1.0, 1.0, 0.2],
+                                   [0.01, 0.01, 0.01, 0.0],
+                                   [0.01, 0.01, 0.01, 0.0])
+    
+    # Far from zero: essentially never flips
+    assert flip[0] < 1e-10 and flip[2] < 1e-10
+    # Lower endpoint exactly at zero: a coin flip
+    assert flip[1] == pytest.approx(0.5)
+    assert mcse[1] == pytest.approx(0.5)
+    # Zero MCSE: the decision is fixed
+    assert flip[3] == 0 and mcse[3] == 0
+    np.testing.assert_allclose(mcse, np.sqrt(flip * (1 - flip)))
+
+
+def test_pair_and_region_results_report_mcse(sample_dataframe, region_dataframe):
+    """Test that engine results carry endpoint and decision MCSEs."""
+    pairs = bootstrap_all_pair_differences(sample_dataframe, region='NA',
+                                           n_iterations=2000, random_seed=21)
+    for result in pairs:
+        lower, upper = endpoint_mcse(result['bootstrap_differences'])
+        assert result['mcse_lower'] == pytest.approx(lower)
+        assert result['mcse_upper'] == pytest.approx(upper)
+        assert 0 <= result['mcse_significant'] <= 0.5
+        assert 0 <= result['flip_probability'] <= 1
+    
+    regional = bootstrap_region_means(
+        region_dataframe, region_cols={'NA': 'log_sales_na', 'JP': 'log_sales_jp'},
+        n_iterations=1000, random_seed=22
+    )
+    assert all(r['mcse_lower'] > 0 and r['mcse_upper'] > 0 for r in regional['results'])
+
+
+def test_adaptive_bootstrap_mean_stops_early(sample_data):
+    """Test that a loose tolerance stops after few batches with a prefix stream."""
+    result = adaptive_bootstrap_mean(sample_data, tolerance=0.05, batch_size=500,
+                                     max_iterations=20000, random_seed=18)
+    
+    assert result['converged']
+    assert result['n_iterations'] == 500
+    assert max(result['mcse_lower'], result['mcse_upper']) <= 0.05
+    np.testing.assert_array_equal(result['replicates'],
+                                  bootstrap_mean(sample_data, 20000, 18)[:500])
+
+
+def test_adaptive_bootstrap_difference_hits_cap(sample_data):
+    """Test that an unreachable tolerance stops at max_iterations."""
+    result = adaptive_bootstrap_difference(sample_data, sample_data + 0.2, tolerance=1e-9,
+                                           batch_size=400, max_iterations=1000,
+                                           random_seed=19)
+    
+    assert not result['converged']
+    assert result['n_iterations'] == 1000
+    assert len(result['replicates']) == 1000
+    assert result['ci_lower'] < -0.2 < result['ci_upper']
+    
+    with pytest.raises(ValueError, match="tolerance must be positive"):
+        adaptive_bootstrap_mean(sample_data, tolerance=0)
+
+
+# ============================================================================
+# Tests for permutation tests
+# ============================================================================
+
+def test_permutation_test_matches_exact_enumeration():
+    """Test the p-value against all C(8, 3) relabellings of a tiny sample."""
+    from itertools import combinations
+    data_A = np.array([1.0, 2.0, 3.5])
+    data_B = np.array([4.0, 5.0, 6.0, 7.2, 2.5])
+    pooled = np.concatenate([data_A, data_B])
+    observed = abs(data_A.mean() - data_B.mean())
+    extreme = []
+    for chosen in combinations(range(8), 3):
+        mask = np.isin(np.arange(8), chosen)
+        extreme.append(abs(pooled[mask].mean() - pooled[~mask].mean()) >= observed - 1e-12)
+    
+    result = permutation_test(data_A, data_B, n_permutations=50000, random_seed=1)
+    
+    assert result['mean_difference'] == pytest.approx(data_A.mean() - data_B.mean())
+    assert result['p_value'] == pytest.approx(np.mean(extreme), abs=0.005)
+
+
+def test_permutation_counts_block_invariance(sample_data):
+    """Test that memory-bounded blocks consume the same permutation stream."""
+    sizes = [60, 40]
+    whole = permutation_counts(sample_data, sizes, [(0, 1)], 300, np.random.default_rng(4))
+    blocked = permutation_counts(sample_data, sizes, [(0, 1)], 300, np.random.default_rng(4),
+                                 memory_budget=16 * len(sample_data) * 7)
+    
+    np.testing.assert_array_equal(whole, blocked)
+    # Identical groups: the observed labelling is as extreme as every other
+    tied = permutation_counts(np.ones(10), [4, 6], [(0, 1)], 50, np.random.default_rng(0))
+    assert tied[0, 0] == 50
+
+
+def test_parallel_permutation_tests_modes(sample_dataframe):
+    """Test per-pair and shared modes, worker invariance and result keys."""
+    datasets = {'NA': sample_dataframe, 'JP': sample_dataframe.iloc[::-1]}
+    pairs = [('Action', 'Role-Playing'), ('Action', 'Simulation')]
+    
+    serial = parallel_permutation_tests(datasets, pairs, n_permutations=2000, random_seed=5,
+                                        max_workers=1, chunk_size=700)
+    pooled = parallel_permutation_tests(datasets, pairs, n_permutations=2000, random_seed=5,
+                                        max_workers=2, chunk_size=700)
+    shared = parallel_permutation_tests(datasets, pairs, n_permutations=2000, random_seed=5,
+                                        shared=True, max_workers=1)
+    
+    assert [r['p_value'] for r in serial] == [r['p_value'] for r in pooled]
+    assert [(r['region'], r['genre_A'], r['genre_B']) for r in shared] == \
+        [(r['region'], r['genre_A'], r['genre_B']) for r in serial]
+    for r in shared:
+        assert 0 < r['p_value'] <= r['p_value_adjusted'] <= 1
+        assert r['significant'] == (r['p_value'] < 0.05)
+    assert 'p_value_adjusted' not in serial[0]
+    
+    single = genre_permutation_test(sample_dataframe, 'Action', 'Simulation', 'NA',
+                                    n_permutations=2000, random_seed=5)
+    assert single['sample_size_A'] == 50 and single['sample_size_B'] == 20
+
+
+def test_permutation_test_validation(sample_dataframe):
+    """Test error handling of the permutation tests."""
+    with pytest.raises(ValueError, match="non-empty"):
+        permutation_test(np.array([]), np.array([1.0]))
+    with pytest.raises(ValueError, match="n_permutations must be positive"):
+        parallel_permutation_tests({'NA': sample_dataframe}, [('Action', 'Simulation')], 0)
+    with pytest.raises(ValueError, match="No data found for group"):
+        genre_permutation_test(sample_dataframe, 'Action', 'Puzzle', 'NA')
+
+
 # ============================================================================
 # Tests for is_significant
 # ============================================================================
@@ -366,6 +2007,16 @@ def test_is_significant_boundary_cases():
     assert is_significant(-0.5, -0.001) == True
 
 
+def test_is_significant_vectorized():
+    """Test elementwise significance for arrays of bounds."""
+    lower = np.array([0.1, -0.5, 0.0, -0.5])
+    upper = np.array([0.5, -0.1, 0.5, 0.5])
+    
+    result = is_significant(lower, upper)
+    np.testing.assert_array_equal(result, [True, True, False, False])
+    assert isinstance(is_significant(0.1, 0.5), bool)
+
+
 def test_is_significant_custom_null_value():
     """Test significance testing with custom null value."""
     # CI excludes 1.0
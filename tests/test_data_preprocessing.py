@@ -26,9 +26,11 @@ from src.data_preprocessing.clean_data import (
     filter_time_window,
     select_genres
 )
+from src.data_preprocessing.group_index import GroupIndex
 from src.data_preprocessing.transform_data import (
     apply_log_transform,
     reshape_for_analysis,
+    combine_region_data,
     save_cleaned_data
 )
 
@@ -182,6 +184,61 @@ class TestCleanData:
         df_genres = select_genres(df_clean, ['NonexistentGenre'])
         
         assert len(df_genres) == 0
+    
+    def test_select_genres_with_index(self, sample_raw_data):
+        """Test that an indexed selection matches the boolean-mask selection."""
+        df_clean = remove_invalid_entries(sample_raw_data)
+        index = GroupIndex(df_clean, 'Genre')
+        
+        expected = select_genres(df_clean, ['Simulation', 'Action'])
+        indexed = select_genres(df_clean, ['Simulation', 'Action'], index=index)
+        
+        pd.testing.assert_frame_equal(indexed, expected)
+        with pytest.raises(ValueError):
+            select_genres(df_clean.copy(), ['Action'], index=index)
+
+
+# ============================================================================
+# Tests for group_index.py
+# ============================================================================
+
+class TestGroupIndex:
+    """Tests for the precomputed group index."""
+    
+    @pytest.fixture
+    def frame(self):
+        return pd.DataFrame({
+            'Genre': ['RPG', 'Action', 'RPG', None, 'Sim', 'Action'],
+            'log_sales': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        })
+    
+    def test_slices_and_views(self, frame):
+        """Test that groups are contiguous, stable and returned as views."""
+        index = GroupIndex(frame, 'Genre')
+        
+        assert index.labels == ['Action', 'RPG', 'Sim']
+        assert list(index.offsets) == [0, 2, 4, 5]
+        np.testing.assert_array_equal(index.values('RPG', 'log_sales'), [1.0, 3.0])
+        assert index.values('RPG', 'log_sales').base is index.sorted_column('log_sales')
+        assert len(index.values('Puzzle', 'log_sales')) == 0
+        assert index.labels_by_appearance() == ['RPG', 'Action', 'Sim']
+    
+    def test_requested_groups_and_subset(self, frame):
+        """Test restricting and reordering groups."""
+        index = GroupIndex(frame, 'Genre', groups=['Sim', 'Action'])
+        subset = GroupIndex(frame, 'Genre').subset(['Sim', 'Action'])
+        
+        for idx in (index, subset):
+            assert idx.labels == ['Sim', 'Action']
+            np.testing.assert_array_equal(idx.sorted_column('log_sales'), [5.0, 2.0, 6.0])
+            np.testing.assert_array_equal(idx.offsets, [0, 1, 3])
+        with pytest.raises(ValueError, match="No data found"):
+            GroupIndex(frame, 'Genre', groups=['Puzzle'])
+    
+    def test_missing_column(self, frame):
+        """Test that a missing group column raises."""
+        with pytest.raises(ValueError):
+            GroupIndex(frame, 'Region')
 
 
 # ============================================================================
@@ -241,6 +298,29 @@ class TestTransformData:
         with pytest.raises(ValueError):
             reshape_for_analysis(df_transformed, region='InvalidRegion')
     
+    def test_combine_region_data(self, sample_raw_data):
+        """Test combining row-aligned region frames into one frame."""
+        df_clean = remove_invalid_entries(sample_raw_data)
+        df_transformed = apply_log_transform(df_clean)
+        regions = {r: reshape_for_analysis(df_transformed, region=r) for r in ['NA', 'JP']}
+        
+        combined = combine_region_data(regions)
+        
+        assert list(combined.columns) == ['Genre', 'log_sales_na', 'log_sales_jp']
+        np.testing.assert_array_equal(combined['log_sales_jp'], regions['JP']['log_sales'])
+    
+    def test_combine_region_data_misaligned(self, sample_raw_data):
+        """Test that misaligned region frames raise error."""
+        df_clean = remove_invalid_entries(sample_raw_data)
+        df_transformed = apply_log_transform(df_clean)
+        df_na = reshape_for_analysis(df_transformed, region='NA')
+        
+        with pytest.raises(ValueError, match="not row-aligned"):
+            combine_region_data({'NA': df_na, 'JP': df_na.iloc[1:]})
+        
+        with pytest.raises(ValueError, match="at least one region"):
+            combine_region_data({})
+    
     def test_save_cleaned_data(self, sample_raw_data, temp_output_dir):
         """Test saving cleaned data."""
         df_clean = remove_invalid_entries(sample_raw_data)
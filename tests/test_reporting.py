@@ -22,6 +22,7 @@ import shutil
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
+from src.data_preprocessing.group_index import GroupIndex
 from src.reporting.generate_tables import (
     create_summary_table,
     export_results_table,
@@ -244,6 +245,21 @@ def test_create_summary_table_ci_width(sample_mean_results):
     assert all(widths >= 0)
 
 
+def test_create_summary_table_mcse_columns(sample_mixed_results):
+    """Test Monte Carlo error columns, NaN when results do not carry them."""
+    results = [dict(r, mcse_lower=0.01, mcse_upper=0.02) for r in sample_mixed_results]
+    results[-1]['mcse_significant'] = 0.1
+    tables = create_summary_table(results, separate_tables=True)
+    
+    assert list(tables['means']['MCSE_Lower']) == [0.01] * 3
+    assert list(tables['differences']['MCSE_Upper']) == [0.02] * 2
+    assert tables['differences']['MCSE_Significant'].isna().sum() == 1
+    
+    df = create_summary_table(sample_mixed_results)
+    assert {'MCSE_Lower', 'MCSE_Upper', 'MCSE_Significant'} <= set(df.columns)
+    assert df['MCSE_Lower'].isna().all()
+
+
 # ============================================================================
 # Tests for export_results_table
 # ============================================================================
@@ -334,6 +350,17 @@ def test_region_specific_tables(sample_mean_results):
     assert len(tables['NA']) == 1  # One genre in NA
 
 
+def test_region_specific_tables_with_index(sample_mean_results):
+    """Test that a prebuilt Region index gives the same tables."""
+    df = create_summary_table(sample_mean_results)
+    tables = region_specific_tables(df, index=GroupIndex(df, 'Region'))
+    expected = {r: df[df['Region'] == r].reset_index(drop=True) for r in df['Region'].unique()}
+    
+    assert list(tables) == list(expected)
+    for region, table in tables.items():
+        pd.testing.assert_frame_equal(table, expected[region])
+
+
 def test_region_specific_tables_no_region_column():
     """Test that missing Region column raises ValueError."""
     df = pd.DataFrame({'Genre': ['Action'], 'Mean': [3.0]})